@@ -0,0 +1,104 @@
+"""Load generator for the local JSON API: requests/s and latency per endpoint.
+
+Starts ``python -m study_pattern.api`` on a free port, then drives each
+endpoint with concurrent keep-alive clients for a few seconds. /predict is
+run twice: with micro-batching and with ``--max-batch 1`` (one model call
+per request).
+
+    python -m benchmarks.bench_api [clients] [seconds]
+"""
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BODIES = {
+    "/progress": {"hours": 4.5, "goal": 6},
+    "/analyze": {"hours": 4.5, "goal": 6, "breaks": 0, "revision": "No", "mood": "Stressed",
+                 "energy": "Low", "focus": "DBMS", "user": "lms-42", "day": "2026-10-01"},
+    "/predict": {"hours": 5, "breaks": 3, "mood": "Tired", "sleep": 6.5},
+    "/report": {"hours": 4.5, "goal": 6, "breaks": 2, "revision": "Yes", "mood": "Happy",
+                "energy": "High", "focus": "Calculus", "xp": 40, "streak": 2,
+                "last_bot": "Stick to Calculus.", "buddy": [["Zen Panda", "Breathe."]]},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(*extra):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, "-m", "study_pattern.api", "--port", str(port), *extra],
+                            stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()  # "listening" once the model is warm
+    return proc, port
+
+
+async def client(port, path, payload, deadline, lat, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(payload)}\r\n\r\n").encode() + payload
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        writer.write(request)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        lat.append(time.perf_counter() - t0)
+        statuses[head[9:12]] = statuses.get(head[9:12], 0) + 1
+    writer.close()
+
+
+async def load(port, path, clients, seconds):
+    payload = json.dumps(BODIES[path]).encode()
+    lat, statuses = [], {}
+    deadline = time.perf_counter() + seconds
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(port, path, payload, deadline, lat, statuses) for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+    p = statistics.quantiles(lat, n=100)
+    return len(lat) / elapsed, p[49] * 1e3, p[98] * 1e3, statuses
+
+
+async def health(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    body = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+    writer.close()
+    return json.loads(body)
+
+
+def report(name, rps, p50, p99, statuses):
+    ok = statuses.get(b"200", 0) == sum(statuses.values())
+    print(f"{name:<26}{rps:9.0f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms"
+          f"{'' if ok else f'   statuses {statuses}'}")
+
+
+def main(clients=64, seconds=5):
+    print(f"{clients} keep-alive clients, {seconds} s per endpoint")
+    proc, port = start_server()
+    try:
+        for path in ("/progress", "/analyze", "/predict", "/report"):
+            report(path, *asyncio.run(load(port, path, clients, seconds)))
+        stats = asyncio.run(health(port))
+        print(f"{'':<26}/predict: {stats['predict_rows'] / max(1, stats['predict_batches']):.1f} rows per model call")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    proc, port = start_server("--max-batch", "1")
+    try:
+        report("/predict (no batching)", *asyncio.run(load(port, "/predict", clients, seconds)))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
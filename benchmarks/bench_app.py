@@ -0,0 +1,329 @@
+"""Headless multi-session load test of the Streamlit page, with a regression gate.
+
+N simulated sessions (threads, each its own ``AppTest`` signed in with
+``?user=``) share one process, the way sessions share a Streamlit server and
+its ``st.cache_resource`` objects. Every step a session submits the study
+form, starts or pauses the Pomodoro, flips the theme and downloads the PDF.
+
+Reported: rerun latency (overall and per action), the CPU a PDF download
+takes, process CPU per rerun and per-session memory (``chat``/``buddy_chat``
+entries and bytes, the cached PDF, and everything the session keeps in
+``st.session_state``, sized object by object so it doesn't depend on what the
+process happened to import or free).
+
+    python -m benchmarks.bench_app [--sessions 8] [--steps 10] [--repeat 3]
+    python -m benchmarks.bench_app --update-baseline     # after an intended change
+
+Metrics are compared with ``benchmarks/app_baseline.json``; the run exits 1
+if a gated metric is more than ``--threshold`` above its baseline value. Only
+the memory metrics and CPU per rerun gate, the latter divided by the CPU time
+of a fixed workload run on the same machine (``cpu_per_rerun_rel``); wall
+latencies of threads sharing a GIL vary too much between runs and machines
+to fail on, and are reported only. Each metric is the best of ``--repeat``
+rounds.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import streamlit
+from streamlit import config
+from streamlit.components.v2.component_manager import BidiComponentManager
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+from streamlit.testing.v1.util import build_mock_config_get_option
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "study_analyzer.py")
+BASELINE = Path(__file__).resolve().parent / "app_baseline.json"
+# Absolute slack on top of the relative threshold, so near-zero metrics don't flap.
+SLACK = {"_ms": 2.0, "_kb": 1.0, "_entries": 0}
+GATED = ("cpu_per_rerun_rel", "chat_max_entries", "chat_max_kb", "pdf_cache_max_kb", "session_state_max_kb")
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """Give every AppTest the same mock runtime instead of one per run;
+    yields its media file manager and puts everything back on exit.
+
+    AppTest installs and clears ``Runtime._instance`` around each run, which
+    races when sessions run concurrently and drops the deferred download
+    callables as soon as a run ends. Built here the way AppTest builds it,
+    installed once, and AppTest is pointed at a stand-in class so its
+    per-run assignments don't touch it.
+
+    The same goes for the ``global.appTest`` option, which AppTest patches in
+    and out around each run: a session finishing its run would switch it off
+    under another one, whose widgets then don't save what the next
+    ``at.run()`` reads (``KeyError: '$$ID-...'``). It is switched on for the
+    whole block instead.
+    """
+    saved = (Runtime._instance, app_test.Runtime, app_test.LocalScriptRunner, app_test.patch_config_options,
+             config.get_option)
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("Runtime", (), {})
+    app_test.LocalScriptRunner = _SessionScriptRunner
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+    try:
+        yield runtime.media_file_mgr
+    finally:
+        (Runtime._instance, app_test.Runtime, app_test.LocalScriptRunner, app_test.patch_config_options,
+         config.get_option) = saved
+
+
+_SCRIPT_CACHE = ScriptCache()
+
+
+class _SessionScriptRunner(LocalScriptRunner):
+    # AppTest gives every runner the same session id, so one session's rerun
+    # would release another's download callables; key them by thread instead.
+    # It also recompiles the page on every run (concurrent ast.parse calls can
+    # fail on CPython 3.11); a server compiles it once into a shared cache.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session_id = f"load-session-{threading.get_ident()}"
+        self._script_cache = _SCRIPT_CACHE
+
+
+def walk(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        yield node
+        return
+    for child in children.values():
+        yield from walk(child)
+
+
+def deep_size(obj, seen=None):
+    """Bytes held by ``obj`` and everything it references (not code or classes)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        refs = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        refs = obj
+    elif isinstance(obj, types.MethodType):
+        refs = [obj.__self__]
+    else:
+        refs = [getattr(obj, slot) for cls in type(obj).__mro__ for slot in getattr(cls, "__slots__", ())
+                if hasattr(obj, slot)]
+        refs += [getattr(obj, "__dict__", {})]
+    return size + sum(deep_size(ref, seen) for ref in refs)
+
+
+def session(name, steps, mgr, barrier, timings, memory, errors):
+    try:
+        _session(name, steps, mgr, barrier, timings, memory, errors)
+    except Exception:
+        errors.append(f"session {name}: {traceback.format_exc()}")
+
+
+def _session(name, steps, mgr, barrier, timings, memory, errors):
+    rng = random.Random(name)
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.query_params["user"] = f"load-{name}"
+
+    def run(action):
+        t0 = time.perf_counter()
+        at.run()
+        timings.setdefault(action, []).append(time.perf_counter() - t0)
+        if at.exception:
+            errors.append(f"session {name} {action}: {at.exception[0].message}")
+
+    barrier.wait()
+    run("first_load")
+    for _ in range(steps):
+        at.slider[0].set_value(rng.choice([2.0, 4.5, 6.0, 8.0]))
+        at.button[0].click()  # 🔍 Analyze
+        run("analyze")
+
+        pomo = next(b for b in at.button if b.label in ("Start / Resume", "Pause"))
+        pomo.click()
+        run("pomodoro")
+
+        radio = at.radio[0]
+        radio.set_value("Light" if radio.value == "Dark" else "Dark")
+        run("theme")
+
+        download = next(el for el in walk(at._tree) if getattr(el, "type", "") == "download_button")
+        # Thread CPU, not wall time: waiting on the other sessions for the GIL isn't the download's cost.
+        t0 = time.thread_time()
+        mgr.execute_deferred(download.proto.deferred_file_id)
+        timings.setdefault("pdf_download", []).append(time.thread_time() - t0)
+
+    ss = at.session_state
+    chat, buddy = ss["chat"][:], ss["buddy_chat"][:]
+    memory.append({
+        "entries": len(chat) + len(buddy),
+        "chat_bytes": sum(len(who) + len(text.encode()) for who, text in chat + buddy),
+        "pdf_bytes": len(ss["pdf_cache"].get("pdf", b"")),
+        "state_bytes": deep_size(at._session_state.filtered_state),
+    })
+
+
+def pct(samples, p):
+    if len(samples) < 2:
+        return samples[0] * 1e3
+    return statistics.quantiles(samples, n=100, method="inclusive")[p - 1] * 1e3
+
+
+def calibration_ms():
+    """CPU time of a fixed pure-Python workload, best of 5: this machine's speed, right now."""
+    best = float("inf")
+    for _ in range(5):
+        t0 = time.process_time()
+        sorted(str(i * 7919 % 100003) for i in range(200_000))
+        best = min(best, time.process_time() - t0)
+    return best * 1e3
+
+
+def setup():
+    """Point the page at scratch files and warm its caches; run inside ``shared_runtime()``."""
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "STUDY_DATA_PATH": os.path.join(tmp, "study_data.csv"),
+        "STUDY_SESSIONS_DB": os.path.join(tmp, "sessions.db"),
+        "STUDY_EVENTS_PATH": os.path.join(tmp, "events.jsonl"),
+        "STUDY_MODELS_DIR": os.path.join(tmp, "models"),
+    })
+    # Warm the process-wide caches (model, store, stylesheet, PDF fonts) outside the measurement.
+    warm = AppTest.from_file(APP, default_timeout=120).run()
+    warm.button[0].click()
+    warm.run()
+
+
+def measure(mgr, sessions, steps, round_no=0):
+    calibration = calibration_ms()
+    timings, memory, errors = {}, [], []
+    barrier = threading.Barrier(sessions)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    threads = [threading.Thread(target=session,
+                                args=(f"r{round_no}-{i:03d}", steps, mgr, barrier, timings, memory, errors))
+               for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+
+    reruns = [s for action, samples in timings.items() if action != "pdf_download" for s in samples]
+    metrics = {
+        "rerun_p50_ms": pct(reruns, 50),
+        "rerun_p95_ms": pct(reruns, 95),
+        "rerun_p99_ms": pct(reruns, 99),
+        **{f"{action}_p95_ms": pct(timings[action], 95)
+           for action in ("analyze", "pomodoro", "theme")},
+        "pdf_download_cpu_p95_ms": pct(timings["pdf_download"], 95),
+        "cpu_per_rerun_ms": cpu / len(reruns) * 1e3,
+        "cpu_per_rerun_rel": cpu / len(reruns) * 1e3 / calibration,
+        "chat_max_entries": max(m["entries"] for m in memory),
+        "chat_max_kb": max(m["chat_bytes"] for m in memory) / 1024,
+        "pdf_cache_max_kb": max(m["pdf_bytes"] for m in memory) / 1024,
+        "session_state_max_kb": max(m["state_bytes"] for m in memory) / 1024,
+    }
+    info = {"reruns": len(reruns), "wall_s": wall, "cpu_pct": cpu / wall * 100, "errors": errors}
+    return {k: round(v, 3) for k, v in metrics.items()}, info
+
+
+def best_of(mgr, sessions, steps, repeat):
+    """Per-metric minimum over ``repeat`` rounds, which keeps scheduler noise
+    out of the numbers."""
+    rounds = [measure(mgr, sessions, steps, r) for r in range(repeat)]
+    metrics = {name: min(m[name] for m, _ in rounds) for name in rounds[0][0]}
+    info = {"reruns": sum(i["reruns"] for _, i in rounds), "wall_s": sum(i["wall_s"] for _, i in rounds),
+            "cpu_pct": statistics.mean(i["cpu_pct"] for _, i in rounds),
+            "errors": [e for _, i in rounds for e in i["errors"]]}
+    return metrics, info
+
+
+def compare(metrics, baseline, threshold):
+    failed = []
+    print(f"\n{'metric':<25}{'current':>11}{'baseline':>11}{'change':>9}  gated")
+    for name, value in metrics.items():
+        gated = "yes" if name in GATED else "no"
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<25}{value:>11.3f}{'—':>11}{'':>9}  {gated}")
+            continue
+        slack = next((s for suffix, s in SLACK.items() if name.endswith(suffix)), 0)
+        limit = base * (1 + threshold) + slack
+        change = f"{(value - base) / base:+.0%}" if base else "—"
+        flag = "  REGRESSION" if name in GATED and value > limit else ""
+        if flag:
+            failed.append(name)
+        print(f"{name:<25}{value:>11.3f}{base:>11.3f}{change:>9}  {gated}{flag}")
+    return failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=8)
+    ap.add_argument("--steps", type=int, default=10, help="form/timer/theme/PDF cycles per session")
+    ap.add_argument("--repeat", type=int, default=3, help="rounds; the gate uses each metric's best")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.3, help="allowed relative regression (default: 0.3)")
+    ap.add_argument("--update-baseline", action="store_true", help="write this run as the new baseline")
+    args = ap.parse_args(argv)
+
+    # The page's number_input value/key warning would print a stack per rerun.
+    streamlit.logger.set_log_level("error")
+    with shared_runtime() as mgr:
+        setup()
+        metrics, info = best_of(mgr, args.sessions, args.steps, args.repeat)
+    print(f"{args.repeat} x {args.sessions} sessions x {args.steps} steps: {info['reruns']} reruns in {info['wall_s']:.1f} s,"
+          f" server CPU {info['cpu_pct']:.0f}% of a core")
+    if info["errors"]:
+        print("\n".join(info["errors"][:10]))
+        sys.exit(1)
+
+    run = {"sessions": args.sessions, "steps": args.steps, "repeat": args.repeat}
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.write_text(json.dumps({
+            "config": run, "metrics": metrics, "generated": time.strftime("%Y-%m-%d"),
+            "python": platform.python_version(), "streamlit": streamlit.__version__,
+        }, indent=2) + "\n", encoding="utf-8")
+        compare(metrics, {}, args.threshold)
+        print(f"\nbaseline written to {args.baseline}")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline["config"] != run:
+        compare(metrics, {}, args.threshold)
+        print(f"\nbaseline was recorded with {baseline['config']}; not comparing")
+        return
+    failed = compare(metrics, baseline["metrics"], args.threshold)
+    if failed:
+        print(f"\n{len(failed)} gated metric(s) regressed more than {args.threshold:.0%}: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\nno gated metric regressed more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""History chart render time from 1k to 1M logged days.
+
+For each size, builds ``HistoryAnalytics`` over a synthetic log with one row
+per day and times: LTTB downsampling of the hours series, a cold render of
+all three charts (cache miss), a cached lookup (what a rerun pays), and the
+hours chart drawn from every point without downsampling for comparison.
+
+    python -m benchmarks.bench_charts [max_days]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern import charts
+from study_pattern.analytics import HistoryAnalytics
+from study_pattern.theme import THEMES
+
+
+def make_log(path: Path, days: int):
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("2018-01-01") + np.arange(days).astype("timedelta64[D]")
+    pd.DataFrame({
+        "Date": dates.astype(str),
+        "Study_Hours": (6 + 3 * np.sin(np.arange(days) / 30) + rng.normal(0, 1.5, days)).clip(0, 12).round(1),
+        "Sleep_Hours": rng.uniform(3, 9, days).round(1),
+        "Distractions": rng.integers(0, 10, days),
+        "Breaks": rng.integers(0, 6, days),
+        "Mood": rng.choice(["Focused", "Motivated", "Neutral", "Stressed", "Tired"], days),
+        "Score": rng.uniform(30, 100, days).round(1),
+    }).to_csv(path, index=False)
+
+
+def timed(fn, runs):
+    samples = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e3
+
+
+def main(max_days=1_000_000):
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= max_days]
+    palette = THEMES["Light"]
+    print(f"{'days':>10}{'lttb':>10}{'cold render':>14}{'cached':>10}{'all points':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = Path(tmp) / f"logs_{n}.csv"
+            make_log(path, n)
+            history = HistoryAnalytics(path)
+            days, hours, _ = history.daily_series()
+            charts.history_charts(history)  # import matplotlib/seaborn outside the timings
+
+            lttb = timed(lambda i: charts.downsample(days, hours), 5)
+            # A different goal each run misses the cache and redraws all three charts.
+            cold = timed(lambda i: charts.history_charts(history, "Dark", 1.0 + i), 3)
+            cached = timed(lambda i: charts.history_charts(history, "Dark", 1.0), 1000)
+            full = timed(lambda i: charts.hours_chart(days, hours, 6.0, palette, n_out=len(days)), 1)
+            print(f"{n:>10,}{lttb:>8.1f}ms{cold:>12.0f}ms{cached * 1e3:>8.1f}µs{full:>11.0f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""Cold-import time of the headless modules, each in a fresh interpreter.
+
+Fails (exit 1) if ``study_pattern.core`` is over its budget or if importing
+a headless module drags in Streamlit, reportlab or scikit-learn.
+
+    python -m benchmarks.bench_cold_import
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_MS = {"study_pattern.core": 30.0, "study_pattern.report": 30.0}
+HEAVY = ("streamlit", "reportlab", "sklearn", "joblib")
+MODULES = ("study_pattern.core", "study_pattern.report", "study_pattern.ring",
+           "study_pattern.profiling", "study_pattern.predict", "study_pattern.store")
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import {mod}
+ms = (time.perf_counter() - t0) * 1e3
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(ms, ",".join(heavy))
+"""
+
+
+def cold_import(mod, repeat=5):
+    best, heavy = float("inf"), ""
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(mod=mod, heavy=HEAVY)],
+                             cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+        best = min(best, float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return best, heavy
+
+
+def main():
+    failed = False
+    for mod in MODULES:
+        ms, heavy = cold_import(mod)
+        budget = BUDGET_MS.get(mod)
+        over = budget is not None and (ms > budget or heavy)
+        failed |= bool(over)
+        limit = f"budget {budget:.0f} ms" if budget else ""
+        print(f"{mod:<26}{ms:8.2f} ms  {limit:<14}{'heavy: ' + heavy if heavy else ''}"
+              f"{'  OVER' if over else ''}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Study log load time and memory: CSV vs columnar (.cols) at 10M rows.
+
+Writes a ``study_data.csv`` of ``rows`` rows, converts it to ``.cols`` and
+back, then opens each form with ``StudyLogStore`` in a fresh process and
+reports the open time, RSS (anonymous vs file-backed, i.e. shared page
+cache) and a first full-column scan.
+
+    python -m benchmarks.bench_columnar [rows]
+"""
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern import columnar
+
+MOODS = np.array(["Happy", "Neutral", "Stressed", "Tired", "Focused"])
+
+
+def make_data(path: Path, rows: int, chunk=1_000_000):
+    rng = np.random.default_rng(0)
+    first = True
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        # Date-ordered across chunks, like a log appended day by day.
+        span = (start * 9000 // rows, (start + n) * 9000 // rows + 1)
+        days = np.datetime64("2000-01-01") + np.sort(rng.integers(*span, n)).astype("timedelta64[D]")
+        pd.DataFrame({
+            "date": days.astype(str),
+            "hours_studied": (rng.integers(0, 25, n) / 2),
+            "breaks_taken": rng.integers(0, 9, n),
+            "revision": rng.integers(0, 2, n).astype(float),
+            "mood": MOODS[rng.integers(0, len(MOODS), n)],
+            "score": rng.uniform(0, 100, n).round(1),
+        }).to_csv(path, mode="w" if first else "a", header=first, index=False)
+        first = False
+
+
+def rss_mb():
+    status = Path("/proc/self/status").read_text()
+    fields = dict(line.split(":", 1) for line in status.splitlines())
+    return {k: int(fields[k].split()[0]) / 1024 for k in ("VmRSS", "RssAnon", "RssFile")}
+
+
+def child(path):
+    # Runs in a fresh interpreter: import first, so only the load is timed.
+    from study_pattern.store import StudyLogStore
+
+    before = rss_mb()
+    t0 = time.perf_counter()
+    store = StudyLogStore(path)
+    load = time.perf_counter() - t0
+    loaded = rss_mb()
+    t0 = time.perf_counter()
+    float(store.column("hours_studied").mean())
+    scan = time.perf_counter() - t0
+    print(json.dumps({"rows": len(store), "load_s": load, "scan_ms": scan * 1e3,
+                      **{f"{k}_mb": loaded[k] - before[k] for k in loaded},
+                      "scanned_rss_mb": rss_mb()["VmRSS"] - before["VmRSS"]}))
+
+
+def measure(path):
+    out = subprocess.run([sys.executable, "-m", "benchmarks.bench_columnar", "--child", str(path)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def size_mb(path: Path):
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.iterdir()) / 2**20
+    return path.stat().st_size / 2**20
+
+
+def main(rows=10_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, cols_path, back = (Path(tmp) / n for n in ("study_data.csv", "study_data.cols", "back.csv"))
+        t0 = time.perf_counter()
+        make_data(csv_path, rows)
+        print(f"wrote {rows:,} rows in {time.perf_counter() - t0:.1f} s")
+        t0 = time.perf_counter()
+        columnar.convert(csv_path, cols_path)
+        to_cols = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        columnar.convert(cols_path, back)
+        print(f"convert: csv -> cols {to_cols:.1f} s, cols -> csv {time.perf_counter() - t0:.1f} s")
+        back.unlink()
+
+        print(f"\n{'':<8}{'on disk':>10}{'open':>10}{'RSS':>10}{'anon':>10}{'file':>10}"
+              f"{'scan':>10}{'RSS after':>11}")
+        for name, path in (("csv", csv_path), ("cols", cols_path)):
+            r = measure(path)
+            assert r["rows"] == rows
+            print(f"{name:<8}{size_mb(path):>8.0f}MB{r['load_s']:>9.3f}s{r['VmRSS_mb']:>8.0f}MB"
+                  f"{r['RssAnon_mb']:>8.0f}MB{r['RssFile_mb']:>8.0f}MB{r['scan_ms']:>8.1f}ms"
+                  f"{r['scanned_rss_mb']:>9.0f}MB")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+    else:
+        main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,96 @@
+"""Stress test: 10k Pomodoro events per second through the background writer.
+
+Several producer threads (standing in for sessions) emit paced events for the
+duration; reports emit latency as seen by the rerun, how far the writer falls
+behind, drops, and whether every event reached the file and the stats.
+Compared against appending each event to the file inline.
+
+    python -m benchmarks.bench_events [events_per_s] [seconds] [producers]
+"""
+import json
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from study_pattern.events import EventLog
+
+CYCLE = (("start", "Work"), ("pause", "Work"), ("resume", "Work"), ("complete", "Work"),
+         ("start", "Break"), ("complete", "Break"))
+
+
+def pct(samples, p):
+    return statistics.quantiles(samples, n=100)[p - 1] * 1e6
+
+
+def producer(emit, idx, rate, seconds, lat):
+    session = f"s{idx:03d}"
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    for i in range(int(rate * seconds)):
+        due = start + i * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        kind, mode = CYCLE[i % len(CYCLE)]
+        t0 = time.perf_counter()
+        emit(session, kind, mode)
+        lat.append(time.perf_counter() - t0)
+
+
+def inline_writer(path):
+    lock = threading.Lock()
+
+    def emit(session, kind, mode):
+        line = json.dumps({"ts": time.time(), "session": session, "kind": kind, "mode": mode})
+        with lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return emit
+
+
+def run(name, emit, rate, seconds, producers, log=None):
+    lat, depth = [], []
+    threads = [threading.Thread(target=producer, args=(emit, i, rate / producers, seconds, lat))
+               for i in range(producers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        if log:
+            depth.append(log.pending())
+        time.sleep(0.05)
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    print(f"{name:<18} {len(lat) / elapsed:8.0f} ev/s  emit p50 {pct(lat, 50):6.1f} us"
+          f"  p99 {pct(lat, 99):7.1f} us  max {max(lat) * 1e3:6.2f} ms")
+    return depth
+
+
+def main(rate=10_000, seconds=5, producers=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.jsonl"
+        log = EventLog(path)
+        depth = run("queued writer", log.emit, rate, seconds, producers, log)
+        t0 = time.perf_counter()
+        log.close()
+        drain = time.perf_counter() - t0
+        lines = sum(1 for _ in open(path, encoding="utf-8"))
+        total = log.summary()
+        print(f"{'':<18} queue depth max {max(depth):,}, drained in {drain * 1e3:.0f} ms after the run;"
+              f" written {log.written:,}, dropped {log.dropped}, file lines {lines:,}")
+        expected = int(rate / producers * seconds) * producers
+        assert lines == log.written == expected, (lines, log.written, expected)
+        print(f"{'':<18} stats: {total['blocks']:,} work blocks, completion {total['completion_rate']:.0%},"
+              f" {total['avg_pauses']:.2f} pauses/block, {sum(total['focus_minutes'].values()):.0f} focus min")
+        replayed = EventLog(path).summary()
+        assert replayed == total
+        print(f"{'':<18} replaying the file reproduces the stats")
+
+        run("inline append", inline_writer(Path(tmp) / "inline.jsonl"), rate, seconds, producers)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,92 @@
+"""History panel cost at 100k logged rows.
+
+Times the analytics queries the panel makes, an incremental append versus a
+full reload, and the whole-page run with the shipped log versus a 100k-row log
+(the difference is what the panel adds to a rerun).
+
+    python -m benchmarks.bench_history [rows]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from study_pattern.analytics import HistoryAnalytics
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = str(ROOT / "study_analyzer.py")
+
+
+def make_log(path: Path, rows: int):
+    rng = np.random.default_rng(0)
+    days = np.sort(rng.integers(0, 3000, rows)).astype("timedelta64[D]") + np.datetime64("2018-01-01")
+    pd.DataFrame({
+        "Date": days.astype(str),
+        "Study_Hours": rng.uniform(0, 12, rows).round(1),
+        "Sleep_Hours": rng.uniform(3, 9, rows).round(1),
+        "Distractions": rng.integers(0, 10, rows),
+        "Breaks": rng.integers(0, 6, rows),
+        "Mood": rng.choice(["Focused", "Motivated", "Neutral", "Stressed", "Tired"], rows),
+        "Score": rng.uniform(30, 100, rows).round(1),
+    }).to_csv(path, index=False)
+
+
+def panel_queries(h: HistoryAnalytics):
+    h.refresh()
+    h.rolling_hours(7)
+    h.rolling_hours(30)
+    h.distraction_impact()
+    h.sleep_score_corr()
+    h.mood_distributions()
+
+
+def page_run_ms(logs_path, runs=15):
+    os.environ["STUDY_LOGS_PATH"] = str(logs_path)
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e3
+
+
+def main(rows=100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "study_logs.csv"
+        make_log(path, rows)
+
+        t0 = time.perf_counter()
+        h = HistoryAnalytics(path)
+        print(f"initial load, {rows:,} rows : {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+
+        t0 = time.perf_counter()
+        for _ in range(100):
+            panel_queries(h)
+        print(f"panel queries             : {(time.perf_counter() - t0) * 10:8.3f} ms")
+
+        t0 = time.perf_counter()
+        for _ in range(100):
+            h.append("2026-03-20", 5.0, 7.0, 2, 1, "Focused", 80.0)
+        print(f"incremental append        : {(time.perf_counter() - t0) * 10:8.3f} ms/row")
+        t0 = time.perf_counter()
+        HistoryAnalytics(path)
+        print(f"full recompute            : {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+
+        small = page_run_ms(ROOT / "study_logs.csv")
+        large = page_run_ms(path)
+        print(f"page run, shipped log     : {small:8.1f} ms")
+        print(f"page run, {rows:,} rows    : {large:8.1f} ms  (panel delta {large - small:+.1f} ms)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
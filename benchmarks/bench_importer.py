@@ -0,0 +1,80 @@
+"""Bulk importer throughput, memory and resume on a synthetic cohort export.
+
+Writes a ``study_logs.csv``-shaped export with a ``student_id`` column and
+about 0.1% bad rows, imports it inline (one core) and, with more than one
+core, with one worker process per core, then appends 10% more rows and re-runs the import, which
+resumes from the checkpoint and parses only the new bytes.
+
+    python -m benchmarks.bench_importer [rows]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern.importer import Importer
+
+PEAK = ("import re, sys; from study_pattern.importer import main; main(sys.argv[1:]); "
+        "print(re.search(r'VmHWM:\\s+(\\d+)', open('/proc/self/status').read())[1])")
+MOODS = np.array(["Focused", "Motivated", "Neutral", "Stressed", "Tired", "happy"])
+
+
+def write_export(path, rows, rng, header=True, chunk=1_000_000):
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        hours = rng.uniform(0, 12, n).round(1)
+        breaks = rng.integers(0, 7, n).astype(object)
+        mood = MOODS[rng.integers(0, len(MOODS), n)].astype(object)
+        bad = rng.random(n) < 0.001
+        hours[bad & (rng.random(n) < 0.3)] = 14.0
+        breaks[bad & (rng.random(n) < 0.5)] = "two"
+        mood[bad & (rng.random(n) < 0.5)] = "Bored"
+        pd.DataFrame({
+            "student_id": np.char.add("stu", rng.integers(0, 20_000, n).astype(str)),
+            "Date": (np.datetime64("2024-01-01") + rng.integers(0, 600, n).astype("timedelta64[D]")).astype(str),
+            "Study_Hours": hours, "Sleep_Hours": rng.uniform(3, 9, n).round(1),
+            "Distractions": rng.integers(0, 10, n), "Breaks": breaks, "Mood": mood,
+            "Score": rng.uniform(30, 100, n).round(1),
+        }).to_csv(path, mode="w" if header and start == 0 else "a", header=header and start == 0, index=False)
+
+
+def run(src, out, workers, restart=True):
+    stats = Importer(src, out, workers=workers).run(restart=restart, progress=None)
+    per_core = stats["rows_per_s"] / max(1, min(workers, os.cpu_count() or 1))
+    return stats, per_core
+
+
+def main(rows=5_000_000):
+    rng = np.random.default_rng(0)
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        src, out = Path(tmp) / "export.csv", Path(tmp) / "cohort.cols"
+        write_export(src, rows, rng)
+        print(f"{rows:,} rows, {src.stat().st_size / 2**20:.0f} MB, {cores} core(s)")
+
+        runs = [("inline (1 core)", 1)] + ([(f"{cores} worker processes", cores)] if cores > 1 else [])
+        for label, workers in runs:
+            stats, per_core = run(src, out, workers)
+            print(f"{label:<24}: {stats['seconds']:6.2f} s  {stats['rows_per_s']:>12,.0f} rows/s"
+                  f"  {per_core:>12,.0f} rows/s/core  rejected {stats['rejected']:,}")
+        if cores == 1:
+            print(f"{'worker processes':<24}: skipped on one core (they would only add IPC)")
+
+        write_export(src, rows // 10, rng, header=False)
+        stats, _ = run(src, out, 1, restart=False)
+        print(f"resume after +10% rows   : {stats['seconds']:6.2f} s  {stats['rows']:,} new rows"
+              f" ({stats['total_rows']:,} total), {stats['bytes'] / 2**20:.0f} MB read")
+        # The child reports its own VmHWM: ru_maxrss would carry this process's peak across exec.
+        res = subprocess.run([sys.executable, "-c", PEAK, str(src), "--out", str(out), "--workers", "1", "--restart"],
+                            check=True, capture_output=True, text=True)
+        peak = int(res.stdout.split()[-1]) / 1024
+        print(f"peak RSS, inline import  : {peak:.0f} MB for a {src.stat().st_size / 2**20:.0f} MB file"
+              f" (8 MB chunks)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
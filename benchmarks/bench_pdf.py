@@ -0,0 +1,48 @@
+"""Rerun latency with and without the eager PDF build.
+
+"eager" is study_analyzer.py with the download payload rendered on every run
+(the previous behaviour); "lazy" is the page as shipped, where the PDF is only
+rendered when the download is clicked.
+
+    python -m benchmarks.bench_pdf
+"""
+import statistics
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+APP = Path(__file__).resolve().parent.parent / "study_analyzer.py"
+RUNS = 30
+
+
+def rerun_latency(at: AppTest, runs: int):
+    at.run()  # warm-up
+    samples = []
+    for i in range(runs):
+        # Move a slider so every run is a "real" rerun with a new report key.
+        at.slider[0].set_value(float(i % 12))
+        t0 = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), max(samples)
+
+
+def main():
+    lazy_src = APP.read_text(encoding="utf-8")
+    eager_src = lazy_src.replace("data=pdf_payload,", "data=build_pdf(report),")
+    assert eager_src != lazy_src, "download payload moved; update the benchmark"
+
+    results = {}
+    for name, src in (("eager", eager_src), ("lazy", lazy_src)):
+        at = AppTest.from_string(src, default_timeout=60)
+        results[name] = rerun_latency(at, RUNS)
+
+    for name, (p50, worst) in results.items():
+        print(f"{name:<6} p50 {p50 * 1e3:7.2f} ms   max {worst * 1e3:7.2f} ms")
+    saved = results["eager"][0] - results["lazy"][0]
+    print(f"saved per rerun: {saved * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Plan optimizer latency: the 650-plan grid in one model call vs plan by plan.
+
+Times a cold ranking (LRU cleared) for every mood x energy x goal the form
+offers, a memoized lookup, and scoring the same grid one predict call per
+plan, the way re-clicking Analyze per slider setting would.
+
+    python -m benchmarks.bench_planner
+"""
+import statistics
+import time
+
+import numpy as np
+
+from study_pattern import planner
+from study_pattern.predict import load_artifacts, predict_scores
+
+MOODS = ("Happy", "Neutral", "Stressed", "Tired")
+ENERGY = ("High", "Medium", "Low")
+GOALS = np.arange(1.0, 12.5, 0.5)
+
+
+def main():
+    artifacts = load_artifacts()
+    planner.best_plans("Happy", "High", 6.0, artifacts=artifacts)  # warm the model
+
+    cold = []
+    for mood in MOODS:
+        for energy in ENERGY:
+            for goal in GOALS[::4]:
+                planner._ranked.cache_clear()
+                t0 = time.perf_counter()
+                planner.best_plans(mood, energy, goal, artifacts=artifacts)
+                cold.append(time.perf_counter() - t0)
+    q = statistics.quantiles(cold, n=100)
+    print(f"grid of {len(planner.GRID_HOURS)} plans, cold : p50 {q[49] * 1e3:6.2f} ms   p95 {q[94] * 1e3:6.2f} ms"
+          f"   max {max(cold) * 1e3:6.2f} ms   (target < 20 ms)")
+
+    t0 = time.perf_counter()
+    for _ in range(10_000):
+        planner.best_plans("Happy", "High", 6.0, artifacts=artifacts)
+    print(f"memoized lookup          : {(time.perf_counter() - t0) / 10_000 * 1e6:6.2f} µs")
+
+    t0 = time.perf_counter()
+    for h, b in zip(planner.GRID_HOURS, planner.GRID_BREAKS):
+        predict_scores({"hours": [h], "breaks": [b], "mood": ["Happy"]}, artifacts)
+    print(f"one predict per plan     : {(time.perf_counter() - t0) * 1e3:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Reruns per minute and CPU with a Pomodoro timer, measured on the real page.
+
+Drives ``study_analyzer.py`` through ``AppTest`` the way a browser does:
+after each full run, every fragment that asked for ``run_every`` is rerun
+(fragment-scoped) at its interval, and a ``st.rerun(scope="app")`` from it
+becomes a full run. Over ``--seconds`` of wall time it counts full-page and
+fragment runs and the process CPU for:
+
+- the whole page rerun every second (what each tick cost before the fragment),
+- the timer running, with a phase ending mid-window so a transition shows up,
+- the timer paused from the sidebar (no runs expected).
+
+    python -m benchmarks.bench_pomodoro [--seconds 30]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import streamlit
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData, ScriptRequests
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.local_script_runner import (
+    LocalScriptRunner, parse_tree_from_messages, require_widgets_deltas,
+)
+
+APP = str(Path(__file__).resolve().parent.parent / "study_analyzer.py")
+
+
+class _BrowserRunner(LocalScriptRunner):
+    # One runner per AppTest run; the browser loop below sets ``fragment``
+    # for an auto-rerun and reads back what the run did.
+    fragment = None
+    runs = []     # "full" / "fragment", one per script start
+    timers = {}   # fragment id -> interval (s), from the latest full run
+
+    def run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        if _BrowserRunner.fragment is None:
+            tree = super().run(widget_state, query_params, timeout, page_hash)
+        else:
+            # The constructor queued a full rerun, which would swallow a fragment-scoped one.
+            self._requests = ScriptRequests()
+            self.request_rerun(RerunData(widget_states=widget_state, page_script_hash=page_hash,
+                                         fragment_id_queue=[_BrowserRunner.fragment], is_auto_rerun=True))
+            try:
+                self.start()
+                require_widgets_deltas(self, timeout)
+            finally:
+                self.join()
+            tree = parse_tree_from_messages(self.forward_msgs())
+        starts = [data for event, data in zip(self.events, self.event_data)
+                  if event == ScriptRunnerEvent.SCRIPT_STARTED]
+        _BrowserRunner.runs += ["fragment" if data.get("fragment_ids_this_run") else "full" for data in starts]
+        if any(not data.get("fragment_ids_this_run") for data in starts):
+            # A full run replaces the page's auto-rerun timers.
+            _BrowserRunner.timers = {msg.auto_rerun.fragment_id: msg.auto_rerun.interval
+                                     for msg in self.forward_msgs() if msg.HasField("auto_rerun")}
+        return tree
+
+
+def run_page(at, fragment=None):
+    """One full run, or one auto-rerun of ``fragment`` with the page's widget state."""
+    page = at._tree
+    _BrowserRunner.fragment = fragment
+    try:
+        (page if fragment else at).run()
+    finally:
+        _BrowserRunner.fragment = None
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    if fragment and _BrowserRunner.runs[-1] == "fragment":
+        at._tree = page  # the browser keeps the rest of the page
+
+
+def browse(at, seconds, whole_page=False):
+    """Let ``at`` sit open for ``seconds``; returns (full runs, fragment runs, CPU s)."""
+    _BrowserRunner.runs = []
+    due = {}
+    cpu0 = time.process_time()
+    end = time.perf_counter() + seconds
+    while True:
+        now = time.perf_counter()
+        timers = {None: 1.0} if whole_page else _BrowserRunner.timers
+        due = {f: due.get(f, now + interval) for f, interval in timers.items()}
+        if not due:
+            time.sleep(max(0.0, end - now))
+            break
+        fragment, at_time = min(due.items(), key=lambda item: item[1])
+        if at_time >= end:
+            time.sleep(max(0.0, end - now))
+            break
+        time.sleep(max(0.0, at_time - now))
+        run_page(at, fragment)
+        # Missed ticks coalesce, as the browser's interval timer does.
+        due[fragment] = max(at_time + timers[fragment], time.perf_counter())
+    cpu = time.process_time() - cpu0
+    return _BrowserRunner.runs.count("full"), _BrowserRunner.runs.count("fragment"), cpu
+
+
+def open_page(seconds_left):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["pomo_running"] = True
+    at.session_state["pomo_target_ts"] = int(time.time()) + seconds_left
+    run_page(at)
+    return at
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=30, help="wall time per scenario (default: 30)")
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("STUDY_EVENTS_PATH", os.path.join(tmp, "events.jsonl"))
+    os.environ.setdefault("STUDY_DATA_PATH", os.path.join(tmp, "study_data.csv"))
+    # The page's number_input value/key warning would print a stack per rerun.
+    streamlit.logger.set_log_level("error")
+    app_test.LocalScriptRunner = _BrowserRunner
+    open_page(3600)  # warm the process-wide caches
+
+    rows = []
+    at = open_page(3600)
+    rows.append(("whole page every second", *browse(at, args.seconds, whole_page=True)))
+    at = open_page(int(args.seconds / 2))
+    rows.append(("running (fragment ticks)", *browse(at, args.seconds)))
+    at = open_page(3600)
+    next(b for b in at.button if b.label == "⏸️ Pause").click()
+    run_page(at)
+    rows.append(("paused from the sidebar", *browse(at, args.seconds)))
+
+    scale = 60 / args.seconds
+    print(f"{args.seconds:g} s per scenario, counts scaled to one minute\n")
+    print(f"{'scenario':<28}{'full/min':>10}{'frag/min':>10}{'CPU s/min':>11}{'% core':>8}")
+    for name, full, fragment, cpu in rows:
+        print(f"{name:<28}{full * scale:>10.1f}{fragment * scale:>10.1f}{cpu * scale:>11.3f}"
+              f"{cpu / args.seconds * 100:>7.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Cold artifact load plus single-row vs 10k-row batch prediction latency.
+
+    python -m benchmarks.bench_predict
+"""
+import time
+
+import numpy as np
+
+from study_pattern.predict import load_artifacts, predict_scores
+
+
+def rows(n, rng):
+    return {
+        "hours": rng.integers(0, 25, n) / 2,
+        "breaks": rng.integers(0, 13, n),
+        "mood": rng.choice(["Happy", "Neutral", "Stressed", "Tired"], n),
+    }
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    t0 = time.perf_counter()
+    load_artifacts()
+    print(f"cold load (joblib + sklearn import): {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+    t0 = time.perf_counter()
+    load_artifacts()
+    print(f"warm load (cached)                 : {(time.perf_counter() - t0) * 1e6:8.1f} us")
+
+    rng = np.random.default_rng(0)
+    one, batch = rows(1, rng), rows(10_000, rng)
+    single = best_of(lambda: predict_scores(one), 20)
+    whole = best_of(lambda: predict_scores(batch), 5)
+    print(f"single row                         : {single * 1e3:8.2f} ms")
+    print(f"10k rows, one batch                : {whole * 1e3:8.2f} ms ({whole / 1e4 * 1e6:.2f} us/row)")
+    print(f"10k rows, one call per row (est.)  : {single * 1e4:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Streak/XP recompute for a whole cohort, and incremental leaderboard updates.
+
+Replays a dated log through the old per-session streak arithmetic (one Python
+step per row) and through the vectorized ``recompute``; then appends new rows
+one at a time and compares ``Leaderboard.record`` + ``rank`` against
+re-ranking every user after each row.
+
+    python -m benchmarks.bench_progress [rows] [users]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from study_pattern.progress import XP_PER_HIT, Leaderboard, recompute
+
+
+def legacy_replay(users, days, hours, goals):
+    # The `if submitted:` arithmetic from study_analyzer.py, one session per user.
+    state = {}
+    for user, day, h, g in zip(users, days, hours, goals):
+        s = state.setdefault(user, {"xp": 0, "streak": 0, "last": None})
+        if h >= g:
+            s["xp"] += XP_PER_HIT
+            if s["last"] != day:
+                if s["last"] is not None and day - s["last"] == 1:
+                    s["streak"] += 1
+                elif s["last"] is None or day - s["last"] > 1:
+                    s["streak"] = 1
+                s["last"] = day
+    return state
+
+
+def cohort(n, n_users, rng):
+    days = np.sort(rng.integers(20000, 20000 + 365, n)).astype(np.int32)
+    users = np.char.add("u", rng.integers(0, n_users, n).astype(str))
+    hours = rng.integers(0, 25, n) / 2
+    goals = rng.integers(2, 17, n) / 2
+    return users, days, hours, goals
+
+
+def pct(samples, p):
+    return statistics.quantiles(samples, n=100)[p - 1] * 1e6
+
+
+def main(n=1_000_000, n_users=50_000):
+    rng = np.random.default_rng(0)
+    users, days, hours, goals = cohort(n, n_users, rng)
+
+    t0 = time.perf_counter()
+    cols = recompute(users, days, hours, goals)
+    t_vec = time.perf_counter() - t0
+    rows = list(zip(users.tolist(), days.tolist(), hours.tolist(), goals.tolist()))
+    t0 = time.perf_counter()
+    state = legacy_replay(*zip(*rows))
+    t_loop = time.perf_counter() - t0
+    print(f"recompute, {n:,} rows / {len(cols['user']):,} users : {t_vec:6.3f} s vectorized,"
+          f" {t_loop:6.3f} s per-row replay ({t_loop / t_vec:.1f}x)")
+    for i, user in enumerate(cols["user"].tolist()):
+        s = state[user]
+        assert (cols["xp"][i], cols["streak"][i]) == (s["xp"], s["streak"]), user
+    print("recompute matches the per-row replay")
+
+    from study_pattern.store import day_date
+    iso_rows = [(u, day_date(d).isoformat(), h, g) for u, d, h, g in rows]
+    t0 = time.perf_counter()
+    board = Leaderboard(iso_rows)
+    print(f"leaderboard build from log : {time.perf_counter() - t0:6.3f} s")
+
+    new_users, new_days, new_hours, new_goals = cohort(10_000, n_users, rng)
+    last_day = day_date(int(days.max()) + 1).isoformat()
+    lat = []
+    for u, h, g in zip(new_users.tolist(), new_hours.tolist(), new_goals.tolist()):
+        t0 = time.perf_counter()
+        board.record(u, last_day, h, g)
+        board.rank(u)
+        lat.append(time.perf_counter() - t0)
+
+    xp = {u: s["xp"] for u, s in state.items()}
+    full = []
+    for u, h, g in list(zip(new_users.tolist(), new_hours.tolist(), new_goals.tolist()))[:50]:
+        t0 = time.perf_counter()
+        xp[u] = xp.get(u, 0) + (XP_PER_HIT if h >= g else 0)
+        ranked = sorted(xp.values(), reverse=True)
+        ranked.index(xp[u])
+        full.append(time.perf_counter() - t0)
+    print(f"new row + rank, incremental: p50 {pct(lat, 50):8.1f} us  p99 {pct(lat, 99):8.1f} us")
+    print(f"new row + rank, full re-rank: p50 {pct(full, 50):8.1f} us  p99 {pct(full, 99):8.1f} us")
+
+    check = Leaderboard(iso_rows + [(u, last_day, h, g) for u, h, g in
+                                    zip(new_users.tolist(), new_hours.tolist(), new_goals.tolist())])
+    assert board.top() == check.top()
+    assert all(board.stats(u) == check.stats(u) for u in new_users.tolist()[:1000])
+    print("incremental top-K and stats match a full rebuild")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
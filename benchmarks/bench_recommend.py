@@ -0,0 +1,84 @@
+"""Cohort recommendations: vectorized rule table vs the per-row if/elif function.
+
+Also checks that the rule table fires exactly the rules the old if/elif chain
+did, and that the batch and single-row paths pick the same seeded tips.
+
+    python -m benchmarks.bench_recommend [rows]
+"""
+import random
+import sys
+import time
+
+import numpy as np
+
+from study_pattern.recommend import GENERAL_TIPS, evaluate, recommend, seeds_for
+
+
+def legacy_rules(h, g, b, rev, md, en, focus, tips=False):
+    # The if/elif chain from study_analyzer.py before the rule table, kept here
+    # as the reference implementation; tips=True adds its global-RNG tips.
+    recs = []
+    if h < g * 0.6: recs.append("📈 You studied less than planned. Schedule **two 45-min blocks** tomorrow.")
+    elif h < g:     recs.append("👍 Close to your goal—add **one extra 30-min session**.")
+    else:           recs.append("🏅 Goal achieved! Do a **quick recap** to lock it in.")
+    if b == 0:      recs.append("☕ Add **short 5-min breaks** every 25–30 minutes.")
+    elif b > 6:     recs.append("🧭 Too many breaks—aim for **2–5** evenly spaced.")
+    if rev == "No": recs.append("🔁 Do **10-minute active recall** on yesterday’s topic.")
+    if md == "Stressed" and en in ("Low","Medium"): recs.append("🧘 Try **box breathing (5 min)** or a brief walk.")
+    if md == "Tired" and en == "Low": recs.append("😴 Take a **20-min power nap** then one short session.")
+    if md == "Happy" and en == "High": recs.append("🚀 Plan a **deep work block (60–90 min)** on your hardest topic.")
+    if focus:       recs.append(f"🎯 Stick to **{focus}** and end with a **3-point summary**.")
+    if tips:
+        recs.extend(random.sample(GENERAL_TIPS, 2))
+    return recs
+
+
+def cohort(n, rng):
+    return {
+        "hours": rng.integers(0, 25, n) / 2,
+        "goal": rng.integers(2, 25, n) / 2,
+        "breaks": rng.integers(0, 13, n),
+        "revision": rng.choice(["Yes", "No"], n),
+        "mood": rng.choice(["Happy", "Neutral", "Stressed", "Tired"], n),
+        "energy": rng.choice(["High", "Medium", "Low"], n),
+        "focus": rng.choice(["", "", "DBMS", "Calculus"], n),
+    }
+
+
+def main(n=1_000_000):
+    rng = np.random.default_rng(0)
+    cols = cohort(n, rng)
+    users = [f"u{i % 5000}" for i in range(n)]
+    days = [f"2026-09-{1 + i // 5000 % 28:02d}" for i in range(n)]
+
+    t0 = time.perf_counter()
+    seeds = seeds_for(users, days)
+    t_seed = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batch = evaluate(cols, seeds)
+    t_eval = time.perf_counter() - t0
+    print(f"vectorized, {n:,} rows : {t_eval:6.3f} s rules+tips, {t_seed:6.3f} s seeds")
+
+    sample = min(n, 100_000)
+    rows = [{k: v[i].item() for k, v in cols.items()} for i in range(sample)]
+    t0 = time.perf_counter()
+    for row in rows:
+        legacy_rules(*row.values(), tips=True)
+    t_legacy = (time.perf_counter() - t0) / sample * n
+    t0 = time.perf_counter()
+    for i, row in enumerate(rows):
+        recommend(row, users[i], days[i])
+    t_single = (time.perf_counter() - t0) / sample * n
+    print(f"per-row if/elif chain  : {t_legacy:6.3f} s (extrapolated from {sample:,})")
+    print(f"per-row rule table     : {t_single:6.3f} s (extrapolated from {sample:,})")
+    print(f"speed-up vs if/elif    : {t_legacy / (t_eval + t_seed):6.1f}x")
+
+    for i in range(0, sample, 97):
+        row = rows[i]
+        assert batch.texts(i)[:-2] == legacy_rules(*row.values()), i
+        assert batch.texts(i) == recommend(row, users[i], days[i]), i
+    print("outputs match the if/elif chain and the single-row path")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
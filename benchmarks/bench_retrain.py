@@ -0,0 +1,104 @@
+"""Incremental retraining throughput and model hot-swap latency.
+
+Trains on a synthetic ``study_data.csv`` of ``rows`` rows, appends 10% more
+and retrains incrementally (vs retraining from scratch over everything).
+Then publishes new versions while a thread predicts single rows back to
+back, and reports how long the watcher took to serve each one and the
+predict latency around the swaps.
+
+    python -m benchmarks.bench_retrain [rows]
+"""
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern.predict import ModelWatcher, predict_scores, read_artifacts
+from study_pattern.retrain import Retrainer
+
+ROW = {"hours": [5.0], "breaks": [2], "mood": ["Tired"]}
+
+
+def write_rows(path, n, rng, header):
+    hours = rng.integers(0, 25, n) / 2
+    breaks = rng.integers(0, 9, n)
+    score = np.clip(40 + 6 * hours - 2 * np.abs(breaks - 3) + rng.normal(0, 5, n), 0, 100).round(1)
+    pd.DataFrame({
+        "date": pd.Timestamp("2026-01-01") + pd.to_timedelta(rng.integers(0, 280, n), unit="D"),
+        "hours_studied": hours, "breaks_taken": breaks, "revision": rng.integers(0, 2, n).astype(float),
+        "mood": rng.choice(["Happy", "Neutral", "Stressed", "Tired"], n), "score": score,
+    }).to_csv(path, mode="w" if header else "a", header=header, index=False, date_format="%Y-%m-%d")
+
+
+def pct(samples, p):
+    return statistics.quantiles(samples, n=100)[p - 1] * 1e3
+
+
+def main(n=1_000_000):
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        data = tmp / "study_data.csv"
+        write_rows(data, n, rng, header=True)
+
+        trainer = Retrainer(data, tmp / "models")
+        meta = trainer.run_once()
+        print(f"initial train    : {meta['new_rows']:>10,} rows  {meta['train_seconds']:6.2f} s"
+              f"  {meta['rows_per_s']:>10,} rows/s  holdout MAE {meta['holdout_mae']:.2f} (live {meta['live_mae']:.2f})"
+              f"{'' if meta['published'] else ', not published'}")
+        write_rows(data, n // 10, rng, header=False)
+        meta = trainer.run_once()
+        print(f"incremental      : {meta['new_rows']:>10,} rows  {meta['train_seconds']:6.2f} s"
+              f"  {meta['rows_per_s']:>10,} rows/s  holdout MAE {meta['holdout_mae']:.2f} (live {meta['live_mae']:.2f})"
+              f"{'' if meta['published'] else ', not published'}")
+        t0 = time.perf_counter()
+        full = Retrainer(data, tmp / "refit").run_once()
+        print(f"from scratch     : {full['new_rows']:>10,} rows  {time.perf_counter() - t0:6.2f} s"
+              f"  (what each update would cost without partial_fit)")
+
+        watcher = ModelWatcher(tmp / "models", interval=0.05)
+        t0 = time.perf_counter()
+        read_artifacts(tmp / "models" / watcher.version)
+        load_ms = (time.perf_counter() - t0) * 1e3
+
+        stop, lat = threading.Event(), []
+
+        def predict_loop():
+            while not stop.is_set():
+                t = time.perf_counter()
+                predict_scores(ROW, watcher.current())
+                lat.append((t, time.perf_counter() - t))
+
+        thread = threading.Thread(target=predict_loop)
+        thread.start()
+        swaps = []
+        for _ in range(10):
+            time.sleep(0.3)
+            artifacts, meta = trainer.current()
+            meta["version"] += 1
+            before = watcher.version
+            trainer.publish(artifacts, meta)
+            published = time.time()
+            while watcher.version == before:
+                time.sleep(0.001)
+            swaps.append(watcher.swapped_at - published)
+        time.sleep(0.3)
+        stop.set()
+        thread.join()
+
+        first_swap = lat[0][0] + 0.3
+        steady = [d for t, d in lat if t < first_swap]
+        during = [d for t, d in lat if t >= first_swap]
+        print(f"swap latency     : p50 {statistics.median(swaps) * 1e3:6.1f} ms  max {max(swaps) * 1e3:6.1f} ms"
+              f"  (publish -> served, poll interval 50 ms; load {load_ms:.1f} ms off the predict path)")
+        print(f"predict latency  : steady p99 {pct(steady, 99):6.2f} ms  max {max(steady) * 1e3:6.2f} ms")
+        print(f"                   across 10 swaps p99 {pct(during, 99):6.2f} ms  max {max(during) * 1e3:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
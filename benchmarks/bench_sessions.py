@@ -0,0 +1,98 @@
+"""Load test: hundreds of concurrent sessions writing to the SQLite session store.
+
+Each simulated session restores its state, then "reruns" every 20-80 ms for
+the duration, changing its state and staging it. Compared against writing
+through the same pool with one commit per rerun.
+
+    python -m benchmarks.bench_sessions [sessions] [seconds]
+"""
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from study_pattern.sessions import SessionStore
+
+
+def pct(samples, p):
+    return statistics.quantiles(samples, n=100)[p - 1] * 1e3 if len(samples) > 1 else 0.0
+
+
+def state_for(i, step):
+    return {"xp": step * 20, "streak": step % 7, "hours": random.choice([2.0, 4.5, 6.0]),
+            "chat": [["user", f"s{i} step {step}"], ["bot", "tip " * 40]]}
+
+
+def session(store, i, stop, direct, lat, errors):
+    user = f"user{i:04d}"
+    store.load(user)
+    step = 0
+    while not stop.is_set():
+        step += 1
+        state = state_for(i, step)
+        t0 = time.perf_counter()
+        try:
+            if direct:
+                store.stage(user, state)
+                store.flush()  # one transaction per rerun, from this session's thread
+            else:
+                store.stage(user, state)
+        except sqlite3.OperationalError:
+            errors.append(1)
+        lat.append(time.perf_counter() - t0)
+        time.sleep(random.uniform(0.02, 0.08))
+
+
+def run(n, seconds, direct):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(Path(tmp) / "sessions.db", pool_size=8,
+                             flush_interval=3600 if direct else 0.5)
+        flushes = []
+        if not direct:
+            # Time the background flushes by wrapping flush().
+            inner = store.flush
+
+            def timed_flush():
+                t0 = time.perf_counter()
+                rows = inner()
+                if rows:
+                    flushes.append((time.perf_counter() - t0, rows))
+                return rows
+            store.flush = timed_flush
+
+        stop, lat, errors = threading.Event(), [], []
+        threads = [threading.Thread(target=session, args=(store, i, stop, direct, lat, errors))
+                   for i in range(n)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        t0 = time.perf_counter()
+        for i in range(0, n, max(1, n // 50)):
+            store.load(f"user{i:04d}")
+        load_ms = (time.perf_counter() - t0) / len(range(0, n, max(1, n // 50))) * 1e3
+        store.close()
+
+    name = "commit per rerun" if direct else "staged + batched"
+    print(f"{name:<18} reruns {len(lat) / seconds:8.0f}/s  rerun write p50 {pct(lat, 50):7.3f} ms"
+          f"  p99 {pct(lat, 99):8.3f} ms  errors {len(errors)}  load {load_ms:.3f} ms")
+    if flushes:
+        times = [t for t, _ in flushes]
+        rows = sum(r for _, r in flushes) / len(flushes)
+        print(f"{'':<18} {len(flushes)} flushes, {rows:.0f} rows/flush, flush p99 {pct(times, 99):.1f} ms")
+
+
+def main(n=300, seconds=5):
+    run(n, seconds, direct=False)
+    run(n, seconds, direct=True)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""StudyLogStore at cohort scale: load, range queries and appends.
+
+    python -m benchmarks.bench_store [rows]
+"""
+import datetime as dt
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern.store import StudyLogStore
+
+
+def make_csv(path: Path, rows: int):
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2020-01-01")
+    days = np.sort(rng.integers(0, 2000, rows)).astype("timedelta64[D]") + start
+    pd.DataFrame({
+        "date": days.astype(str),
+        "hours_studied": rng.integers(0, 25, rows) / 2,
+        "breaks_taken": rng.integers(0, 13, rows),
+        "revision": rng.integers(0, 2, rows).astype(float),
+        "mood": rng.choice(["Happy", "Neutral", "Stressed", "Tired"], rows),
+        "score": rng.integers(0, 101, rows),
+        "user": np.char.add("user", rng.integers(0, 1000, rows).astype(str)),
+    }).to_csv(path, index=False)
+    return dt.date.fromisoformat(str(days[-1]))
+
+
+def timed(fn, repeat=1):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return (time.perf_counter() - t0) / repeat, out
+
+
+def main(rows=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "study_data.csv"
+        last = make_csv(path, rows)
+        load_s, store = timed(lambda: StudyLogStore(path))
+        print(f"load {rows:,} rows         : {load_s * 1e3:9.1f} ms")
+
+        for days in (7, 30):
+            q_s, view = timed(lambda: store.last_days(days, today=last), repeat=1000)
+            print(f"last {days:>2} days (index)   : {q_s * 1e6:9.1f} us  ({len(view['date']):,} rows)")
+
+        q_s, view = timed(lambda: store.last_days(30, today=last, user="user7"), repeat=1000)
+        print(f"last 30 days, one user : {q_s * 1e6:9.1f} us  ({len(view['date']):,} rows)")
+
+        df = pd.read_csv(path, parse_dates=["date"])
+        cutoff = pd.Timestamp(last - dt.timedelta(days=29))
+        scan_s, _ = timed(lambda: df[df["date"] >= cutoff], repeat=20)
+        print(f"last 30 days (full scan): {scan_s * 1e6:9.1f} us  (pandas, already parsed)")
+
+        append_s, _ = timed(lambda: store.append(last, 3.0, 2, 1.0, "Happy", 50, user="user7"), repeat=1000)
+        print(f"append                  : {append_s * 1e6:9.1f} us/row")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,68 @@
+"""Bytes of element payload emitted per rerun, optionally against an older revision.
+
+Sums the serialized size of every element proto produced by one page run, and
+separately the stylesheet and the HTML card snippets.
+
+    python -m benchmarks.bench_theme [--against REV]
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def walk(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        yield node
+        return
+    for child in children.values():
+        yield from walk(child)
+
+
+def payload_bytes(source: str):
+    at = AppTest.from_string(source, default_timeout=60)
+    at.run()
+    at.button[0].click()  # Analyze, so the feeds have bubbles
+    at.run()
+    at.run()  # the measured rerun
+    total = css = html = 0
+    for el in walk(at._tree):
+        proto = getattr(el, "proto", None)
+        if proto is None:
+            continue
+        size = proto.ByteSize()
+        total += size
+        body = getattr(proto, "body", "")
+        if isinstance(body, str) and body.lstrip().startswith("<style"):
+            css += size
+        elif isinstance(body, str) and body.lstrip().startswith("<"):
+            html += size
+    return total, css, html
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--against", help="git revision to compare with")
+    args = ap.parse_args()
+
+    sources = {"current": (ROOT / "study_analyzer.py").read_text(encoding="utf-8")}
+    if args.against:
+        sources[args.against] = subprocess.run(
+            ["git", "show", f"{args.against}:study_analyzer.py"], cwd=ROOT,
+            check=True, capture_output=True, text=True).stdout
+
+    os.environ["STUDY_DATA_PATH"] = os.path.join(tempfile.mkdtemp(), "study_data.csv")
+    print(f"{'revision':<12}{'total B':>10}{'css B':>8}{'cards B':>9}")
+    for name, src in sources.items():
+        total, css, html = payload_bytes(src)
+        print(f"{name:<12}{total:>10}{css:>8}{html:>9}")
+
+
+if __name__ == "__main__":
+    main()
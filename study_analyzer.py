@@ -1,13 +1,29 @@
 # app.py
+import os
 import time
-import random
+import uuid
 import datetime as dt
-from io import BytesIO
+from pathlib import Path
 
+import pandas as pd
 import streamlit as st
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import simpleSplit
+
+from study_pattern import core
+from study_pattern.analytics import HistoryAnalytics
+from study_pattern.charts import history_charts
+from study_pattern.core import build_recommendations, format_seconds, growth_stage, percent
+from study_pattern.events import EventLog
+from study_pattern.planner import best_plans
+from study_pattern.predict import predict_scores
+from study_pattern.profiling import NULL_RUN, SectionProfiler
+from study_pattern.progress import Leaderboard, carried_rows
+from study_pattern.report import build_pdf
+from study_pattern.ring import ChatRing, JsonlSpill
+from study_pattern.sessions import SessionStore
+from study_pattern.store import StudyLogStore
+from study_pattern.theme import BUBBLE, CHIP, CLOCK, GROWTH_TREE, METRIC, RING, stylesheet
+
+BASE_DIR = Path(__file__).resolve().parent
 
 # ===========================
 # CONFIG & STATE
@@ -19,14 +35,47 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Session keys saved per user (?user=<id>) and restored on their first run.
+PERSISTED_KEYS = (
+    "theme", "xp", "streak", "last_log_date", "hours", "goal", "breaks", "revision", "mood",
+    "energy", "focus", "pomo_running", "pomo_mode", "pomo_work_min", "pomo_break_min",
+    "pomo_target_ts", "buddy",
+)
+
+@st.cache_resource
+def get_sessions():
+    # One pool and write-behind flusher per process, shared by every session.
+    return SessionStore(os.environ.get("STUDY_SESSIONS_DB", BASE_DIR / "sessions.db"))
+
 def init_state():
     ss = st.session_state
+    user = st.query_params.get("user")
+    if user and ss.get("user_id") != user:
+        saved = get_sessions().load(user) or {}
+        for key in PERSISTED_KEYS:
+            # Start from the defaults below, not the previous user's values.
+            ss.pop(key, None)
+            if key in saved:
+                ss[key] = saved[key]
+        ss.pop("chat", None)
+        ss.pop("buddy_chat", None)
+        ss.user_id = user
+        ss.restored_chat = saved.get("chat", [])
+        ss.restored_buddy_chat = saved.get("buddy_chat", [])
     ss.setdefault("theme", "Dark")
     ss.setdefault("xp", 0)
     ss.setdefault("streak", 0)
     ss.setdefault("last_log_date", None)
-    ss.setdefault("chat", [])          # (role, text)
-    ss.setdefault("buddy_chat", [])    # (who, text)
+    # Pomodoro event log / chat spill key when not signed in
+    ss.setdefault("session_key", uuid.uuid4().hex[:12])
+    if "chat" not in ss:
+        # Bounded histories; STUDY_CHAT_SPILL (a .jsonl path) keeps evicted entries on disk.
+        spill = os.environ.get("STUDY_CHAT_SPILL")
+        owner = ss.get("user_id") or ss.session_key
+        ss.chat = ChatRing(items=map(tuple, ss.pop("restored_chat", ())),
+                           on_evict=JsonlSpill(spill, "chat", owner) if spill else None)         # (role, text)
+        ss.buddy_chat = ChatRing(items=map(tuple, ss.pop("restored_buddy_chat", ())),
+                                 on_evict=JsonlSpill(spill, "buddy", owner) if spill else None)  # (who, text)
     ss.setdefault("hours", 4.0)
     ss.setdefault("goal", 6.0)
     ss.setdefault("breaks", 2)
@@ -45,158 +94,79 @@ def init_state():
     ss.setdefault("pomo_target_ts", None)    # epoch seconds when current phase ends
     # Buddy
     ss.setdefault("buddy", "Coach Nova")
+    # PDF export memo: {"key": report snapshot, "pdf": bytes}
+    ss.setdefault("pdf_cache", {})
 
 init_state()
 
+@st.cache_resource
+def get_profiler():
+    return SectionProfiler()
+
+# Opt-in section timings: STUDY_PROFILE=1 or ?profile=1
+PROFILING = os.environ.get("STUDY_PROFILE") == "1" or st.query_params.get("profile") == "1"
+prof = get_profiler().start_run() if PROFILING else NULL_RUN
+
 # ===========================
 # THEME
 # ===========================
-LIGHT = {
-    "--bg1": "#F7F9FC", "--bg2": "#ECF2FF", "--card": "#FFFFFF", "--text": "#0F172A",
-    "--muted": "#475569", "--accent": "#4F46E5", "--success": "#10B981",
-    "--warn": "#F59E0B", "--danger": "#EF4444"
-}
-DARK = {
-    "--bg1": "#0f1220", "--bg2": "#171a2e", "--card": "#1f2442", "--text": "#e6e9f5",
-    "--muted": "#b8c1ec", "--accent": "#7c9cff", "--success": "#61d095",
-    "--warn": "#ffb84d", "--danger": "#ff6b6b"
-}
-THEME = LIGHT if st.session_state.theme == "Light" else DARK
-
-st.markdown(
-    f"""
-    <style>
-      :root {{
-        --bg1:{THEME['--bg1']}; --bg2:{THEME['--bg2']}; --card:{THEME['--card']};
-        --text:{THEME['--text']}; --muted:{THEME['--muted']}; --accent:{THEME['--accent']};
-        --success:{THEME['--success']}; --warn:{THEME['--warn']}; --danger:{THEME['--danger']};
-      }}
-      .stApp {{
-        background: linear-gradient(135deg, var(--bg1) 0%, var(--bg2) 100%);
-        color: var(--text);
-      }}
-      .glass {{
-        background: linear-gradient(180deg, rgba(255,255,255,0.04), rgba(255,255,255,0.02));
-        border: 1px solid rgba(0,0,0,0.06);
-        border-radius: 18px;
-        padding: 18px 20px;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.08);
-      }}
-      .metric {{
-        display:flex; align-items:center; gap:12px; padding:10px 12px; border-radius:14px;
-        background: rgba(255,255,255,0.30); border:1px solid rgba(0,0,0,0.06);
-      }}
-      .chip {{
-        display:inline-block; padding:6px 10px; border-radius:20px; font-size:0.9rem;
-        background: rgba(255,255,255,0.40); border:1px solid rgba(0,0,0,0.06);
-      }}
-      .bubble {{ padding:12px 14px; margin:8px 0; border-radius: 14px; max-width: 90%; border:1px solid rgba(0,0,0,0.06); }}
-      .user {{ margin-left:auto; background:rgba(79,70,229,0.18); }}
-      .bot  {{ margin-right:auto; background:rgba(0,0,0,0.06); }}
-      .ring {{
-        width: 160px; height:160px; border-radius:50%; position: relative; display:inline-block;
-        background: conic-gradient(var(--accent) calc(var(--p)*1%), rgba(0,0,0,0.08) 0);
-      }}
-      .ring::after {{ content:""; position:absolute; inset:10px; border-radius:50%; background: var(--card); border: 1px solid rgba(0,0,0,0.06); }}
-      .ring-label {{ position:absolute; inset:0; display:flex; align-items:center; justify-content:center; font-size:1.2rem; font-weight:700; color:var(--text); }}
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Rendered and minified once per theme per process (study_pattern/theme.py).
+st.markdown(stylesheet(st.session_state.theme), unsafe_allow_html=True)
+prof.lap("css")
 
 # ===========================
 # HELPERS
 # ===========================
-def percent(hours, goal):
-    try:
-        return min(100, round((hours / goal) * 100))
-    except ZeroDivisionError:
-        return 0
+@st.cache_resource
+def get_store():
+    # One store (and date index) per process, shared by every session.
+    return StudyLogStore(os.environ.get("STUDY_DATA_PATH", BASE_DIR / "study_data.csv"))
+
+@st.cache_resource
+def get_leaderboard():
+    # Rebuilt from the daily log once per process, then updated row by row.
+    return Leaderboard(get_sessions().daily_logs())
+
+@st.cache_resource
+def get_history():
+    return HistoryAnalytics(os.environ.get("STUDY_LOGS_PATH", BASE_DIR / "study_logs.csv"))
 
-def format_seconds(total_s: int) -> str:
-    total_s = max(0, int(total_s))
-    m, s = divmod(total_s, 60)
-    return f"{m:02d}:{s:02d}"
+@st.cache_resource
+def get_events():
+    # Timer transitions are queued here and written by one background thread.
+    return EventLog(os.environ.get("STUDY_EVENTS_PATH", BASE_DIR / "pomodoro_events.jsonl"))
 
 def now_ts():
     return int(time.time())
 
-def phase_seconds(mode: str) -> int:
-    if mode == "Work":
-        return int(st.session_state.pomo_work_min * 60)
-    return int(st.session_state.pomo_break_min * 60)
+def log_event(kind: str):
+    ss = st.session_state
+    # start/resume carry the phase end, so a segment left open by a closed tab stops there.
+    target = ss.pomo_target_ts if kind in ("start", "resume") else None
+    get_events().emit(ss.get("user_id") or ss.session_key, kind, ss.pomo_mode, target=target)
 
+# Thin session-state wrappers over study_pattern.core.
 def start_phase(mode: str):
-    st.session_state.pomo_mode = mode
-    st.session_state.pomo_target_ts = now_ts() + phase_seconds(mode)
-    st.session_state.pomo_running = True
+    st.session_state.update(core.start_phase(
+        mode, st.session_state.pomo_work_min, st.session_state.pomo_break_min, now_ts()))
+    log_event("start")
 
 def stop_timer():
-    st.session_state.pomo_running = False
+    if st.session_state.pomo_running:
+        log_event("pause")
+    st.session_state.update(core.stop_timer())
 
 def reset_timer():
-    st.session_state.pomo_running = False
-    st.session_state.pomo_mode = "Work"
-    st.session_state.pomo_target_ts = None
+    log_event("reset")
+    st.session_state.update(core.reset_timer())
 
 def current_remaining():
-    if not st.session_state.pomo_running or st.session_state.pomo_target_ts is None:
-        return phase_seconds(st.session_state.pomo_mode)
-    return max(0, st.session_state.pomo_target_ts - now_ts())
+    ss = st.session_state
+    return core.current_remaining(ss.pomo_running, ss.pomo_target_ts, ss.pomo_mode,
+                                  ss.pomo_work_min, ss.pomo_break_min, now_ts())
 
 def buddy_msg(trigger="general"):
-    p = st.session_state.buddy
-    bank = {
-        "general": {
-            "Coach Nova": "I’m proud of the consistency. One more small win today!",
-            "Zen Panda": "Breathe in focus, breathe out distraction. You’ve got this.",
-            "Professor Byte": "Incremental improvements compile into greatness."
-        },
-        "work_start": {
-            "Coach Nova": "Work block started. Keep your eyes on the rep count.",
-            "Zen Panda": "Focus like water—flow through one problem at a time.",
-            "Professor Byte": "Executing deep work routine… expect performance gains."
-        },
-        "break_start": {
-            "Coach Nova": "Break time! Shake it out, hydrate, then back to it.",
-            "Zen Panda": "Rest the mind to sharpen the blade of thought.",
-            "Professor Byte": "Garbage collection in progress—refreshing mental memory."
-        },
-        "goal_hit": {
-            "Coach Nova": "Goal hit! That’s how you build momentum.",
-            "Zen Panda": "Harmony achieved. Let gratitude close the day.",
-            "Professor Byte": "Target reached. Logging achievement badge."
-        }
-    }
-    return bank.get(trigger, bank["general"]).get(p, bank["general"]["Coach Nova"])
-
-def build_recommendations(h, g, b, rev, md, en, focus):
-    recs = []
-    if h < g * 0.6: recs.append("📈 You studied less than planned. Schedule **two 45-min blocks** tomorrow.")
-    elif h < g:     recs.append("👍 Close to your goal—add **one extra 30-min session**.")
-    else:           recs.append("🏅 Goal achieved! Do a **quick recap** to lock it in.")
-    if b == 0:      recs.append("☕ Add **short 5-min breaks** every 25–30 minutes.")
-    elif b > 6:     recs.append("🧭 Too many breaks—aim for **2–5** evenly spaced.")
-    if rev == "No": recs.append("🔁 Do **10-minute active recall** on yesterday’s topic.")
-    if md == "Stressed" and en in ("Low","Medium"): recs.append("🧘 Try **box breathing (5 min)** or a brief walk.")
-    if md == "Tired" and en == "Low": recs.append("😴 Take a **20-min power nap** then one short session.")
-    if md == "Happy" and en == "High": recs.append("🚀 Plan a **deep work block (60–90 min)** on your hardest topic.")
-    if focus:       recs.append(f"🎯 Stick to **{focus}** and end with a **3-point summary**.")
-    recs.extend(random.sample([
-        "📚 Start each session by **rewriting your block goal**.",
-        "📝 Use **active recall** instead of rereading.",
-        "⏱️ Use **Pomodoro (25/5)** for sustained focus.",
-        "📵 Keep your phone **outside the room**.",
-        "🧪 End with a **5-question self-quiz**.",
-        "🌙 Review key points **before sleep**."
-    ], 2))
-    return recs
-
-def growth_stage(pct):
-    if pct < 30:   return "🌱 Seedling — just getting started."
-    if pct < 70:   return "🌿 Sapling — growing strong."
-    if pct < 100:  return "🌳 Tree — almost there!"
-    return "🌸 Flourishing — goal achieved!"
+    return core.buddy_msg(st.session_state.buddy, trigger)
 
 # ===========================
 # HEADER
@@ -214,6 +184,7 @@ with col_theme:
         st.rerun()
 
 st.write("")
+prof.lap("header")
 
 # ===========================
 # LAYOUT
@@ -241,15 +212,7 @@ with left:
     pct = percent(st.session_state.hours, st.session_state.goal)
     tree = growth_stage(pct)
     st.markdown("### 🌱 Growth Tree")
-    st.markdown(
-        f"""
-        <div class="glass">
-          <div style="font-size: 2rem;">{tree.split('—')[0]}</div>
-          <div style="margin-top:6px;">{tree}</div>
-          <div style="margin-top:10px;" class="chip">Progress: {pct}%</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
+    st.markdown(GROWTH_TREE.format(icon=tree.split('—')[0], stage=tree, pct=pct), unsafe_allow_html=True)
 
     # 🎶 Background Music
     st.markdown("### 🎶 Background Music")
@@ -262,6 +225,20 @@ with left:
     st.session_state.music_track = st.selectbox("Track", list(tracks.keys()), index=list(tracks.keys()).index(st.session_state.music_track))
     if st.session_state.music_on:
         st.audio(tracks[st.session_state.music_track], format="audio/mp3")
+    prof.lap("inputs")
+
+    # 🧭 Plan Optimizer: the whole hours x breaks x revision grid in one model call, memoized per (mood, energy, goal)
+    st.markdown("### 🧭 Plan Optimizer")
+    plans = best_plans(st.session_state.mood, st.session_state.energy, st.session_state.goal)
+    if plans:
+        st.caption(f"Best plans reaching your {st.session_state.goal:g}h goal, feeling {st.session_state.mood.lower()}:")
+        st.dataframe(
+            {"Hours": [p.hours for p in plans], "Breaks": [p.breaks for p in plans],
+             "Revise": [p.revision for p in plans], "Predicted": [round(p.score) for p in plans]},
+            hide_index=True,
+        )
+
+prof.lap("planner")
 
 # ---------------------------
 # MID: SUMMARY + RING + POMODORO (auto-update)
@@ -269,39 +246,21 @@ with left:
 with mid:
     st.markdown("### 📊 Today at a Glance")
     pct = percent(st.session_state.hours, st.session_state.goal)
-    st.markdown(
-        f"""
-        <div class="glass" style="text-align:center;">
-          <div class="ring" style="--p:{pct};">
-            <div class="ring-label">{pct}%</div>
-          </div>
-          <div style="margin-top:10px; color:var(--muted);">Goal Completion</div>
-          <div class="chip" style="margin-top:10px;">⏳ {st.session_state.hours}h / 🎯 {st.session_state.goal}h</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
+    st.markdown(RING.format(pct=pct, hours=st.session_state.hours, goal=st.session_state.goal),
+                unsafe_allow_html=True)
 
     st.write("")
     colA, colB = st.columns(2)
     with colA:
-        st.markdown(
-            f"""
-            <div class="metric">
-              <div>🧠</div>
-              <div><b>Revision</b><br><span style="color:var(--muted)">{'Completed' if st.session_state.revision=='Yes' else 'Pending'}</span></div>
-            </div>
-            """, unsafe_allow_html=True
-        )
+        st.markdown(METRIC.format(icon="🧠", title="Revision",
+                                  value='Completed' if st.session_state.revision == 'Yes' else 'Pending'),
+                    unsafe_allow_html=True)
     with colB:
         balance = "Balanced" if 1 <= st.session_state.breaks <= 5 else ("Too Few" if st.session_state.breaks == 0 else "Too Many")
-        st.markdown(
-            f"""
-            <div class="metric">
-              <div>☕</div>
-              <div><b>Breaks</b><br><span style="color:var(--muted)">{st.session_state.breaks} ({balance})</span></div>
-            </div>
-            """, unsafe_allow_html=True
-        )
+        st.markdown(METRIC.format(icon="☕", title="Breaks", value=f"{st.session_state.breaks} ({balance})"),
+                    unsafe_allow_html=True)
+
+    prof.lap("summary")
 
     # ⏱️ Pomodoro Timer
     st.markdown("### ⏱️ Pomodoro")
@@ -318,8 +277,10 @@ with mid:
             else:
                 # (Re)start current phase with remaining seconds (if paused) or fresh phase if none
                 remaining = current_remaining()
+                kind = "resume" if st.session_state.pomo_target_ts else "start"
                 st.session_state.pomo_target_ts = now_ts() + remaining
                 st.session_state.pomo_running = True
+                log_event(kind)
                 if st.session_state.pomo_mode == "Work":
                     st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("work_start")))
                 else:
@@ -331,32 +292,36 @@ with mid:
             reset_timer()
             st.rerun()
 
-    # Show remaining, flip mode when time hits zero
-    remaining = current_remaining()
-    if st.session_state.pomo_running and remaining == 0:
-        # switch phase
-        next_mode = "Break" if st.session_state.pomo_mode == "Work" else "Work"
-        start_phase(next_mode)
-        if next_mode == "Work":
-            st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("work_start")))
-        else:
-            st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("break_start")))
-        st.rerun()
-
-    st.markdown(
-        f"""
-        <div class="glass" style="text-align:center;">
-          <div class="chip">{'🟢 Running' if st.session_state.pomo_running else '⏸️ Paused'} • {st.session_state.pomo_mode} Mode</div>
-          <h2 style="margin:6px 0;">{format_seconds(remaining)}</h2>
-          <div style="color:var(--muted)">Focus during Work • Stretch during Breaks</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
-
-    # Small auto-refresh effect while running
-    if st.session_state.pomo_running:
-        time.sleep(1)
-        st.rerun()
+    # Only this fragment ticks once a second while running; the rest of the page
+    # reruns on phase transitions (new buddy message) and user input.
+    @st.fragment(run_every=1 if st.session_state.pomo_running else None)
+    def pomodoro_clock():
+        tick = get_profiler().start_run() if PROFILING else NULL_RUN
+        # Show remaining, flip mode when time hits zero
+        remaining = current_remaining()
+        if st.session_state.pomo_running and remaining == 0:
+            # switch phase
+            log_event("complete")
+            next_mode = core.next_phase(st.session_state.pomo_mode)
+            start_phase(next_mode)
+            if next_mode == "Work":
+                st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("work_start")))
+            else:
+                st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("break_start")))
+            st.rerun(scope="app")
+
+        st.markdown(CLOCK.format(status='🟢 Running' if st.session_state.pomo_running else '⏸️ Paused',
+                                 mode=st.session_state.pomo_mode, clock=format_seconds(remaining)),
+                    unsafe_allow_html=True)
+        tick.lap("pomodoro_tick")
+
+    pomodoro_clock()
+    focus = get_events().summary(st.session_state.get("user_id") or st.session_state.session_key)
+    if focus["blocks"]:
+        today_min = focus["focus_minutes"].get(dt.date.today().isoformat(), 0)
+        st.caption(f"🎯 Focus today: {today_min:g} min • {focus['completion_rate']:.0%} of work blocks completed"
+                   f" • {focus['avg_pauses']:.1f} pauses/block")
+    prof.lap("pomodoro")
 
 # ---------------------------
 # RIGHT: VOICE + BUDDY + RECS + PDF
@@ -374,120 +339,88 @@ with mid:
     if submitted:
         recs = build_recommendations(
             st.session_state.hours, st.session_state.goal, st.session_state.breaks,
-            st.session_state.revision, st.session_state.mood, st.session_state.energy, st.session_state.focus
+            st.session_state.revision, st.session_state.mood, st.session_state.energy, st.session_state.focus,
+            user=st.session_state.get("user_id"), day=dt.date.today(),
         )
         user_line = f"Hours:{st.session_state.hours} Goal:{st.session_state.goal} Breaks:{st.session_state.breaks} Rev:{st.session_state.revision} Mood:{st.session_state.mood} Energy:{st.session_state.energy} Focus:{st.session_state.focus or '—'}"
         st.session_state.chat.append(("user", user_line))
         st.session_state.chat.append(("bot", "\n".join(recs)))
+        # No score: the form doesn't ask for one, and goal completion % isn't a test score.
+        get_store().append(
+            dt.date.today(), st.session_state.hours, st.session_state.breaks,
+            1.0 if st.session_state.revision == "Yes" else 0.0, st.session_state.mood,
+            user=st.session_state.get("user_id") or st.session_state.session_key,
+        )
         # Goal hit -> XP, streak, buddy
         if st.session_state.hours >= st.session_state.goal:
             st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("goal_hit")))
-            st.session_state.xp += 20
+        if st.session_state.get("user_id"):
+            # Signed-in users: XP/streak come from the shared daily log.
             today = dt.date.today().isoformat()
-            if st.session_state.last_log_date != today:
-                if st.session_state.last_log_date:
-                    last = dt.date.fromisoformat(st.session_state.last_log_date)
-                    if (dt.date.today() - last).days == 1:
-                        st.session_state.streak += 1
-                    elif (dt.date.today() - last).days > 1:
-                        st.session_state.streak = 1
-                else:
-                    st.session_state.streak = 1
-                st.session_state.last_log_date = today
+            board = get_leaderboard()
+            if board.stats(st.session_state.user_id) is None:
+                # First submission since the daily log: carry over XP/streak saved before it.
+                for row in carried_rows(st.session_state.user_id, st.session_state.xp,
+                                        st.session_state.streak, st.session_state.last_log_date):
+                    get_sessions().log_day(*row)
+                    board.record(*row)
+            get_sessions().log_day(st.session_state.user_id, today, st.session_state.hours, st.session_state.goal)
+            st.session_state.update(board.record(
+                st.session_state.user_id, today, st.session_state.hours, st.session_state.goal))
+        elif st.session_state.hours >= st.session_state.goal:
+            ss = st.session_state
+            ss.update(core.goal_hit(ss.xp, ss.streak, ss.last_log_date, dt.date.today().isoformat()))
 
     st.markdown("### 💡 Recommendations")
     if 'recs' in locals() and submitted:
+        predicted = predict_scores({
+            "hours": [st.session_state.hours], "breaks": [st.session_state.breaks],
+            "mood": [st.session_state.mood],
+        })[0]
+        st.markdown(CHIP.format(text=f"🔮 Predicted score: <b>{predicted:.0f}</b>/100"), unsafe_allow_html=True)
         for r in recs:
             st.markdown(f"- {r}")
     else:
         st.info("Fill inputs and click **Analyze** for tailored tips.")
+    week = get_store().last_days(7, user=st.session_state.get("user_id") or st.session_state.session_key)
+    if len(week["date"]):
+        st.caption(f"📅 Last 7 days: {len(week['date'])} log(s) • avg {week['hours_studied'].mean():.1f}h studied")
+
+    prof.lap("recommendations")
 
     # ----- PDF EXPORT -----
     st.markdown("### 📄 Export Today's Report (PDF)")
-    def build_pdf() -> BytesIO:
-        buf = BytesIO()
-        c = canvas.Canvas(buf, pagesize=letter)
-        width, height = letter
-        x, y = 50, height - 50
-
-        def write_line(text, font="Helvetica", size=11, dy=16):
-            nonlocal y
-            c.setFont(font, size)
-            c.drawString(x, y, text)
-            y -= dy
-            if y < 60:
-                c.showPage()
-                y = height - 50
-
-        def write_wrap(text, max_width=500, bullet=False):
-            nonlocal y
-            c.setFont("Helvetica", 11)
-            lines = simpleSplit(text, "Helvetica", 11, max_width)
-            for ln in lines:
-                c.drawString(x + (12 if bullet else 0), y, ("- " if bullet else "") + ln)
-                y -= 16
-                if y < 60:
-                    c.showPage()
-                    y = height - 50
-
-        # Header
-        write_line("Study Report", "Helvetica-Bold", 18, 22)
-        write_line(dt.datetime.now().strftime("%Y-%m-%d %H:%M"), "Helvetica", 10, 18)
-        y -= 6
-
-        # Inputs
-        write_line("Inputs", "Helvetica-Bold", 14, 18)
-        write_line(f"Hours Studied: {st.session_state.hours}")
-        write_line(f"Goal (hours): {st.session_state.goal}")
-        write_line(f"Goal Completion: {percent(st.session_state.hours, st.session_state.goal)}%")
-        write_line(f"Breaks: {st.session_state.breaks}")
-        write_line(f"Revision: {st.session_state.revision}")
-        write_line(f"Mood: {st.session_state.mood}")
-        write_line(f"Energy: {st.session_state.energy}")
-        write_line(f"Focus: {st.session_state.focus or '—'}")
-        y -= 6
-
-        # Gamification
-        write_line("Progress", "Helvetica-Bold", 14, 18)
-        write_line(f"XP: {st.session_state.xp}")
-        write_line(f"Streak: {st.session_state.streak} day(s)")
-        y -= 6
-
-        # Recommendations (last bot message)
-        write_line("Recommendations", "Helvetica-Bold", 14, 18)
-        last_bot = ""
-        for role, text in reversed(st.session_state.chat):
-            if role == "bot":
-                last_bot = text
-                break
-        if last_bot:
-            for line in last_bot.split("\n"):
-                write_wrap(line, bullet=True)
-        else:
-            write_wrap("No recommendations generated yet.")
-
-        # Buddy snippets (last 3)
-        y -= 6
-        write_line("Buddy Messages", "Helvetica-Bold", 14, 18)
-        if st.session_state.buddy_chat:
-            for who, msg in st.session_state.buddy_chat[-3:]:
-                write_wrap(f"{who}: {msg}", bullet=True)
-        else:
-            write_wrap("No buddy messages yet.")
-
-        c.showPage()
-        c.save()
-        buf.seek(0)
-        return buf
-
-    pdf_bytes = build_pdf()
+
+    # Snapshot the report inputs now; the PDF itself is only rendered when the
+    # download is clicked (on Streamlit's download thread) and memoized on the
+    # snapshot, so sliders and timer ticks never pay for a reportlab render.
+    report = {
+        "hours": st.session_state.hours, "goal": st.session_state.goal,
+        "breaks": st.session_state.breaks, "revision": st.session_state.revision,
+        "mood": st.session_state.mood, "energy": st.session_state.energy,
+        "focus": st.session_state.focus,
+        "xp": st.session_state.xp, "streak": st.session_state.streak,
+        "last_bot": st.session_state.chat.last_bot, "buddy": tuple(st.session_state.buddy_chat[-3:]),
+    }
+    report_key = tuple(report.values())
+    pdf_cache = st.session_state.pdf_cache
+
+    def pdf_payload() -> bytes:
+        if pdf_cache.get("key") != report_key:
+            # One entry per session: a new key evicts the previous PDF.
+            pdf_cache["pdf"] = build_pdf(report)
+            pdf_cache["key"] = report_key
+        return pdf_cache["pdf"]
+
     st.download_button(
         label="⬇️ Download PDF",
-        data=pdf_bytes,
+        data=pdf_payload,
         file_name=f"study_report_{dt.date.today().isoformat()}.pdf",
         mime="application/pdf",
+        on_click="ignore",
         use_container_width=True
     )
+    prof.lap("pdf")
 
 # ===========================
 # INSIGHTS FEED & BUDDY FEED
@@ -495,34 +428,117 @@ with mid:
 st.markdown("### 💬 Insights Feed")
 for role, text in st.session_state.chat[-6:]:
     cls = "user" if role == "user" else "bot"
-    st.markdown(f"<div class='bubble {cls}'>{text.replace(chr(10), '<br>')}</div>", unsafe_allow_html=True)
+    st.markdown(BUBBLE.format(cls=cls, body=text.replace(chr(10), '<br>')), unsafe_allow_html=True)
 
 st.markdown("### 🧑‍🤝‍🧑 Buddy Corner")
 for who, msg in st.session_state.buddy_chat[-4:]:
-    st.markdown(f"<div class='bubble bot'><b>{who}:</b> {msg}</div>", unsafe_allow_html=True)
+    st.markdown(BUBBLE.format(cls="bot", body=f"<b>{who}:</b> {msg}"), unsafe_allow_html=True)
+
+prof.lap("feeds")
+
+# ===========================
+# HISTORY (study_logs.csv)
+# ===========================
+st.markdown("### 📈 History")
+history = get_history()
+history.refresh()  # folds in rows appended since the last run; a stat() otherwise
+if history.rows:
+    days, avg7 = history.rolling_hours(7)
+    _, avg30 = history.rolling_hours(30)
+    slope, _ = history.distraction_impact()
+    h1, h2, h3, h4 = st.columns(4)
+    h1.metric("7-day avg", f"{avg7[-1]:.1f} h/day")
+    h2.metric("30-day avg", f"{avg30[-1]:.1f} h/day")
+    h3.metric("Sleep ↔ score", f"r = {history.sleep_score_corr():+.2f}")
+    h4.metric("Per distraction", f"{slope:+.1f} pts")
+    chart_col, mood_col = st.columns([1.6, 1])
+    with chart_col:
+        # A raw Vega-Lite spec: st.line_chart builds it through Altair, ~100x slower per rerun.
+        st.vega_lite_chart(
+            pd.DataFrame({"day": days, "7-day avg": avg7, "30-day avg": avg30}),
+            {
+                "transform": [{"fold": ["7-day avg", "30-day avg"], "as": ["window", "hours"]}],
+                "mark": "line",
+                "encoding": {
+                    "x": {"field": "day", "type": "temporal", "title": None},
+                    "y": {"field": "hours", "type": "quantitative", "title": "h/day"},
+                    "color": {"field": "window", "type": "nominal", "title": None},
+                },
+            },
+        )
+    with mood_col:
+        moods = history.mood_distributions()
+        st.dataframe(
+            {"Mood": list(moods), "Logs": [m["count"] for m in moods.values()],
+             "Avg score": [round(m["mean"], 1) for m in moods.values()],
+             "Std": [round(m["std"], 1) for m in moods.values()]},
+            hide_index=True,
+        )
+    # PNGs cached per data version, theme and goal: a timer tick or unrelated rerun never redraws them.
+    charts = history_charts(history, st.session_state.theme, st.session_state.goal)
+    for tab, name in zip(st.tabs(["Hours vs goal", "Score trend", "Mood heatmap"]), ("hours", "score", "mood")):
+        tab.image(charts[name], width="stretch")
+else:
+    st.info("No study history logged yet.")
+prof.lap("history")
 
 # ===========================
 # SIDEBAR: PROGRESS & QUICK POMODORO
 # ===========================
 with st.sidebar:
+    user = st.text_input("👤 User ID", value=st.session_state.get("user_id") or "",
+                         placeholder="Save progress across visits")
+    if user and user != st.session_state.get("user_id"):
+        st.query_params["user"] = user
+        st.rerun()
+
     st.header("🎮 Progress")
     st.progress(min(st.session_state.xp, 100))
     st.write(f"🏅 XP: **{st.session_state.xp}/100**")
     st.write(f"🔥 Streak: **{st.session_state.streak}** day(s)")
+    standing = get_leaderboard().rank(st.session_state.user_id) if st.session_state.get("user_id") else None
+    if standing:
+        st.write(f"🏆 Rank: **#{standing[0]}** of {standing[1]}")
+        with st.expander("Leaderboard"):
+            st.dataframe(get_leaderboard().top(), hide_index=True)
 
     st.divider()
     st.header("⏱️ Pomodoro Quick")
     if st.button("▶️ Start Work"):
         start_phase("Work")
         st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("work_start")))
-        st.experimental_rerun()
+        st.rerun()
     if st.button("☕ Start Break"):
         start_phase("Break")
         st.session_state.buddy_chat.append((st.session_state.buddy, buddy_msg("break_start")))
-        st.experimental_rerun()
+        st.rerun()
     if st.button("⏸️ Pause"):
         stop_timer()
+        st.rerun()  # the clock fragment was already registered with run_every=1 this run
     if st.button("🔄 Reset"):
         reset_timer()
+        st.rerun()
+    prof.lap("sidebar")
+
+    if PROFILING:
+        st.divider()
+        st.header("🛠️ Rerun Profile")
+        profiler = get_profiler()
+        st.dataframe([{"section": name, **stats} for name, stats in profiler.summary().items()],
+                     hide_index=True)
+        out_dir = Path(os.environ.get("STUDY_PROFILE_DIR", BASE_DIR))
+        e1, e2 = st.columns(2)
+        if e1.button("Export JSON"):
+            st.caption(f"Saved {profiler.export(out_dir / 'rerun_profile.json')}")
+        if e2.button("Export Prometheus"):
+            st.caption(f"Saved {profiler.export(out_dir / 'rerun_profile.prom', fmt='prometheus')}")
 
 st.caption("Tip: Use Voice Input (Chrome) to dictate your study log. Toggle music and theme in the app for a cozy focus vibe ✨")
+
+# Hand the latest state to the write-behind flusher (no disk I/O here).
+if st.session_state.get("user_id"):
+    snapshot = {key: st.session_state[key] for key in PERSISTED_KEYS}
+    snapshot["chat"] = st.session_state.chat[:]
+    snapshot["buddy_chat"] = st.session_state.buddy_chat[:]
+    get_sessions().stage(st.session_state.user_id, snapshot)
+prof.end()
@@ -0,0 +1 @@
+"""UI-free building blocks for the Study Pattern Analyzer app."""
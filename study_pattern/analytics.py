@@ -0,0 +1,256 @@
+"""Vectorized history analytics over ``study_logs.csv``.
+
+The log is parsed once into NumPy columns and folded into running aggregates
+(sums, per-mood moments and histograms, per-day hour and score totals with
+a prefix sum over hours). New rows, whether appended through ``append`` or written to the CSV by
+someone else and picked up by ``refresh``, only fold in the new rows.
+``path`` may also be a columnar ``.cols`` directory (``study_pattern.columnar``),
+whose memory-mapped rows are folded in without parsing.
+"""
+import csv
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from study_pattern import columnar
+
+LOG_COLUMNS = ("Date", "Study_Hours", "Sleep_Hours", "Distractions", "Breaks", "Mood", "Score")
+SCORE_BINS = np.linspace(0, 100, 11)
+
+
+def _grow(arr, n, fill=0):
+    """Return ``arr`` with at least ``n`` slots, doubling capacity as needed."""
+    if n <= len(arr):
+        return arr
+    cap = max(n, 2 * len(arr), 16)
+    out = np.full((cap,) + arr.shape[1:], fill, dtype=arr.dtype)
+    out[:len(arr)] = arr
+    return out
+
+
+class HistoryAnalytics:
+    """Trend, rolling-average and correlation aggregates for a study log."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.columnar = columnar.is_columnar(self.path)
+        self.rows = 0
+        self.version = 0  # bumped whenever rows are folded in
+        self._offset = 0
+        self._meta_stat = None  # columnar: meta.json's stat when last opened
+        self._lock = threading.Lock()
+        # score vs sleep / distractions: running first and second moments
+        self._m = dict.fromkeys(("s", "y", "sy", "ss", "yy", "d", "dy", "dd"), 0.0)
+        # per mood
+        self.moods = []
+        self._mood_codes = {}
+        self._mood_n = np.zeros(0)
+        self._mood_sum = np.zeros(0)
+        self._mood_sq = np.zeros(0)
+        self._mood_hist = np.zeros((0, len(SCORE_BINS) - 1), dtype=np.int64)
+        # per distraction count
+        self._dist_n = np.zeros(0)
+        self._dist_sum = np.zeros(0)
+        # hours per calendar day from day0, plus prefix sums (cum[i] = sum(daily[:i]));
+        # score totals and log counts per day alongside
+        self._day0 = None
+        self._days = 0
+        self._daily = np.zeros(0)
+        self._day_score = np.zeros(0)
+        self._day_n = np.zeros(0)
+        self._cum = np.zeros(1)
+        self.refresh()
+
+    # ---------- ingestion ----------
+    def refresh(self) -> bool:
+        """Fold in rows appended to the CSV since the last call."""
+        with self._lock:
+            if self.columnar:
+                return self._refresh_columns()
+            if not os.path.exists(self.path):
+                return False
+            size = os.path.getsize(self.path)
+            if size <= self._offset:
+                return False
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read(size - self._offset)
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return False  # partial line still being written
+            header = 0 if self._offset == 0 else None
+            df = pd.read_csv(io.BytesIO(chunk[:end]), header=header, names=LOG_COLUMNS,
+                             dtype={"Mood": "category"})
+            self._offset += end
+            if not df.empty:
+                self._ingest(df)
+            return True
+
+    def _refresh_columns(self):
+        # _offset counts rows here, not bytes.
+        try:
+            st = os.stat(os.path.join(self.path, "meta.json"))
+        except FileNotFoundError:
+            return False
+        # Every append replaces meta.json, so an unchanged stat means no new rows
+        # and the column files needn't be re-mapped.
+        stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if stat == self._meta_stat:
+            return False
+        self._meta_stat = stat
+        cols = columnar.open_columns(self.path)
+        if len(cols) <= self._offset:
+            return False
+        df = cols.frame(self._offset)
+        # The dictionary lists every known mood; only fold in the ones logged.
+        df["Mood"] = df["Mood"].cat.remove_unused_categories()
+        self._offset = len(cols)
+        self._ingest(df)
+        return True
+
+    def append(self, date, study_hours, sleep_hours, distractions, breaks, mood, score):
+        """Append one row to the log and fold it in."""
+        row = [date, study_hours, sleep_hours, distractions, breaks, mood, score]
+        with self._lock:
+            if self.columnar:
+                if not os.path.exists(os.path.join(self.path, "meta.json")):
+                    columnar.create(self.path, "logs")
+                columnar.append(self.path, {c: [v] for c, v in zip(LOG_COLUMNS, row)})
+            else:
+                with open(self.path, "a", newline="", encoding="utf-8") as f:
+                    csv.writer(f).writerow(row)
+        self.refresh()
+
+    def _ingest(self, df):
+        days = (pd.to_datetime(df["Date"]).to_numpy().astype("datetime64[D]").astype(np.int64))
+        hours = df["Study_Hours"].to_numpy(np.float64)
+        sleep = df["Sleep_Hours"].to_numpy(np.float64)
+        dist = df["Distractions"].to_numpy(np.int64)
+        score = df["Score"].to_numpy(np.float64)
+
+        m = self._m
+        m["s"] += sleep.sum(); m["y"] += score.sum(); m["sy"] += sleep @ score
+        m["ss"] += sleep @ sleep; m["yy"] += score @ score
+        m["d"] += dist.sum(); m["dy"] += dist @ score; m["dd"] += dist @ dist
+        self.rows += len(df)
+        self.version += 1
+
+        # moods: chunk-local category codes -> global codes
+        lookup = np.array([self._mood_code(str(c)) for c in df["Mood"].cat.categories], dtype=np.int64)
+        codes = lookup[df["Mood"].cat.codes.to_numpy()]
+        k = len(self.moods)
+        self._mood_n = _grow(self._mood_n, k)
+        self._mood_sum = _grow(self._mood_sum, k)
+        self._mood_sq = _grow(self._mood_sq, k)
+        self._mood_hist = _grow(self._mood_hist, k)
+        self._mood_n[:k] += np.bincount(codes, minlength=k)
+        self._mood_sum[:k] += np.bincount(codes, weights=score, minlength=k)
+        self._mood_sq[:k] += np.bincount(codes, weights=score * score, minlength=k)
+        bins = np.clip(np.digitize(score, SCORE_BINS[1:-1]), 0, len(SCORE_BINS) - 2)
+        np.add.at(self._mood_hist, (codes, bins), 1)
+
+        # distractions
+        top = int(dist.max()) + 1
+        self._dist_n = _grow(self._dist_n, top)
+        self._dist_sum = _grow(self._dist_sum, top)
+        self._dist_n[:top] += np.bincount(dist, minlength=top)
+        self._dist_sum[:top] += np.bincount(dist, weights=score, minlength=top)
+
+        self._add_daily(days, hours, score)
+
+    def _mood_code(self, mood):
+        code = self._mood_codes.get(mood)
+        if code is None:
+            code = self._mood_codes[mood] = len(self.moods)
+            self.moods.append(mood)
+        return code
+
+    def _add_daily(self, days, hours, score):
+        lo, hi = int(days.min()), int(days.max())
+        settled = self._days  # prefix sums are valid for cum[:settled + 1]
+        if self._day0 is None:
+            self._day0 = lo
+        elif lo < self._day0:
+            # Backfilled rows before the first day: shift the dense series right.
+            shift = self._day0 - lo
+            self._daily, self._day_score, self._day_n = (
+                np.concatenate([np.zeros(shift), a[:self._days]])
+                for a in (self._daily, self._day_score, self._day_n))
+            self._days += shift
+            self._day0 = lo
+            settled = 0
+        idx = days - self._day0
+        first = int(idx.min())
+        span = int(idx.max()) - first + 1
+        self._days = max(self._days, hi - self._day0 + 1)
+        for name, weights in (("_daily", hours), ("_day_score", score), ("_day_n", None)):
+            arr = _grow(getattr(self, name), self._days)
+            arr[first:first + span] += np.bincount(idx - first, weights=weights, minlength=span)
+            setattr(self, name, arr)
+        # Only the prefix sums from the earliest touched day onwards change.
+        first = min(first, settled)
+        self._cum = _grow(self._cum, self._days + 1)
+        self._cum[first + 1:self._days + 1] = self._cum[first] + np.cumsum(self._daily[first:self._days])
+
+    # ---------- queries ----------
+    def rolling_hours(self, window, last=90):
+        """Average hours/day over a trailing ``window`` for the last ``last`` days.
+
+        Returns ``(days, averages)`` with days as ``datetime64[D]``.
+        """
+        n = self._days
+        if n == 0:
+            return np.array([], dtype="datetime64[D]"), np.array([])
+        end = np.arange(max(0, n - last), n) + 1
+        sums = self._cum[end] - self._cum[np.maximum(end - window, 0)]
+        days = (np.int64(self._day0) + end - 1).astype("datetime64[D]")
+        return days, sums / np.minimum(end, window)
+
+    def daily_series(self):
+        """Every calendar day from the first log to the last: ``(days, hours, scores)``.
+
+        Days are ``datetime64[D]``; hours are the day's total and scores its
+        mean (NaN on days without a log).
+        """
+        n = self._days
+        days = (np.int64(self._day0 or 0) + np.arange(n)).astype("datetime64[D]")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = self._day_score[:n] / self._day_n[:n]
+        return days, self._daily[:n].copy(), scores
+
+    def sleep_score_corr(self):
+        m, n = self._m, self.rows
+        if n < 2:
+            return float("nan")
+        cov = m["sy"] - m["s"] * m["y"] / n
+        var_s = m["ss"] - m["s"] ** 2 / n
+        var_y = m["yy"] - m["y"] ** 2 / n
+        if var_s <= 0 or var_y <= 0:
+            return float("nan")
+        return cov / np.sqrt(var_s * var_y)
+
+    def distraction_impact(self):
+        """``(slope, means)``: score change per extra distraction (least squares)
+        and the mean score at each distraction count (NaN where unseen)."""
+        m, n = self._m, self.rows
+        var_d = m["dd"] - m["d"] ** 2 / n if n else 0.0
+        slope = (m["dy"] - m["d"] * m["y"] / n) / var_d if var_d > 0 else float("nan")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = self._dist_sum / self._dist_n
+        return slope, means
+
+    def mood_distributions(self):
+        """Per mood: count, mean, std and a 10-bin score histogram."""
+        k = len(self.moods)
+        n = self._mood_n[:k]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._mood_sum[:k] / n
+            std = np.sqrt(np.maximum(self._mood_sq[:k] / n - mean ** 2, 0))
+        return {
+            mood: {"count": int(n[i]), "mean": float(mean[i]), "std": float(std[i]),
+                   "hist": self._mood_hist[i].tolist()}
+            for i, mood in enumerate(self.moods)
+        }
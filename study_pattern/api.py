@@ -0,0 +1,269 @@
+"""Local JSON API over the headless study logic, for LMS integration.
+
+    python -m study_pattern.api --port 8765 [--workers 4]
+
+Endpoints (JSON in, JSON out unless noted):
+
+    POST /analyze   {hours, goal, breaks?, revision?, mood?, energy?, focus?, user?, day?}
+                    -> {"percent", "growth_stage", "recommendations"}
+    POST /progress  {hours, goal} -> {"percent", "growth_stage"}
+    POST /predict   {hours, breaks, mood, sleep?, distractions?} -> {"score"}
+    POST /report    a report record (``report.REPORT_FIELDS``) -> application/pdf
+    GET  /health    -> {"ok": true}
+
+Plain asyncio streams, no web framework. The event loop only parses and
+routes: concurrent /predict requests are collected for ``--batch-window`` ms
+(or ``--max-batch`` rows) and scored in one model call on a worker thread,
+and PDFs render in a process pool.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from study_pattern.core import build_recommendations, growth_stage, percent
+
+MAX_BODY = 1 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+# Form defaults, as in the Streamlit page.
+ANALYZE_DEFAULTS = {"breaks": 2, "revision": "Yes", "mood": "Happy", "energy": "High", "focus": ""}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _number(body, key):
+    try:
+        return float(body[key])
+    except KeyError:
+        raise BadRequest(f"missing field: {key}") from None
+    except (TypeError, ValueError):
+        raise BadRequest(f"{key} must be a number") from None
+
+
+def _score(rows):
+    # Runs on the model thread; the heavy imports happen here, not at startup.
+    from study_pattern.predict import predict_scores
+
+    return predict_scores(rows).tolist()
+
+
+def _render(record):
+    from study_pattern.report import build_pdf
+
+    return build_pdf(record)
+
+
+class PredictBatcher:
+    """Coalesce concurrent predict calls into one ``predict_scores`` call.
+
+    The first request waits at most ``window`` seconds for company; requests
+    that arrive while a batch is being scored go out together as soon as it
+    finishes.
+    """
+
+    def __init__(self, window=0.002, max_batch=256):
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = self.rows = 0
+        self._pending = []
+        self._timer = None
+        self._busy = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+
+    async def predict(self, row):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((row, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None and not self._busy:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        self._busy += 1
+        try:
+            scores = await loop.run_in_executor(self._executor, _score, [row for row, _ in batch])
+        except Exception as exc:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        finally:
+            self._busy -= 1
+            if self._pending and not self._busy:
+                self._flush()
+        self.batches += 1
+        self.rows += len(batch)
+        for (_, fut), score in zip(batch, scores):
+            if not fut.done():
+                fut.set_result(score)
+
+    async def warm_up(self):
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, _score, [{"hours": 4.0, "breaks": 2, "mood": "Neutral"}])
+
+    def close(self):
+        self._executor.shutdown()
+
+
+class StudyAPI:
+    def __init__(self, workers=None, batch_window=0.002, max_batch=256):
+        self.batcher = PredictBatcher(batch_window, max_batch)
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self.routes = {
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/progress"): self.progress,
+            ("POST", "/predict"): self.predict,
+            ("POST", "/report"): self.report,
+            ("GET", "/health"): self.health,
+        }
+
+    # ---------- handlers: body dict -> (status, content type, bytes | JSON-able) ----------
+    async def analyze(self, body):
+        h, g = _number(body, "hours"), _number(body, "goal")
+        args = {**ANALYZE_DEFAULTS, **{k: body[k] for k in ANALYZE_DEFAULTS if k in body}}
+        pct = percent(h, g)
+        recs = build_recommendations(h, g, _number(args, "breaks"), args["revision"], args["mood"],
+                                     args["energy"], args["focus"], user=body.get("user"), day=body.get("day"))
+        return {"percent": pct, "growth_stage": growth_stage(pct), "recommendations": recs}
+
+    async def progress(self, body):
+        pct = percent(_number(body, "hours"), _number(body, "goal"))
+        return {"percent": pct, "growth_stage": growth_stage(pct)}
+
+    async def predict(self, body):
+        row = {"hours": _number(body, "hours"), "breaks": _number(body, "breaks"),
+               "mood": str(body.get("mood", "Neutral"))}
+        for key in ("sleep", "distractions"):
+            if body.get(key) is not None:
+                row[key] = _number(body, key)
+        return {"score": round(await self.batcher.predict(row), 2)}
+
+    async def report(self, body):
+        from study_pattern.report import REPORT_FIELDS
+
+        missing = [k for k in REPORT_FIELDS if k not in body]
+        if missing:
+            raise BadRequest(f"missing fields: {', '.join(missing)}")
+        pdf = await asyncio.get_running_loop().run_in_executor(self.pool, _render, body)
+        return 200, "application/pdf", pdf
+
+    async def health(self, body):
+        return {"ok": True, "predict_batches": self.batcher.batches, "predict_rows": self.batcher.rows}
+
+    # ---------- HTTP/1.1 over asyncio streams ----------
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, version = (lines[0].split(" ") + ["", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body can't be framed; close after answering.
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    return
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    return
+                raw = await reader.readexactly(length) if length else b""
+                status, ctype, payload = await self._dispatch(method, path.split("?", 1)[0], raw)
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                await self._respond(writer, status, payload, ctype, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, raw):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = any(p == path for _, p in self.routes)
+            return (405, None, {"error": f"{method} not allowed"}) if known else (404, None, {"error": "not found"})
+        try:
+            body = json.loads(raw) if raw else {}
+            if not isinstance(body, dict):
+                raise BadRequest("body must be a JSON object")
+            result = await handler(body)
+        except (BadRequest, json.JSONDecodeError) as exc:
+            return 400, None, {"error": str(exc)}
+        except Exception as exc:
+            return 500, None, {"error": f"{type(exc).__name__}: {exc}"}
+        return result if isinstance(result, tuple) else (200, None, result)
+
+    async def _respond(self, writer, status, payload, ctype=None, keep_alive=True):
+        if ctype is None:
+            ctype, payload = "application/json", json.dumps(payload, ensure_ascii=False).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: {ctype}\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            .encode("latin-1") + payload
+        )
+        await writer.drain()
+
+    def close(self):
+        self.batcher.close()
+        self.pool.shutdown()
+
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    api = StudyAPI(**options)
+    await api.batcher.warm_up()
+    server = await asyncio.start_server(api.handle, host, port, backlog=1024)
+    print(f"study API listening on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        # Also stops the PDF worker processes.
+        api.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None, help="PDF processes (default: CPU count)")
+    ap.add_argument("--batch-window", type=float, default=2.0,
+                    help="ms to collect concurrent /predict requests (default: 2)")
+    ap.add_argument("--max-batch", type=int, default=256, help="rows per model call (default: 256)")
+    args = ap.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, workers=args.workers,
+                      batch_window=args.batch_window / 1e3, max_batch=args.max_batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Render one PDF report per student (or per student-week) across a process pool.
+
+    python -m study_pattern.batch_reports logs.csv [more.csv ...] --out reports --per-week
+
+Input CSVs may use the ``study_data.csv`` or the ``study_logs.csv`` column
+names. Rows are grouped by ``--student-column``, or by the page's ``user``
+column when that is missing; rows with neither are treated as a single
+student named after the file.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from study_pattern.report import build_pdf
+
+RENAME = {
+    "Date": "date", "Study_Hours": "hours_studied", "Breaks": "breaks_taken",
+    "Mood": "mood", "Score": "score",
+}
+
+
+def load_logs(paths, student_column="student_id"):
+    frames = []
+    for path in paths:
+        df = pd.read_csv(path).rename(columns=RENAME)
+        if student_column not in df:
+            # study_data.csv rows from before the user column have it empty.
+            df[student_column] = df["user"].fillna(Path(path).stem) if "user" in df else Path(path).stem
+        frames.append(df)
+    df = pd.concat(frames, ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    return df.rename(columns={student_column: "student"})
+
+
+def build_records(df, goal=6.0, per_week=False):
+    """Aggregate logs into one report record per student (or student-week)."""
+    daily = df.groupby(["student", "date"], as_index=False).agg(
+        hours=("hours_studied", "sum"),
+        breaks=("breaks_taken", "sum"),
+        score=("score", "mean"),
+        **({"revision": ("revision", "max")} if "revision" in df else {}),
+    )
+    keys = ["student"]
+    if per_week:
+        daily["period"] = daily["date"].dt.to_period("W").astype(str)
+        keys.append("period")
+    daily["hit"] = daily["hours"] >= goal
+
+    # Longest run of consecutive goal-hit days per group.
+    hits = daily[daily["hit"]].sort_values(keys + ["date"])
+    day_no = hits["date"].values.astype("datetime64[D]").astype("int64")
+    new_run = (hits[keys].ne(hits[keys].shift()).any(axis=1).to_numpy()
+               | (pd.Series(day_no).diff().to_numpy() != 1))
+    hits = hits.assign(run=new_run.cumsum())
+    streaks = hits.groupby(keys + ["run"]).size().groupby(level=keys).max().rename("streak")
+
+    summary = daily.groupby(keys).agg(
+        days=("date", "size"), first=("date", "min"), last=("date", "max"),
+        hours=("hours", "mean"), breaks=("breaks", "mean"), score=("score", "mean"),
+        goal_days=("hit", "sum"),
+        **({"revision": ("revision", "mean")} if "revision" in daily else {}),
+    ).join(streaks)
+    mood_keys = keys if not per_week else ["student", df["date"].dt.to_period("W").astype(str).rename("period")]
+    # mode() is empty when every mood in the group is missing.
+    summary["mood"] = df.groupby(mood_keys)["mood"].agg(lambda s: s.mode().iat[0] if s.notna().any() else "—")
+
+    records = []
+    for key, row in summary.iterrows():
+        key = key if isinstance(key, tuple) else (key,)
+        revision = "—" if "revision" not in row or pd.isna(row["revision"]) else (
+            "Yes" if row["revision"] >= 0.5 else "No")
+        records.append({
+            "student": key[0],
+            "period": key[1] if per_week else f"{row['first']:%Y-%m-%d} – {row['last']:%Y-%m-%d}",
+            "hours": round(float(row["hours"]), 1), "goal": goal,
+            "breaks": int(round(row["breaks"])), "revision": revision,
+            "mood": row["mood"], "energy": "—", "focus": "",
+            "xp": int(row["goal_days"]) * 20,
+            "streak": 0 if pd.isna(row["streak"]) else int(row["streak"]),
+            "last_bot": (f"Logged {row['days']} day(s); goal met on {int(row['goal_days'])}.\n"
+                         f"Average score: {'—' if pd.isna(row['score']) else format(row['score'], '.1f')}"),
+            "buddy": (),
+        })
+    return records
+
+
+def _file_name(record):
+    stem = f"{record['student']}_{record['period']}"
+    return re.sub(r"[^\w.-]+", "_", stem).strip("_") + ".pdf"
+
+
+def _render_chunk(records, out_dir):
+    out_dir = Path(out_dir)
+    for record in records:
+        (out_dir / _file_name(record)).write_bytes(build_pdf(record))
+    return len(records)
+
+
+def render_all(records, out_dir, workers=None, chunk_size=None, progress=sys.stderr):
+    """Render every record into ``out_dir``; returns ``(count, seconds)``."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    # Chunks amortise pickling/IPC while leaving enough tasks to balance load.
+    chunk_size = chunk_size or max(1, min(50, len(records) // (workers * 8) or 1))
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    done, t0 = 0, time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_chunk, chunk, str(out_dir)) for chunk in chunks]
+        for fut in as_completed(futures):
+            done += fut.result()
+            if progress:
+                rate = done / (time.perf_counter() - t0)
+                print(f"\r{done}/{len(records)} PDFs  {rate:7.1f} PDFs/s", end="", file=progress)
+    elapsed = time.perf_counter() - t0
+    if progress:
+        print(file=progress)
+    return done, elapsed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("csv", nargs="+", help="study log CSV file(s)")
+    ap.add_argument("--out", default="reports", help="output directory (default: reports)")
+    ap.add_argument("--per-week", action="store_true", help="one report per student-week")
+    ap.add_argument("--goal", type=float, default=6.0, help="daily goal in hours (default: 6)")
+    ap.add_argument("--student-column", default="student_id")
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    args = ap.parse_args(argv)
+
+    records = build_records(load_logs(args.csv, args.student_column), args.goal, args.per_week)
+    count, elapsed = render_all(records, args.out, args.workers)
+    print(f"{count} reports in {elapsed:.1f}s ({count / elapsed:.1f} PDFs/s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""History charts (matplotlib/seaborn) rendered to PNG for the Streamlit page.
+
+Long series are downsampled with Largest-Triangle-Three-Buckets to ``POINTS``
+points before plotting, so drawing costs the same at 1k or 1M logged days.
+Rendered images are cached per (log, data version, theme, goal): reruns,
+timer ticks included, reuse the bytes until new rows are folded in.
+"""
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+
+from study_pattern.theme import THEMES
+
+POINTS = 600        # about one point per horizontal pixel of a chart
+CACHE_SIZE = 16
+SIZE = (6.4, 2.8)   # inches
+DPI = 100
+
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` points of ``(x, y)`` chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point; from each bucket in between it keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves peaks and dips.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:-1], edges[:-1]) / sizes
+    # The bucket after the last one is the final point.
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay, cx, cy = x[a], y[a], mean_x[i], mean_y[i]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample(days, values, n_out=POINTS):
+    """LTTB over the finite values of a daily series; returns ``(days, values)``."""
+    keep = np.flatnonzero(np.isfinite(values))
+    days, values = days[keep], values[keep]
+    idx = lttb(days.astype(np.int64), values, n_out)
+    return days[idx], values[idx]
+
+
+# ---------- drawing ----------
+def _figure(palette):
+    # Figure, not pyplot: no global state, so sessions can render concurrently.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=SIZE, dpi=DPI)
+    fig.patch.set_alpha(0)
+    ax = fig.add_subplot()
+    ax.set_facecolor("none")
+    for side in ("top", "right"):
+        ax.spines[side].set_visible(False)
+    for side in ("left", "bottom"):
+        ax.spines[side].set_color(palette["--muted"])
+    ax.tick_params(colors=palette["--muted"], labelsize=8)
+    ax.yaxis.label.set_color(palette["--text"])
+    ax.title.set_color(palette["--text"])
+    return fig, ax
+
+
+def _png(fig):
+    buf = BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png", transparent=True)
+    return buf.getvalue()
+
+
+def hours_chart(days, hours, goal, palette, n_out=POINTS):
+    d, h = downsample(days, hours, n_out)
+    fig, ax = _figure(palette)
+    ax.plot(d, h, color=palette["--accent"], linewidth=1.2)
+    ax.axhline(goal, color=palette["--warn"], linestyle="--", linewidth=1, label=f"goal {goal:g} h")
+    ax.fill_between(d, h, goal, where=h >= goal, color=palette["--success"], alpha=0.25, linewidth=0)
+    hit = float(np.mean(hours >= goal)) if len(hours) else 0.0
+    ax.set_title(f"Hours vs goal · goal met on {hit:.0%} of days", fontsize=10, loc="left")
+    ax.set_ylabel("h/day", fontsize=8)
+    ax.legend(loc="upper right", fontsize=8, frameon=False, labelcolor=palette["--text"])
+    fig.autofmt_xdate()
+    return _png(fig)
+
+
+def score_chart(days, scores, palette, n_out=POINTS):
+    d, s = downsample(days, scores, n_out)
+    fig, ax = _figure(palette)
+    ax.plot(d, s, color=palette["--accent"], linewidth=1.2)
+    if len(s) > 1:
+        # Least-squares trend over the plotted points.
+        t = d.astype(np.int64).astype(np.float64)
+        slope, icpt = np.polyfit(t, s, 1)
+        ax.plot(d[[0, -1]], icpt + slope * t[[0, -1]], color=palette["--danger"], linewidth=1, linestyle="--")
+    ax.set_title("Score trend", fontsize=10, loc="left")
+    ax.set_ylabel("score", fontsize=8)
+    ax.set_ylim(0, 100)
+    fig.autofmt_xdate()
+    return _png(fig)
+
+
+def mood_heatmap(moods, palette):
+    """Share of each mood's logs per 10-point score bin."""
+    import seaborn as sns
+
+    names = list(moods)
+    counts = np.array([moods[m]["hist"] for m in names], dtype=np.float64).reshape(len(names), -1)
+    share = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    fig, ax = _figure(palette)
+    cmap = sns.light_palette(palette["--accent"], as_cmap=True)
+    sns.heatmap(share, ax=ax, cmap=cmap, vmin=0, cbar=False, linewidths=0.5, linecolor=palette["--card"],
+                annot=len(names) <= 8, fmt=".0%", annot_kws={"fontsize": 7},
+                xticklabels=[f"{lo}–{lo + 10}" for lo in range(0, 100, 10)], yticklabels=names)
+    ax.set_title("Score by mood", fontsize=10, loc="left")
+    ax.tick_params(axis="y", rotation=0)
+    ax.tick_params(axis="x", rotation=45)
+    return _png(fig)
+
+
+# ---------- cache ----------
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def history_charts(history, theme="Light", goal=6.0):
+    """``{"hours": png, "score": png, "mood": png}`` for a ``HistoryAnalytics``.
+
+    Cached per (log path, data version, theme, goal); a miss renders all three.
+    """
+    key = (history.path, history.version, theme, float(goal))
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    palette = THEMES[theme]
+    days, hours, scores = history.daily_series()
+    charts = {
+        "hours": hours_chart(days, hours, float(goal), palette),
+        "score": score_chart(days, scores, palette),
+        "mood": mood_heatmap(history.mood_distributions(), palette),
+    }
+    with _lock:
+        _cache[key] = charts
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return charts
@@ -0,0 +1,309 @@
+"""Columnar, memory-mapped storage for the study logs.
+
+    python -m study_pattern.columnar study_data.csv study_data.cols
+    python -m study_pattern.columnar study_data.cols study_data.csv   # and back
+
+A ``.cols`` directory holds one raw little-endian file per column and a
+``meta.json`` with the schema, the row count and the mood dictionary. Dates
+are int32 day numbers (as in ``store``); moods are int16 codes into the
+dictionary, which starts with ``label_encoder.pkl``'s classes (so codes match
+the encoder) followed by the page's other moods and any new ones met later.
+
+A third schema, ``cohort``, holds imported multi-student logs
+(``study_pattern.importer``) with student ids dictionary-encoded the same way.
+The ``data`` schema's ``user`` column (who logged the row) came later: CSVs
+and directories without it still open, their rows as user ``""`` (code 0).
+
+``open_columns`` maps the column files read-only: loading parses nothing and
+copies nothing, and the pages live in the OS cache, shared between
+processes. Point ``STUDY_DATA_PATH`` or ``STUDY_LOGS_PATH`` at a ``.cols``
+directory to run the page on it.
+"""
+import argparse
+import json
+import os
+import shutil
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern.predict import APP_MOODS, BASE_DIR
+
+SCHEMAS = {
+    "data": {"date": "<i4", "hours_studied": "<f4", "breaks_taken": "<i2", "revision": "<f4",
+             "mood": "<i2", "score": "<f4", "user": "<i4"},
+    "logs": {"Date": "<i4", "Study_Hours": "<f4", "Sleep_Hours": "<f4", "Distractions": "<i2",
+             "Breaks": "<i2", "Mood": "<i2", "Score": "<f4"},
+    # Both schemas in one record, per student (``study_pattern.importer``); NaN where a source lacks a field.
+    "cohort": {"student": "<i4", "date": "<i4", "hours_studied": "<f4", "breaks_taken": "<i2",
+               "revision": "<f4", "mood": "<i2", "score": "<f4", "sleep_hours": "<f4", "distractions": "<f4"},
+}
+DATE_COLUMNS = ("date", "Date")
+# Dictionary-encoded columns -> the meta.json list holding their values.
+DICTIONARIES = {"mood": "moods", "Mood": "moods", "student": "students", "user": "users"}
+# Columns added to a schema later; older files lack them and read as code 0 ("").
+ADDED_COLUMNS = ("user",)
+
+
+def is_columnar(path) -> bool:
+    return str(path).rstrip("/\\").endswith(".cols") or os.path.isfile(os.path.join(path, "meta.json"))
+
+
+def mood_dictionary():
+    """The encoder's classes in code order, then the page's moods it lacks."""
+    import joblib
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        classes = [str(c) for c in joblib.load(BASE_DIR / "label_encoder.pkl").classes_]
+    return classes + [m for m in APP_MOODS if m not in classes]
+
+
+def _schema_of(columns):
+    for name, schema in SCHEMAS.items():
+        if tuple(columns) in (tuple(schema), tuple(c for c in schema if c not in ADDED_COLUMNS)):
+            return name
+    raise ValueError(f"unknown study log columns: {', '.join(columns)}")
+
+
+def _encode(values, labels, codes, dtype=np.int16, missing="Neutral"):
+    """Strings -> codes into ``labels``, extending ``labels``/``codes`` with new ones."""
+    cat = pd.Categorical(pd.Series(values).fillna(missing).astype(str))
+    for m in cat.categories:
+        if m not in codes:
+            codes[m] = len(labels)
+            labels.append(m)
+    lookup = np.array([codes[m] for m in cat.categories], dtype=dtype)
+    return lookup[cat.codes]
+
+
+def _encode_column(column, values, dictionaries, dtype):
+    labels, codes = dictionaries[column]
+    return _encode(values, labels, codes, dtype, missing="Neutral" if DICTIONARIES[column] == "moods" else "")
+
+
+def _dictionaries(meta):
+    """Fresh ``{column: (labels, codes)}`` for the schema's dictionary columns."""
+    out = {}
+    for c in SCHEMAS[meta["schema"]]:
+        if c in DICTIONARIES:
+            labels = list(_labels(meta, c))
+            out[c] = labels, {m: i for i, m in enumerate(labels)}
+    return out
+
+
+def _labels(meta, column):
+    return meta.get(DICTIONARIES[column], [""] if column in ADDED_COLUMNS else [])
+
+
+def _day_numbers(values):
+    days = pd.to_datetime(pd.Series(values), format="ISO8601").to_numpy().astype("datetime64[D]")
+    return days.astype(np.int64).astype(np.int32)
+
+
+class Columns:
+    """A read-only, memory-mapped ``.cols`` directory."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.schema = meta["schema"]
+        self.rows = meta["rows"]
+        self.moods = meta["moods"]
+        self.labels = {c: _labels(meta, c) for c in SCHEMAS[self.schema] if c in DICTIONARIES}
+        self.dtypes = {c: np.dtype(t) for c, t in SCHEMAS[self.schema].items()}
+        # Mapped to the row count in meta.json, so rows still being appended stay invisible.
+        self._cols = {c: self._map(c, t) for c, t in self.dtypes.items()}
+
+    def _map(self, column, dtype):
+        file = self.path / f"{column}.bin"
+        if not self.rows:
+            return np.empty(0, dtype=dtype)
+        if column in ADDED_COLUMNS and (file.stat().st_size if file.exists() else 0) < self.rows * dtype.itemsize:
+            # Rows from before the column existed (the file is padded on the next append).
+            return np.zeros(self.rows, dtype=dtype)
+        return np.memmap(file, dtype=dtype, mode="r", shape=(self.rows,))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self._cols[name]
+
+    def __iter__(self):
+        return iter(self._cols)
+
+    def frame(self, start=0, stop=None):
+        """Rows ``start:stop`` as a DataFrame shaped like the CSV (dates as datetime64)."""
+        out = {}
+        for c, arr in self._cols.items():
+            values = arr[start:stop]
+            if c in DATE_COLUMNS:
+                values = values.astype("datetime64[D]")
+            elif c in self.labels:
+                values = pd.Categorical.from_codes(values, categories=self.labels[c])
+            out[c] = values
+        return pd.DataFrame(out)
+
+
+def open_columns(path) -> Columns:
+    return Columns(path)
+
+
+def read_meta(path):
+    return json.loads((Path(path) / "meta.json").read_text(encoding="utf-8"))
+
+
+def _write_meta(path, meta):
+    tmp = Path(path) / ".meta.json.tmp"
+    # Compact, so the C encoder writes it: an import rewrites it (and its student list) every chunk.
+    tmp.write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, Path(path) / "meta.json")
+
+
+def _new_meta(schema):
+    meta = {"schema": schema, "rows": 0, "moods": mood_dictionary()}
+    if "student" in SCHEMAS[schema]:
+        meta["students"] = []
+    if "user" in SCHEMAS[schema]:
+        meta["users"] = [""]
+    return meta
+
+
+def create(path, schema):
+    """An empty ``.cols`` directory for ``schema`` ("data", "logs" or "cohort")."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for c in SCHEMAS[schema]:
+        (path / f"{c}.bin").write_bytes(b"")
+    _write_meta(path, _new_meta(schema))
+
+
+def append(path, columns):
+    """Append rows (a dict of equal-length sequences, moods as strings, dates
+    as ISO strings or dates) to a ``.cols`` directory.
+
+    Column bytes are written first and ``meta.json`` is replaced last, so a
+    reader never maps a partly written row. One writer per directory.
+    """
+    meta = read_meta(path)
+    dictionaries = _dictionaries(meta)
+    arrays = {}
+    for c, t in SCHEMAS[meta["schema"]].items():
+        values = columns[c]
+        if c in DATE_COLUMNS:
+            arrays[c] = _day_numbers([str(v) for v in values])
+        elif c in dictionaries:
+            arrays[c] = _encode_column(c, values, dictionaries, t)
+        else:
+            arrays[c] = np.asarray(values, dtype=t)
+    extend(path, arrays, **{DICTIONARIES[c]: labels for c, (labels, _) in dictionaries.items()})
+
+
+def extend(path, arrays, **labels):
+    """Append already-encoded column arrays; ``labels`` replaces dictionary
+    lists in meta.json (e.g. ``students=[...]`` after new students)."""
+    path = Path(path)
+    meta = read_meta(path)
+    n = None
+    for c, t in SCHEMAS[meta["schema"]].items():
+        arr = np.asarray(arrays[c]).astype(t, copy=False)
+        n = len(arr)
+        with open(path / f"{c}.bin", "ab") as f:
+            if c in ADDED_COLUMNS:
+                # Pad a column added after this directory was written (code 0 = "").
+                f.write(bytes(max(0, meta["rows"] * np.dtype(t).itemsize - f.tell())))
+            f.write(arr.tobytes())
+    meta.update(labels, rows=meta["rows"] + n)
+    _write_meta(path, meta)
+
+
+def truncate(path, rows):
+    """Drop rows past ``rows`` (e.g. written after the last checkpoint)."""
+    path = Path(path)
+    meta = read_meta(path)
+    for c, t in SCHEMAS[meta["schema"]].items():
+        if not (path / f"{c}.bin").exists():
+            continue  # an added column not written yet
+        with open(path / f"{c}.bin", "r+b") as f:
+            f.truncate(min(f.seek(0, os.SEEK_END), rows * np.dtype(t).itemsize))
+    meta["rows"] = min(meta["rows"], rows)
+    _write_meta(path, meta)
+
+
+# ---------- conversion ----------
+def csv_to_columns(src, dst, chunk_rows=1 << 20):
+    """Convert a study log CSV into a ``.cols`` directory; returns the row count."""
+    src, dst = Path(src), Path(dst)
+    header = pd.read_csv(src, nrows=0).columns
+    schema = _schema_of(header)
+    dtypes = SCHEMAS[schema]
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    meta = _new_meta(schema)
+    dictionaries = _dictionaries(meta)
+    files = {c: open(tmp / f"{c}.bin", "wb") for c in dtypes}
+    rows = 0
+    try:
+        parse = {c: str if c in dictionaries else t for c, t in dtypes.items() if c not in DATE_COLUMNS}
+        # By position: a log from before an added column has a shorter header, and rows of both widths.
+        for chunk in pd.read_csv(src, chunksize=chunk_rows, dtype=parse, header=None, skiprows=1,
+                                 names=list(dtypes)):
+            for c, t in dtypes.items():
+                if c in DATE_COLUMNS:
+                    arr = _day_numbers(chunk[c])
+                elif c in dictionaries:
+                    arr = _encode_column(c, chunk[c], dictionaries, t)
+                else:
+                    arr = chunk[c].to_numpy(t)
+                files[c].write(arr.tobytes())
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+    meta.update({DICTIONARIES[c]: labels for c, (labels, _) in dictionaries.items()}, rows=rows)
+    _write_meta(tmp, meta)
+    shutil.rmtree(dst, ignore_errors=True)
+    os.replace(tmp, dst)
+    return rows
+
+
+def columns_to_csv(src, dst, chunk_rows=1 << 20):
+    """Write a ``.cols`` directory back out as the CSV it came from; returns the row count."""
+    cols = open_columns(src)
+    dst = Path(dst)
+    tmp = dst.with_name(f".{dst.name}.tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        f.write(",".join(cols) + "\n")
+        for start in range(0, len(cols), chunk_rows):
+            df = cols.frame(start, start + chunk_rows)
+            for c in DATE_COLUMNS:
+                if c in df:
+                    df[c] = df[c].dt.strftime("%Y-%m-%d")
+            df.to_csv(f, header=False, index=False)
+    os.replace(tmp, dst)
+    return len(cols)
+
+
+def convert(src, dst, chunk_rows=1 << 20):
+    """CSV -> ``.cols`` or ``.cols`` -> CSV, by the source's type."""
+    if is_columnar(src):
+        return columns_to_csv(src, dst, chunk_rows)
+    return csv_to_columns(src, dst, chunk_rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Convert a study log between CSV and columnar (.cols) form.")
+    ap.add_argument("src")
+    ap.add_argument("dst")
+    ap.add_argument("--chunk-rows", type=int, default=1 << 20)
+    args = ap.parse_args(argv)
+    rows = convert(args.src, args.dst, args.chunk_rows)
+    print(f"{rows:,} rows: {args.src} -> {args.dst}")
+
+
+if __name__ == "__main__":
+    main()
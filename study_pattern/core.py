@@ -0,0 +1,123 @@
+"""UI-free study logic: goal progress, recommendations, buddy lines, Pomodoro phases, XP/streak.
+
+Everything here takes plain values (no ``st.session_state``) and imports only
+the standard library, so batch jobs, services and benchmarks can use it
+without paying for Streamlit, reportlab or scikit-learn.
+"""
+import datetime as dt
+
+from study_pattern.recommend import recommend
+
+BUDDY_LINES = {
+    "general": {
+        "Coach Nova": "I’m proud of the consistency. One more small win today!",
+        "Zen Panda": "Breathe in focus, breathe out distraction. You’ve got this.",
+        "Professor Byte": "Incremental improvements compile into greatness."
+    },
+    "work_start": {
+        "Coach Nova": "Work block started. Keep your eyes on the rep count.",
+        "Zen Panda": "Focus like water—flow through one problem at a time.",
+        "Professor Byte": "Executing deep work routine… expect performance gains."
+    },
+    "break_start": {
+        "Coach Nova": "Break time! Shake it out, hydrate, then back to it.",
+        "Zen Panda": "Rest the mind to sharpen the blade of thought.",
+        "Professor Byte": "Garbage collection in progress—refreshing mental memory."
+    },
+    "goal_hit": {
+        "Coach Nova": "Goal hit! That’s how you build momentum.",
+        "Zen Panda": "Harmony achieved. Let gratitude close the day.",
+        "Professor Byte": "Target reached. Logging achievement badge."
+    }
+}
+
+# ---------- goal progress ----------
+def percent(hours, goal):
+    try:
+        return min(100, round((hours / goal) * 100))
+    except ZeroDivisionError:
+        return 0
+
+
+def growth_stage(pct):
+    if pct < 30:   return "🌱 Seedling — just getting started."
+    if pct < 70:   return "🌿 Sapling — growing strong."
+    if pct < 100:  return "🌳 Tree — almost there!"
+    return "🌸 Flourishing — goal achieved!"
+
+
+def format_seconds(total_s: int) -> str:
+    total_s = max(0, int(total_s))
+    m, s = divmod(total_s, 60)
+    return f"{m:02d}:{s:02d}"
+
+
+# ---------- coaching ----------
+def buddy_msg(persona, trigger="general"):
+    return BUDDY_LINES.get(trigger, BUDDY_LINES["general"]).get(persona, BUDDY_LINES["general"]["Coach Nova"])
+
+
+def build_recommendations(h, g, b, rev, md, en, focus, user=None, day=None):
+    """Rule-table recommendations plus two general tips seeded by (user, day)."""
+    return recommend({"hours": h, "goal": g, "breaks": b, "revision": rev, "mood": md,
+                      "energy": en, "focus": focus}, user, day)
+
+
+# ---------- Pomodoro ----------
+def phase_seconds(mode: str, work_min, break_min) -> int:
+    if mode == "Work":
+        return int(work_min * 60)
+    return int(break_min * 60)
+
+
+def next_phase(mode: str) -> str:
+    return "Break" if mode == "Work" else "Work"
+
+
+def start_phase(mode: str, work_min, break_min, now: int) -> dict:
+    """State updates that start a fresh ``mode`` phase at ``now``."""
+    return {"pomo_mode": mode, "pomo_target_ts": now + phase_seconds(mode, work_min, break_min),
+            "pomo_running": True}
+
+
+def stop_timer() -> dict:
+    return {"pomo_running": False}
+
+
+def reset_timer() -> dict:
+    return {"pomo_running": False, "pomo_mode": "Work", "pomo_target_ts": None}
+
+
+def current_remaining(running, target_ts, mode, work_min, break_min, now: int) -> int:
+    if not running or target_ts is None:
+        return phase_seconds(mode, work_min, break_min)
+    return max(0, target_ts - now)
+
+
+# ---------- XP / streak (signed-out sessions; study_pattern.progress for signed-in) ----------
+def goal_hit(xp, streak, last_log_date, today: str) -> dict:
+    """State updates for meeting the goal on ``today`` (ISO date): +20 XP, and
+    the streak grows on the next day's first hit and restarts after a gap.
+
+    >>> goal_hit(40, 2, "2026-10-16", "2026-10-17")
+    {'xp': 60, 'streak': 3, 'last_log_date': '2026-10-17'}
+    >>> goal_hit(60, 3, "2026-10-17", "2026-10-17")
+    {'xp': 80}
+    >>> goal_hit(80, 3, "2026-10-10", "2026-10-17")
+    {'xp': 100, 'streak': 1, 'last_log_date': '2026-10-17'}
+    >>> goal_hit(0, 0, None, "2026-10-17")
+    {'xp': 20, 'streak': 1, 'last_log_date': '2026-10-17'}
+    """
+    update = {"xp": xp + 20}
+    if last_log_date == today:
+        return update
+    if last_log_date:
+        gap = (dt.date.fromisoformat(today) - dt.date.fromisoformat(last_log_date)).days
+        if gap == 1:
+            streak += 1
+        elif gap > 1:
+            streak = 1
+    else:
+        streak = 1
+    update.update(streak=streak, last_log_date=today)
+    return update
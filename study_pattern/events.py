@@ -0,0 +1,170 @@
+"""Pomodoro event log: timer transitions, written behind the UI.
+
+``EventLog.emit`` timestamps an event and puts it on an in-process queue
+(never touching disk); one writer thread drains the queue in batches, appends
+them to a JSON-lines file and folds them into ``FocusStats``. On start the
+existing file is replayed, so the stats survive restarts.
+
+Events are ``{"ts", "session", "kind", "mode"}`` with ``kind`` one of
+``start`` (fresh phase), ``resume``, ``pause``, ``complete`` (phase ran out)
+and ``reset``; ``start`` and ``resume`` also carry the phase's end time as
+``target``. Focus time is the span of each Work segment, from start/resume to
+the next event of the same session but no later than ``target`` (a tab
+closed mid-phase is only closed by the next visit's event), and split at
+midnight between the days it covers.
+"""
+import atexit
+import datetime as dt
+import json
+import queue
+import threading
+import time
+
+# Segments logged without a ``target`` are capped at the longest Work phase the form allows.
+MAX_SEGMENT = 90 * 60
+
+
+class FocusStats:
+    """Aggregates updated one event at a time: focus per day, completion, pauses."""
+
+    def __init__(self):
+        self._open = {}         # session -> (ts, mode, end ts at the latest) of the running segment
+        self._sessions = {}     # session -> {"focus": {day: s}, "started", "completed", "pauses"}
+
+    def _counters(self, session):
+        c = self._sessions.get(session)
+        if c is None:
+            c = self._sessions[session] = {"focus": {}, "started": 0, "completed": 0, "pauses": 0}
+        return c
+
+    def apply(self, event):
+        session, kind, mode, ts = event["session"], event["kind"], event["mode"], event["ts"]
+        c = self._counters(session)
+        seg = self._open.pop(session, None)
+        if seg and seg[1] == "Work":
+            self._add_focus(c["focus"], seg[0], min(ts, seg[2]))
+        if kind in ("start", "resume"):
+            self._open[session] = (ts, mode, event.get("target") or ts + MAX_SEGMENT)
+        if mode != "Work":
+            return
+        if kind == "start":
+            c["started"] += 1
+        elif kind == "complete":
+            c["completed"] += 1
+        elif kind == "pause":
+            c["pauses"] += 1
+
+    @staticmethod
+    def _add_focus(focus, start, end):
+        # Credit each local calendar day with its part of [start, end).
+        while start < end:
+            day = dt.date.fromtimestamp(start)
+            midnight = dt.datetime.combine(day + dt.timedelta(days=1), dt.time()).timestamp()
+            stop = min(end, midnight)
+            focus[day.isoformat()] = focus.get(day.isoformat(), 0.0) + stop - start
+            start = stop
+
+    def summary(self, session=None):
+        """``{"focus_minutes": {day: min}, "completion_rate", "avg_pauses", "blocks"}``
+        for one session, or summed over every session."""
+        if session is None:
+            rows = list(self._sessions.values())
+        else:
+            rows = [self._sessions[session]] if session in self._sessions else []
+        focus, started, completed, pauses = {}, 0, 0, 0
+        for c in rows:
+            for day, s in c["focus"].items():
+                focus[day] = focus.get(day, 0.0) + s
+            started += c["started"]
+            completed += c["completed"]
+            pauses += c["pauses"]
+        return {
+            "focus_minutes": {day: round(s / 60, 1) for day, s in sorted(focus.items())},
+            "completion_rate": completed / started if started else 0.0,
+            "avg_pauses": pauses / started if started else 0.0,
+            "blocks": started,
+        }
+
+
+class EventLog:
+    """Queue in front of an append-only JSON-lines file and its ``FocusStats``."""
+
+    def __init__(self, path, batch_size=1000, flush_interval=0.5, max_pending=100_000):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = FocusStats()
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()      # guards stats
+        self._replay()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._run, name="pomodoro-events", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _replay(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.stats.apply(json.loads(line))
+        except FileNotFoundError:
+            pass
+
+    def emit(self, session, kind, mode, ts=None, target=None):
+        """Queue one event; never blocks. Returns False if the queue was full."""
+        event = {"ts": time.time() if ts is None else ts, "session": session, "kind": kind, "mode": mode}
+        if target is not None:
+            event["target"] = target
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def summary(self, session=None):
+        with self._lock:
+            return self.stats.summary(session)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    # ---------- writer ----------
+    def _drain(self, first):
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        events = [e for e in batch if e is not None]
+        if events:
+            self._file.write("".join(json.dumps(e) + "\n" for e in events))
+            self._file.flush()
+            with self._lock:
+                for e in events:
+                    self.stats.apply(e)
+            self.written += len(events)
+        return len(events) != len(batch)   # saw the close sentinel
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if self._drain(first):
+                return
+
+    def close(self):
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+        # Anything emitted after the sentinel.
+        while not self._queue.empty():
+            self._drain(self._queue.get_nowait())
+        self._file.close()
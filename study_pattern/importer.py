@@ -0,0 +1,394 @@
+"""Streaming bulk import of cohort-wide study logs into a ``.cols`` directory.
+
+    python -m study_pattern.importer export.csv --out cohort.cols [--workers 4]
+
+Exports may use the ``study_data.csv`` or the ``study_logs.csv`` column names
+(plus an optional ``student_id``, or the page's ``user``); both map onto one
+``cohort`` record (``columnar.SCHEMAS``). The file is read in fixed-size chunks cut at line
+ends and parsed by worker processes (pyarrow's CSV reader), with at most two
+chunks per worker in flight, so memory stays bounded whatever the file size.
+
+Rows are checked against the form's limits (hours 0–12, breaks a whole
+number 0–12, score 0–100 or empty) and the mood vocabulary (``label_encoder.pkl``'s
+classes plus the page's moods, any letter case); failing rows go to a reject
+file with the reason appended. After each chunk is written the byte offset
+reached is saved in ``checkpoint.json`` inside the output, and re-running
+the same command resumes from there (``--restart`` starts over).
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+
+from study_pattern import columnar
+
+# canonical field -> accepted source column names
+FIELDS = {
+    "student": ("student_id", "student", "user"),
+    "date": ("date", "Date"),
+    "hours_studied": ("hours_studied", "Study_Hours"),
+    "breaks_taken": ("breaks_taken", "Breaks"),
+    "revision": ("revision", "Revision"),
+    "mood": ("mood", "Mood"),
+    "score": ("score", "Score"),
+    "sleep_hours": ("sleep_hours", "Sleep_Hours"),
+    "distractions": ("distractions", "Distractions"),
+}
+REQUIRED = ("date", "hours_studied", "breaks_taken", "mood", "score")
+NUMERIC = ("hours_studied", "breaks_taken", "revision", "score", "sleep_hours", "distractions")
+# Same limits as the form's sliders; optional fields may also be empty.
+LIMITS = {"hours_studied": (0, 12), "breaks_taken": (0, 12), "score": (0, 100),
+          "sleep_hours": (0, 24), "distractions": (0, np.inf), "revision": (0, np.inf)}
+REASONS = ("", "malformed value", "bad date", "hours not 0-12", "breaks not a whole number 0-12",
+           "score not 0-100", "unknown mood", "missing student", "sleep not 0-24", "negative distractions",
+           "negative revision")
+NUMBER = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+DATE = r"^\d{4}-\d{2}-\d{2}$"
+CHECKPOINT = "checkpoint.json"
+
+
+def map_columns(header):
+    """Source column name per canonical field present in ``header``."""
+    found = {}
+    for field, names in FIELDS.items():
+        for name in names:
+            if name in header:
+                found[field] = name
+                break
+    missing = [f for f in REQUIRED if f not in found]
+    if missing:
+        raise ValueError(f"missing columns for: {', '.join(missing)} (header: {', '.join(header)})")
+    return found
+
+
+# ---------- worker side ----------
+def parse_chunk(data, header, mapping, moods):
+    """Parse and validate one block of complete CSV lines.
+
+    Returns the valid rows as canonical arrays (student codes local to the
+    chunk, with their labels) and the rejected lines with reasons.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    if mapping.get("student") == "user" and header[-1] == "user":
+        data = _pad_user(data, len(header))
+    skipped = []
+
+    def on_invalid(row):
+        skipped.append(row.number)
+        return "skip"
+
+    # Read as text and cast per column: as fast as typed reading on clean
+    # data, and a bad value costs one column's fallback, not a re-read.
+    table = pacsv.read_csv(
+        BytesIO(data),
+        read_options=pacsv.ReadOptions(column_names=header, use_threads=False, block_size=len(data) + 1),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=on_invalid),
+        convert_options=pacsv.ConvertOptions(column_types={src: pa.string() for src in mapping.values()},
+                                             include_columns=list(mapping.values())),
+    )
+    cols, malformed = _coerced_columns(table, mapping)
+
+    n = len(cols["date"])
+    mood_code = {m.lower(): i for i, m in enumerate(moods)}
+    labels, codes = cols["mood"]
+    lookup = np.array([mood_code.get(m.lower(), -1) for m in labels.to_pylist()] + [-1], dtype=np.int16)
+    mood = lookup[codes]
+
+    reason = np.zeros(n, dtype=np.int8)
+    checks = [malformed, np.isnat(cols["date"])]
+    for field in ("hours_studied", "breaks_taken", "score"):
+        lo, hi = LIMITS[field]
+        values = cols[field]
+        bad = ~((values >= lo) & (values <= hi))
+        if field == "breaks_taken":
+            bad |= values % 1 != 0
+        elif field == "score":
+            bad &= ~np.isnan(values)  # the page logs rows without a score
+        checks.append(bad)
+    checks.append(mood < 0)
+    if "student" in cols:
+        student_labels, student_codes = cols["student"]
+        blank = np.append(pc.equal(pc.utf8_length(student_labels), 0).to_numpy(zero_copy_only=False), True)
+        # An empty page ``user`` (rows from before that column) falls back to --student.
+        checks.append(blank[student_codes] if mapping["student"] != "user" else np.zeros(n, dtype=bool))
+    else:
+        checks.append(np.zeros(n, dtype=bool))
+    for field in ("sleep_hours", "distractions", "revision"):
+        lo, hi = LIMITS[field]
+        values = cols.get(field)
+        checks.append(np.zeros(n, dtype=bool) if values is None
+                      else ~np.isnan(values) & ~((values >= lo) & (values <= hi)))
+    # Report the first failing check per row.
+    for code, bad in reversed(list(enumerate(checks, start=1))):
+        reason[bad] = code
+    ok = reason == 0
+
+    out = {
+        "date": cols["date"][ok].astype(np.int64).astype(np.int32),
+        "mood": mood[ok],
+        **{f: cols[f][ok] if f in cols else np.full(int(ok.sum()), np.nan) for f in NUMERIC},
+    }
+    students = None
+    if "student" in cols:
+        # Only the students that kept a row, renumbered (a bincount, not a sort).
+        kept = student_codes[ok]
+        used = np.flatnonzero(np.bincount(kept, minlength=len(student_labels) + 1))
+        renumber = np.zeros(len(student_labels) + 1, dtype=np.int32)
+        renumber[used] = np.arange(len(used), dtype=np.int32)
+        out["student"] = renumber[kept]
+        students = student_labels.take(used).to_pylist()
+
+    rejects = []
+    if skipped or not ok.all():
+        starts, ends = _line_spans(data)
+        # Parsed row i is the i-th non-empty line the reader didn't skip (numbers are 1-based).
+        skipped = np.asarray(skipped, dtype=np.int64) - 1
+        rows = np.delete(np.arange(len(starts)), skipped)
+        rejects = [(data[starts[j]:ends[j]], REASONS[r]) for j, r in zip(rows[~ok], reason[~ok])]
+        rejects += [(data[starts[j]:ends[j]], "wrong number of fields") for j in skipped]
+    return {"arrays": out, "students": students, "rejects": rejects, "rows": int(ok.sum())}
+
+
+def _pad_user(data, fields):
+    """Give ``study_data.csv`` rows from before the ``user`` column an empty one."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts, ends = _line_spans(data)
+    commas = np.concatenate(([0], np.cumsum(buf == 44)))
+    short = ends[commas[ends] - commas[starts] == fields - 2]
+    if not len(short):
+        return data
+    pieces, prev = [], 0
+    for end in short.tolist():
+        pieces += [data[prev:end], b","]
+        prev = end
+    pieces.append(data[prev:])
+    return b"".join(pieces)
+
+
+def _line_spans(data):
+    """``(starts, ends)`` of the non-empty lines in ``data`` (ends exclude ``\\r\\n``)."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    ends = ends - (buf[np.maximum(ends - 1, 0)] == 13) * (ends > starts)
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+
+def _dictionary(column):
+    """Dictionary column -> ``(labels, codes)`` with the labels (an arrow array)
+    stripped; empty cells get code ``len(labels)``."""
+    import pyarrow.compute as pc
+
+    arr = column.combine_chunks()
+    labels = pc.utf8_trim_whitespace(arr.dictionary)
+    codes = arr.indices.fill_null(len(labels)).to_numpy(zero_copy_only=False)
+    return labels, codes
+
+
+def _coerced_columns(table, mapping):
+    """Text columns -> typed ones, with unparseable cells as NaN/NaT and flagged."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    cols, malformed = {}, np.zeros(table.num_rows, dtype=bool)
+    for field, src in mapping.items():
+        column = table[src]
+        if field in ("mood", "student"):
+            # Stripped per distinct value, not per cell.
+            cols[field] = _dictionary(pc.dictionary_encode(column))
+            continue
+        target = pa.date32() if field == "date" else pa.float64()
+        try:
+            # A clean column casts as it is; only a failed cast pays for the trim.
+            values = column.cast(target)
+        except pa.ArrowInvalid:
+            column = pc.utf8_trim_whitespace(column)
+            values = None
+        if values is None:
+            try:
+                values = column.cast(target)
+            except pa.ArrowInvalid:
+                # Null out what doesn't look like a value, then cast the rest.
+                parses = pc.fill_null(pc.match_substring_regex(column, DATE if field == "date" else NUMBER), False)
+                blank = pc.fill_null(pc.equal(column, ""), True)
+                malformed |= ~(parses.to_numpy(zero_copy_only=False) | blank.to_numpy(zero_copy_only=False))
+                try:
+                    values = pc.if_else(parses, column, pa.scalar(None, pa.string())).cast(target)
+                except pa.ArrowInvalid:
+                    # Shaped right but not a real date (2025-02-30): only these need a per-cell parse.
+                    import pandas as pd
+
+                    dates = pd.to_datetime(column.to_pandas(), format="%Y-%m-%d", errors="coerce")
+                    malformed |= (dates.isna() & parses.to_pandas()).to_numpy()
+                    cols[field] = dates.to_numpy().astype("datetime64[D]")
+                    continue
+        values = values.to_numpy(zero_copy_only=False)
+        cols[field] = values.astype("datetime64[D]") if field == "date" else values
+    return cols, malformed
+
+
+# ---------- driver ----------
+def _chunks(path, offset, chunk_bytes):
+    """Yield ``(data, end_offset)`` blocks of whole lines starting at ``offset``."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        carry = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            data = carry + block
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data  # one line longer than a chunk
+                continue
+            offset += cut
+            carry = data[cut:]
+            yield data[:cut], offset
+        if carry.strip():
+            yield carry + b"\n", offset + len(carry)
+
+
+class Importer:
+    """One source file into one ``cohort`` ``.cols`` directory, resumably."""
+
+    def __init__(self, src, out, rejects=None, workers=None, chunk_bytes=8 << 20, student=None):
+        self.src = Path(src)
+        self.out = Path(out)
+        self.rejects_path = Path(rejects) if rejects else self.out.with_name(self.out.name + ".rejects.csv")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_bytes = chunk_bytes
+        self.student = student or self.src.stem
+
+    # ---------- checkpoint ----------
+    def _load_state(self, restart):
+        path = self.out / CHECKPOINT
+        if not restart and path.exists():
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state["source"] != str(self.src.resolve()):
+                raise ValueError(f"{self.out} holds an import of {state['source']}; use --restart to replace it")
+            # Drop anything written after the checkpoint (a crash between chunk and checkpoint).
+            columnar.truncate(self.out, state["rows"])
+            with open(self.rejects_path, "r+b") as f:
+                f.truncate(state["reject_bytes"])
+            return state, True
+        if self.out.exists() and not restart and not (self.out / CHECKPOINT).exists():
+            raise ValueError(f"{self.out} exists and is not an import target; use --restart to replace it")
+        shutil.rmtree(self.out, ignore_errors=True)
+        columnar.create(self.out, "cohort")
+        with open(self.src, "rb") as f:
+            header = f.readline()
+        self.rejects_path.write_bytes(header.rstrip(b"\r\n") + b",reject_reason\n")
+        state = {"source": str(self.src.resolve()), "offset": len(header), "rows": 0, "rejected": 0,
+                 "reject_bytes": self.rejects_path.stat().st_size}
+        self._save_state(state)
+        return state, False
+
+    def _save_state(self, state):
+        tmp = self.out / f".{CHECKPOINT}.tmp"
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.out / CHECKPOINT)
+
+    # ---------- run ----------
+    def run(self, restart=False, progress=sys.stderr):
+        """Import everything after the checkpoint; returns a stats dict."""
+        with open(self.src, "rb") as f:
+            header = f.readline().decode("utf-8-sig").strip().split(",")
+        mapping = map_columns(header)
+        state, resumed = self._load_state(restart)
+        start_offset, start_rows = state["offset"], state["rows"]
+        meta = columnar.read_meta(self.out)
+        moods = meta["moods"]
+        students = meta["students"]
+        student_code = {s: i for i, s in enumerate(students)}
+        if "student" not in mapping and self.student not in student_code:
+            student_code[self.student] = len(students)
+            students.append(self.student)
+
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        in_flight = deque()
+        t0 = time.perf_counter()
+        with open(self.rejects_path, "ab") as rejects:
+            def commit(result, end):
+                arrays = result["arrays"]
+                if result["students"] is not None:
+                    codes = []
+                    for s in result["students"]:
+                        s = s or self.student
+                        code = student_code.get(s)
+                        if code is None:
+                            code = student_code[s] = len(students)
+                            students.append(s)
+                        codes.append(code)
+                    lookup = np.array(codes, dtype=np.int32)
+                    arrays["student"] = lookup[arrays["student"]]
+                else:
+                    arrays["student"] = np.full(result["rows"], student_code[self.student], dtype=np.int32)
+                columnar.extend(self.out, arrays, students=students)
+                if result["rejects"]:
+                    rejects.write(b"".join(line + b"," + reason.encode() + b"\n"
+                                           for line, reason in result["rejects"]))
+                    rejects.flush()
+                state.update(offset=end, rows=state["rows"] + result["rows"],
+                             rejected=state["rejected"] + len(result["rejects"]), reject_bytes=rejects.tell())
+                self._save_state(state)
+                if progress:
+                    rate = (state["rows"] - start_rows) / (time.perf_counter() - t0)
+                    print(f"\r{state['rows']:,} rows, {state['rejected']:,} rejected  {rate:,.0f} rows/s",
+                          end="", file=progress)
+
+            try:
+                for data, end in _chunks(self.src, state["offset"], self.chunk_bytes):
+                    if pool is None:
+                        commit(parse_chunk(data, header, mapping, moods), end)
+                        continue
+                    in_flight.append((pool.submit(parse_chunk, data, header, mapping, moods), end))
+                    if len(in_flight) >= 2 * self.workers:
+                        fut, done = in_flight.popleft()
+                        commit(fut.result(), done)
+                while in_flight:
+                    fut, done = in_flight.popleft()
+                    commit(fut.result(), done)
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+        seconds = time.perf_counter() - t0
+        if progress:
+            print(file=progress)
+        rows = state["rows"] - start_rows
+        return {"rows": rows, "rejected": state["rejected"], "total_rows": state["rows"],
+                "bytes": state["offset"] - start_offset, "seconds": seconds,
+                "rows_per_s": rows / seconds if seconds else 0.0, "resumed": resumed}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("src", help="CSV export (study_data.csv or study_logs.csv columns)")
+    ap.add_argument("--out", required=True, help="output .cols directory")
+    ap.add_argument("--rejects", default=None, help="reject file (default: <out>.rejects.csv)")
+    ap.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count; 1 = inline)")
+    ap.add_argument("--chunk-mb", type=float, default=8, help="bytes per chunk (default: 8 MB)")
+    ap.add_argument("--student", default=None, help="student id when the file has none (default: file name)")
+    ap.add_argument("--restart", action="store_true", help="ignore the checkpoint and import from the start")
+    args = ap.parse_args(argv)
+    importer = Importer(args.src, args.out, args.rejects, args.workers, int(args.chunk_mb * (1 << 20)), args.student)
+    stats = importer.run(restart=args.restart)
+    print(f"{stats['rows']:,} rows imported ({stats['total_rows']:,} total), {stats['rejected']:,} rejected "
+          f"-> {importer.rejects_path}; {stats['rows_per_s']:,.0f} rows/s"
+          f"{' (resumed)' if stats['resumed'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
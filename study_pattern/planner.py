@@ -0,0 +1,78 @@
+"""What-if plan optimizer: every candidate study plan scored in one model call.
+
+The grid spans the form's ranges: hours 0–12 in 0.5 steps, breaks 0–12 and
+revision Yes/No (650 plans). The model only sees hours, breaks and mood, so
+the 325 distinct (hours, breaks) rows go through one batched scale + predict
+and both revision variants share the score. Revision and energy rank plans
+through the recommendation rules instead: of two plans with the same score,
+the one the coach would flag (no breaks, too many, no revision) ranks lower.
+
+Rankings are memoized per (mood, energy, goal, model) with LRU eviction, and
+dropped when the model watcher swaps in a new version, so the old model and
+its plans aren't kept alive until they age out.
+"""
+import functools
+from collections import namedtuple
+
+import numpy as np
+
+from study_pattern.predict import active_artifacts, on_swap, predict_scores
+from study_pattern.recommend import RULES, evaluate
+
+HOURS = np.arange(0, 12.5, 0.5)
+BREAKS = np.arange(13)
+REVISION = ("Yes", "No")
+CACHE_SIZE = 256
+
+Plan = namedtuple("Plan", "hours breaks revision score flags")
+
+# Rules that judge the plan itself (breaks, revision) rather than the student.
+_PLAN_RULES = [i for i, rule in enumerate(RULES)
+               if any(column in ("breaks", "revision") for column, _, _ in rule["when"])]
+
+# The model rows: every (hours, breaks) pair, hours-major.
+_H, _B = (a.ravel() for a in np.meshgrid(HOURS, BREAKS, indexing="ij"))
+# The plans: each model row once per revision value.
+GRID_HOURS = np.tile(_H, len(REVISION))
+GRID_BREAKS = np.tile(_B, len(REVISION))
+GRID_REVISION = np.repeat(np.array(REVISION), len(_H))
+
+
+def score_grid(mood, artifacts=None) -> np.ndarray:
+    """Predicted score of every plan in grid order, from one model call."""
+    scores = predict_scores({"hours": _H, "breaks": _B, "mood": [mood] * len(_H)}, artifacts)
+    return np.tile(scores, len(REVISION))
+
+
+def best_plans(mood, energy, goal, k=5, artifacts=None):
+    """The ``k`` best plans with at least ``goal`` hours, best first.
+
+    Ordered by predicted score, then fewest rule flags, then fewest hours and
+    breaks; each (hours, breaks) pair appears once, with its better revision
+    choice. Returns a tuple of ``Plan`` (shared between callers: don't mutate).
+    """
+    return _ranked(mood, energy, float(goal), artifacts or active_artifacts())[:k]
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _ranked(mood, energy, goal, artifacts):
+    scores = score_grid(mood, artifacts)
+    n = len(scores)
+    batch = evaluate({
+        "hours": GRID_HOURS, "goal": np.full(n, goal), "breaks": GRID_BREAKS, "revision": GRID_REVISION,
+        "mood": np.full(n, mood), "energy": np.full(n, energy), "focus": np.full(n, ""),
+    })
+    flags = batch.mask[:, _PLAN_RULES].sum(axis=1)
+    ok = np.flatnonzero(GRID_HOURS >= goal)
+    # lexsort: last key is primary.
+    order = ok[np.lexsort((GRID_BREAKS[ok], GRID_HOURS[ok], flags[ok], -scores[ok]))]
+    # Keep only the better revision variant of each (hours, breaks) pair.
+    _, first = np.unique(order % len(_H), return_index=True)
+    order = order[np.sort(first)]
+    return tuple(
+        Plan(float(GRID_HOURS[i]), int(GRID_BREAKS[i]), str(GRID_REVISION[i]), float(scores[i]), int(flags[i]))
+        for i in order
+    )
+
+
+on_swap(_ranked.cache_clear)
@@ -0,0 +1,168 @@
+"""Score predictions from the bundled ``model.pkl`` / ``scaler.pkl`` / ``label_encoder.pkl``.
+
+The three artifacts are loaded once per process and shared by every caller
+(Streamlit sessions, batch jobs). The model was trained on ``study_logs.csv``
+with the features in ``FEATURES``; ``Mood`` is label-encoded with
+``label_encoder.pkl`` before scaling.
+
+Once ``python -m study_pattern.retrain`` has published a version under
+``models/`` (``STUDY_MODELS_DIR``), ``predict_scores`` serves that instead:
+a ``ModelWatcher`` thread loads each new version in the background and
+swaps it in with one reference assignment.
+"""
+import functools
+import os
+import threading
+import time
+import warnings
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MODELS_DIR = Path(os.environ.get("STUDY_MODELS_DIR", BASE_DIR / "models"))
+FEATURES = ("Study_Hours", "Sleep_Hours", "Distractions", "Breaks", "Mood")
+
+# The form's moods -> the moods the model was trained on.
+APP_MOODS = {"Happy": "Motivated", "Neutral": "Neutral", "Stressed": "Stressed", "Tired": "Tired"}
+
+Artifacts = namedtuple("Artifacts", "model scaler encoder")
+
+
+def read_artifacts(model_dir) -> Artifacts:
+    """Load the three artifacts from ``model_dir`` (uncached)."""
+    import joblib
+
+    model_dir = Path(model_dir)
+    with warnings.catch_warnings():
+        # Artifacts were pickled with an older scikit-learn minor version.
+        warnings.simplefilter("ignore")
+        return Artifacts(
+            joblib.load(model_dir / "model.pkl"),
+            joblib.load(model_dir / "scaler.pkl"),
+            joblib.load(model_dir / "label_encoder.pkl"),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def load_artifacts(model_dir=BASE_DIR) -> Artifacts:
+    return read_artifacts(model_dir)
+
+
+_swap_listeners = []
+
+
+def on_swap(callback):
+    """Call ``callback()`` after any watcher swaps in a new version (e.g. to drop
+    memoized results of the old model)."""
+    _swap_listeners.append(callback)
+    return callback
+
+
+class ModelWatcher:
+    """The newest published artifacts, reloaded off the predict path.
+
+    ``models_dir/CURRENT`` names the live version directory. A daemon thread
+    checks it every ``interval`` seconds and, when it changes, loads the new
+    version before swapping it in, so ``current()`` never waits on disk.
+    Without a published version the shipped artifacts are served.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, interval=2.0):
+        self.models_dir = Path(models_dir)
+        self.interval = interval
+        self.version = None
+        self.swapped_at = None
+        self._artifacts = None
+        self.poll()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+
+    def current(self) -> Artifacts:
+        return self._artifacts
+
+    def poll(self) -> bool:
+        """Load and swap in a newly published version; True if one was."""
+        try:
+            version = (self.models_dir / "CURRENT").read_text(encoding="utf-8").strip() or None
+        except FileNotFoundError:
+            version = None
+        if version == self.version and self._artifacts is not None:
+            return False
+        artifacts = read_artifacts(self.models_dir / version) if version else load_artifacts()
+        swapped = self._artifacts is not None
+        self._artifacts, self.version = artifacts, version
+        self.swapped_at = time.time()
+        if swapped:
+            for callback in _swap_listeners:
+                callback()
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll()
+            except (OSError, EOFError, ValueError):
+                pass  # version pruned or half-copied by hand; keep serving the current one
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def active_artifacts() -> Artifacts:
+    """Artifacts of the live model version (starts the watcher on first use)."""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = ModelWatcher()
+    return _watcher.current()
+
+
+def encode_moods(moods, encoder) -> np.ndarray:
+    """Vectorized mood label -> model code; unknown moods count as Neutral."""
+    classes = encoder.classes_
+    labels = np.asarray([APP_MOODS.get(m, m) for m in moods], dtype=object)
+    labels[~np.isin(labels, classes)] = "Neutral"
+    return encoder.transform(labels).astype(np.float64)
+
+
+def feature_matrix(rows, artifacts: Artifacts) -> np.ndarray:
+    """Build the (n, 5) feature matrix.
+
+    ``rows`` is either a mapping of columns or a sequence of row mappings with
+    keys ``hours``, ``breaks``, ``mood`` and optionally ``sleep`` and
+    ``distractions``; missing optional features use the training mean.
+    """
+    if not hasattr(rows, "keys"):
+        rows = list(rows)
+        keys = {k for r in rows for k in r}
+        rows = {k: [r.get(k) for r in rows] for k in keys}
+    n = len(rows["hours"])
+    mean = artifacts.scaler.mean_
+
+    def column(key, idx):
+        if key not in rows:
+            return np.full(n, mean[idx])
+        col = np.asarray(rows[key], dtype=np.float64)
+        return np.where(np.isnan(col), mean[idx], col)
+
+    X = np.empty((n, len(FEATURES)))
+    X[:, 0] = column("hours", 0)
+    X[:, 1] = column("sleep", 1)
+    X[:, 2] = column("distractions", 2)
+    X[:, 3] = column("breaks", 3)
+    X[:, 4] = encode_moods(rows["mood"], artifacts.encoder)
+    return X
+
+
+def predict_scores(rows, artifacts: Artifacts = None) -> np.ndarray:
+    """Predicted scores (0-100) for a batch of rows, in one model call."""
+    artifacts = artifacts or active_artifacts()
+    X = feature_matrix(rows, artifacts)
+    # Same maths as scaler.transform, minus its per-call validation overhead.
+    X = (X - artifacts.scaler.mean_) / artifacts.scaler.scale_
+    return np.clip(artifacts.model.predict(X), 0, 100)
@@ -0,0 +1,102 @@
+"""Opt-in per-section rerun timings.
+
+A script run calls ``lap(name)`` after each section; the time since the
+previous lap is recorded under ``name`` in a rolling window per section, from
+which p50/p95/p99 are reported. When profiling is off the page uses
+``NULL_RUN``, whose methods do nothing.
+
+    run = profiler.start_run()
+    ...css...
+    run.lap("css")
+    ...
+    run.end()          # also records "total"
+"""
+import json
+import threading
+import time
+from collections import deque
+
+PERCENTILES = (50, 95, 99)
+
+
+class _Run:
+    __slots__ = ("_profiler", "_t0", "_last")
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._t0 = self._last = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self._profiler.record(name, now - self._last)
+        self._last = now
+
+    def end(self, name="total"):
+        self._profiler.record(name, time.perf_counter() - self._t0)
+
+
+class _NullRun:
+    __slots__ = ()
+
+    def lap(self, name):
+        pass
+
+    def end(self, name="total"):
+        pass
+
+
+NULL_RUN = _NullRun()
+
+
+class SectionProfiler:
+    """Rolling per-section timing samples shared by every session of a process."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        return _Run(self)
+
+    def record(self, name, seconds):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def summary(self):
+        """``{section: {"count", "p50_ms", "p95_ms", "p99_ms"}}`` in first-seen order."""
+        import numpy as np
+
+        with self._lock:
+            snapshot = {name: np.fromiter(s, float) for name, s in self._samples.items()}
+        out = {}
+        for name, values in snapshot.items():
+            stats = {"count": len(values)}
+            for p, v in zip(PERCENTILES, np.percentile(values * 1e3, PERCENTILES)):
+                stats[f"p{p}_ms"] = round(float(v), 3)
+            out[name] = stats
+        return out
+
+    def to_json(self):
+        return json.dumps({"generated": time.time(), "sections": self.summary()}, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP study_rerun_section_seconds Streamlit rerun time per page section.",
+            "# TYPE study_rerun_section_seconds summary",
+        ]
+        for name, stats in self.summary().items():
+            for p in PERCENTILES:
+                lines.append(f'study_rerun_section_seconds{{section="{name}",quantile="{p / 100}"}} '
+                             f'{stats[f"p{p}_ms"] / 1e3:.6f}')
+            lines.append(f'study_rerun_section_seconds_count{{section="{name}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, fmt="json"):
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
@@ -0,0 +1,169 @@
+"""Streaks, XP and a cohort leaderboard from the per-user daily log.
+
+``recompute`` rebuilds every user's XP and streak from the dated log in one
+vectorized pass: goal-hit rows are sorted by (user, day), repeated days are
+dropped, and the streak is the run of consecutive days ending at the user's
+last goal-hit day (run starts are where the user changes or the day gap is
+not 1).
+
+``Leaderboard`` is built from that and then updated one log row at a time.
+XP only grows, so a sorted list of every user's XP gives a rank with one
+binary search, and the top-K only changes when the updated user enters it or
+moves within it.
+"""
+import bisect
+import datetime as dt
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .store import day_date, day_number
+
+XP_PER_HIT = 20
+
+
+def recompute(users, days, hours, goals):
+    """XP, streak and last goal-hit day for every user in the log.
+
+    ``days`` are ISO strings or day numbers. Returns a dict of aligned arrays:
+    ``user`` (sorted unique ids), ``xp``, ``streak`` and ``last_day`` (day
+    number, -1 if the user never hit their goal).
+    """
+    # Hash-based factorize: much faster than np.unique's string sort at 1M rows.
+    codes, names = pd.factorize(np.asarray(users, dtype=object), sort=True)
+    names = names.astype(str)
+    days = np.asarray(days)
+    if days.dtype.kind in "USO":
+        # A log spans few distinct dates: parse each once.
+        day_codes, uniques = pd.factorize(days.astype(object))
+        days = uniques.astype("datetime64[D]").astype(np.int64)[day_codes]
+    days = days.astype(np.int32)
+    hit = np.asarray(hours, dtype=float) >= np.asarray(goals, dtype=float)
+
+    n_users = len(names)
+    xp = np.bincount(codes[hit], minlength=n_users).astype(np.int64) * XP_PER_HIT
+
+    u, d = codes[hit], days[hit]
+    order = np.lexsort((d, u))
+    u, d = u[order], d[order]
+    keep = np.ones(len(u), dtype=bool)
+    keep[1:] = (u[1:] != u[:-1]) | (d[1:] != d[:-1])
+    u, d = u[keep], d[keep]
+
+    idx = np.arange(len(u))
+    starts = np.ones(len(u), dtype=bool)
+    starts[1:] = (u[1:] != u[:-1]) | (d[1:] - d[:-1] != 1)
+    run_start = np.maximum.accumulate(np.where(starts, idx, 0))
+    last = np.ones(len(u), dtype=bool)
+    last[:-1] = u[1:] != u[:-1]
+
+    streak = np.zeros(n_users, dtype=np.int32)
+    last_day = np.full(n_users, -1, dtype=np.int32)
+    streak[u[last]] = (idx - run_start + 1)[last]
+    last_day[u[last]] = d[last]
+    return {"user": names, "xp": xp, "streak": streak, "last_day": last_day}
+
+
+def carried_rows(user, xp, streak, last_log_date):
+    """Daily-log rows that reproduce XP and streak saved before the daily log.
+
+    Goal hits are logged as 0 h against a 0 h goal (a real goal is at least
+    1 h): one per streak day ending at ``last_log_date``, the rest of the XP
+    on that last day. Returns ``(user_id, day, hours, goal)`` tuples.
+    """
+    hits = int(xp) // XP_PER_HIT
+    if not hits:
+        return []
+    last = day_number(last_log_date) if last_log_date else day_number(dt.date.today())
+    streak = max(1, min(int(streak or 0), hits))
+    days = list(range(last - streak + 1, last + 1)) + [last] * (hits - streak)
+    return [(user, day_date(d).isoformat(), 0.0, 0.0) for d in days]
+
+
+class Leaderboard:
+    """Per-user XP/streak with O(log n) rank lookups and an incremental top-K."""
+
+    def __init__(self, rows=(), k=10):
+        """``rows`` are ``(user_id, day, hours, goal)`` tuples, as from
+        ``SessionStore.daily_logs``."""
+        self.k = k
+        self._lock = threading.Lock()
+        self.rebuild(rows)
+
+    # ---------- full rebuild ----------
+    def rebuild(self, rows):
+        rows = list(rows)
+        users, days, hours, goals = zip(*rows) if rows else ((), np.empty(0, np.int32), (), ())
+        cols = recompute(users, days, hours, goals)
+        stats = {u: [int(x), int(s), int(d)]
+                 for u, x, s, d in zip(cols["user"].tolist(), cols["xp"], cols["streak"], cols["last_day"])}
+        top = sorted((-x, u) for u, (x, _, _) in stats.items())[:self.k]
+        with self._lock:
+            self._stats = stats
+            self._xp = sorted(x for x, _, _ in stats.values())
+            self._top = top
+
+    # ---------- one new row ----------
+    def record(self, user, day, hours, goal):
+        """Apply one log row; returns the user's ``{"xp", "streak", "last_log_date"}``.
+
+        A goal-hit row dated before the user's last goal-hit day adds XP but
+        does not re-link streaks (``rebuild`` does).
+        """
+        n = day_number(day)
+        with self._lock:
+            entry = self._stats.get(user)
+            if entry is None:
+                entry = self._stats[user] = [0, 0, -1]
+                bisect.insort(self._xp, 0)
+                self._place(user, 0)
+            if hours >= goal:
+                old = entry[0]
+                entry[0] += XP_PER_HIT
+                del self._xp[bisect.bisect_left(self._xp, old)]
+                bisect.insort(self._xp, entry[0])
+                self._place(user, entry[0], old)
+                if entry[2] < 0 or n > entry[2] + 1:
+                    entry[1] = 1
+                elif n == entry[2] + 1:
+                    entry[1] += 1
+                entry[2] = max(entry[2], n)
+            return self._as_state(entry)
+
+    def _place(self, user, xp, old=None):
+        # XP never decreases, so only ``user`` can enter or move within the top-K.
+        key = (-xp, user)
+        if old is not None and (-old, user) in self._top:
+            self._top.remove((-old, user))
+        elif len(self._top) >= self.k and key >= self._top[-1]:
+            return
+        bisect.insort(self._top, key)
+        del self._top[self.k:]
+
+    # ---------- queries ----------
+    @staticmethod
+    def _as_state(entry):
+        xp, streak, last = entry
+        return {"xp": xp, "streak": streak, "last_log_date": day_date(last).isoformat() if last >= 0 else None}
+
+    def stats(self, user):
+        with self._lock:
+            entry = self._stats.get(user)
+            return self._as_state(entry) if entry else None
+
+    def rank(self, user):
+        """``(rank, users)``, 1-based with ties sharing a rank, or None for unknown users."""
+        with self._lock:
+            entry = self._stats.get(user)
+            if entry is None:
+                return None
+            return len(self._xp) - bisect.bisect_right(self._xp, entry[0]) + 1, len(self._xp)
+
+    def top(self):
+        """Top-K as ``[{"user", "xp", "streak"}]``, highest XP first."""
+        with self._lock:
+            return [{"user": u, "xp": -x, "streak": self._stats[u][1]} for x, u in self._top]
+
+    def __len__(self):
+        return len(self._xp)
@@ -0,0 +1,180 @@
+"""Table-driven recommendation rules, for one student or a whole cohort.
+
+Each rule is data: a text, an optional exclusive ``group`` (the first matching
+rule of a group wins, like an if/elif chain) and a list of conditions
+``(column, op, value)``. ``value`` may be ``("goal", k)`` to compare against
+``goal * k``. ``recommend`` evaluates the table for one row in plain Python;
+``evaluate`` compiles it into NumPy masks and evaluates N rows in one pass.
+
+The two general tips are picked from ``GENERAL_TIPS`` with a generator seeded
+by (user, day), so the same student gets the same advice all day and results
+can be cached.
+"""
+import operator
+import zlib
+
+RULES = (
+    {"group": "progress", "when": [("hours", "<", ("goal", 0.6))],
+     "text": "📈 You studied less than planned. Schedule **two 45-min blocks** tomorrow."},
+    {"group": "progress", "when": [("hours", "<", ("goal", 1.0))],
+     "text": "👍 Close to your goal—add **one extra 30-min session**."},
+    {"group": "progress", "when": [],
+     "text": "🏅 Goal achieved! Do a **quick recap** to lock it in."},
+    {"group": "breaks", "when": [("breaks", "==", 0)],
+     "text": "☕ Add **short 5-min breaks** every 25–30 minutes."},
+    {"group": "breaks", "when": [("breaks", ">", 6)],
+     "text": "🧭 Too many breaks—aim for **2–5** evenly spaced."},
+    {"when": [("revision", "==", "No")],
+     "text": "🔁 Do **10-minute active recall** on yesterday’s topic."},
+    {"when": [("mood", "==", "Stressed"), ("energy", "in", ("Low", "Medium"))],
+     "text": "🧘 Try **box breathing (5 min)** or a brief walk."},
+    {"when": [("mood", "==", "Tired"), ("energy", "==", "Low")],
+     "text": "😴 Take a **20-min power nap** then one short session."},
+    {"when": [("mood", "==", "Happy"), ("energy", "==", "High")],
+     "text": "🚀 Plan a **deep work block (60–90 min)** on your hardest topic."},
+    {"when": [("focus", "!=", "")],
+     "text": "🎯 Stick to **{focus}** and end with a **3-point summary**."},
+)
+
+GENERAL_TIPS = (
+    "📚 Start each session by **rewriting your block goal**.",
+    "📝 Use **active recall** instead of rereading.",
+    "⏱️ Use **Pomodoro (25/5)** for sustained focus.",
+    "📵 Keep your phone **outside the room**.",
+    "🧪 End with a **5-question self-quiz**.",
+    "🌙 Review key points **before sleep**."
+)
+
+_OPS = {"<": operator.lt, ">": operator.gt, "==": operator.eq, "!=": operator.ne,
+        "in": lambda a, b: a in b}
+_MASK64 = (1 << 64) - 1
+
+
+# ---------- seeded tip choice ----------
+def tip_seed(user, day) -> int:
+    """Stable 32-bit seed for (user, day); ``day`` is a date or ISO string."""
+    return zlib.crc32(f"{user or ''}|{day or ''}".encode())
+
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def pick_tips(seed):
+    """Two distinct indices into ``GENERAL_TIPS`` for ``seed``."""
+    n = len(GENERAL_TIPS)
+    z = _splitmix64(seed)
+    first = z % n
+    return first, (first + 1 + (z // n) % (n - 1)) % n
+
+
+# ---------- one row ----------
+def _compile(cond):
+    column, op, value = cond
+    fn = _OPS[op]
+    if isinstance(value, tuple) and value[:1] == ("goal",):
+        k = value[1]
+        return lambda row: fn(row[column], row["goal"] * k)
+    return lambda row: fn(row[column], value)
+
+
+# (group, text, text has placeholders, condition checks), in table order
+_COMPILED = tuple(
+    (rule.get("group"), rule["text"], "{" in rule["text"], tuple(_compile(c) for c in rule["when"]))
+    for rule in RULES
+)
+
+
+def recommend(row, user=None, day=None):
+    """Recommendations for one row (a mapping with the rule columns)."""
+    if not row.get("focus"):
+        row = {**row, "focus": ""}  # no topic (None, "", ...) -> the focus rule stays quiet
+    recs, taken = [], set()
+    for group, text, templated, checks in _COMPILED:
+        if group in taken:
+            continue
+        if all(check(row) for check in checks):
+            recs.append(text.format(**row) if templated else text)
+            if group:
+                taken.add(group)
+    recs.extend(GENERAL_TIPS[i] for i in pick_tips(tip_seed(user, day)))
+    return recs
+
+
+# ---------- N rows ----------
+class Batch:
+    """Result of ``evaluate``: ``mask[i, r]`` says rule ``r`` fired for row ``i``,
+    ``tips[i]`` holds the two general-tip indices."""
+
+    def __init__(self, mask, tips, focus):
+        self.mask = mask
+        self.tips = tips
+        self._focus = focus
+
+    def __len__(self):
+        return len(self.mask)
+
+    def texts(self, i):
+        recs = [RULES[r]["text"].format(focus=self._focus[i]) if "{" in RULES[r]["text"] else RULES[r]["text"]
+                for r in self.mask[i].nonzero()[0]]
+        return recs + [GENERAL_TIPS[t] for t in self.tips[i]]
+
+
+def seeds_for(users, days):
+    import numpy as np
+
+    return np.fromiter((tip_seed(u, d) for u, d in zip(users, days)), dtype=np.uint64, count=len(users))
+
+
+def _pick_tips_vec(seeds):
+    import numpy as np
+
+    n = np.uint64(len(GENERAL_TIPS))
+    z = seeds.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    first = z % n
+    second = (first + np.uint64(1) + (z // n) % (n - np.uint64(1))) % n
+    return np.stack([first, second], axis=1).astype(np.int8)
+
+
+def evaluate(columns, seeds=None):
+    """Evaluate every rule for N rows in one vectorized pass.
+
+    ``columns`` maps each rule column (hours, goal, breaks, revision, mood,
+    energy, focus) to a length-N array. ``seeds`` are the per-row tip seeds
+    (see ``seeds_for``); omitted, every row uses ``tip_seed(None, None)``.
+    """
+    import numpy as np
+
+    cols = {k: np.asarray(v) for k, v in columns.items()}
+    if "focus" in cols and cols["focus"].dtype == object:
+        # Same truthiness as recommend: None and other empty topics count as "".
+        focus = cols["focus"]
+        cols["focus"] = np.where(np.frompyfunc(bool, 1, 1)(focus).astype(bool), focus, "")
+    n = len(cols["hours"])
+    ops = {"<": np.less, ">": np.greater, "==": np.equal, "!=": np.not_equal,
+           "in": lambda a, b: np.isin(a, list(b))}
+    mask = np.zeros((n, len(RULES)), dtype=bool)
+    taken = {}
+    for r, rule in enumerate(RULES):
+        m = np.ones(n, dtype=bool)
+        for column, op, value in rule["when"]:
+            if isinstance(value, tuple) and value[:1] == ("goal",):
+                value = cols["goal"] * value[1]
+            m &= ops[op](cols[column], value)
+        group = rule.get("group")
+        if group:
+            done = taken.setdefault(group, np.zeros(n, dtype=bool))
+            m &= ~done
+            done |= m
+        mask[:, r] = m
+    if seeds is None:
+        seeds = np.full(n, tip_seed(None, None), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        tips = _pick_tips_vec(np.asarray(seeds))
+    return Batch(mask, tips, cols.get("focus"))
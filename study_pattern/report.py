@@ -0,0 +1,100 @@
+"""PDF study reports (reportlab).
+
+``build_pdf`` is a pure function of a plain record so the Streamlit download
+button and the batch CLI (``python -m study_pattern.batch_reports``) render
+identical reports.
+"""
+import datetime as dt
+from io import BytesIO
+
+from study_pattern.core import percent
+
+REPORT_FIELDS = (
+    "hours", "goal", "breaks", "revision", "mood", "energy", "focus",
+    "xp", "streak", "last_bot", "buddy",
+)
+
+
+def build_pdf(report: dict) -> bytes:
+    """Render one study report.
+
+    ``report`` is a plain record with the keys in ``REPORT_FIELDS``;
+    ``student`` and ``period`` are optional and printed under the title.
+    """
+    # reportlab is imported on first render so importing this module stays cheap.
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=letter)
+    width, height = letter
+    x, y = 50, height - 50
+
+    def write_line(text, font="Helvetica", size=11, dy=16):
+        nonlocal y
+        c.setFont(font, size)
+        c.drawString(x, y, text)
+        y -= dy
+        if y < 60:
+            c.showPage()
+            y = height - 50
+
+    def write_wrap(text, max_width=500, bullet=False):
+        nonlocal y
+        c.setFont("Helvetica", 11)
+        lines = simpleSplit(text, "Helvetica", 11, max_width)
+        for ln in lines:
+            c.drawString(x + (12 if bullet else 0), y, ("- " if bullet else "") + ln)
+            y -= 16
+            if y < 60:
+                c.showPage()
+                y = height - 50
+
+    # Header
+    write_line("Study Report", "Helvetica-Bold", 18, 22)
+    write_line(dt.datetime.now().strftime("%Y-%m-%d %H:%M"), "Helvetica", 10, 18)
+    if report.get("student") or report.get("period"):
+        who = " • ".join(str(v) for v in (report.get("student"), report.get("period")) if v)
+        write_line(who, "Helvetica", 10, 18)
+    y -= 6
+
+    # Inputs
+    write_line("Inputs", "Helvetica-Bold", 14, 18)
+    write_line(f"Hours Studied: {report['hours']}")
+    write_line(f"Goal (hours): {report['goal']}")
+    write_line(f"Goal Completion: {percent(report['hours'], report['goal'])}%")
+    write_line(f"Breaks: {report['breaks']}")
+    write_line(f"Revision: {report['revision']}")
+    write_line(f"Mood: {report['mood']}")
+    write_line(f"Energy: {report['energy']}")
+    write_line(f"Focus: {report['focus'] or '—'}")
+    y -= 6
+
+    # Gamification
+    write_line("Progress", "Helvetica-Bold", 14, 18)
+    write_line(f"XP: {report['xp']}")
+    write_line(f"Streak: {report['streak']} day(s)")
+    y -= 6
+
+    # Recommendations (last bot message)
+    write_line("Recommendations", "Helvetica-Bold", 14, 18)
+    if report["last_bot"]:
+        for line in report["last_bot"].split("\n"):
+            write_wrap(line, bullet=True)
+    else:
+        write_wrap("No recommendations generated yet.")
+
+    # Buddy snippets (last 3)
+    y -= 6
+    write_line("Buddy Messages", "Helvetica-Bold", 14, 18)
+    if report["buddy"]:
+        for who, msg in report["buddy"]:
+            write_wrap(f"{who}: {msg}", bullet=True)
+    else:
+        write_wrap("No buddy messages yet.")
+
+    c.showPage()
+    c.save()
+    return buf.getvalue()
+
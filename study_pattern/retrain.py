@@ -0,0 +1,261 @@
+"""Incremental retraining from ``study_data.csv`` into versioned artifacts.
+
+    python -m study_pattern.retrain [--watch SECONDS]
+
+The shipped RandomForest cannot learn incrementally, so the retrained model
+is an ``SGDRegressor`` over the same features; the shipped scaler and label
+encoder carry over. The first run bootstraps the regressor on
+``study_logs.csv`` (the shipped model's training data). Every run then reads
+only the bytes appended to ``study_data.csv`` since the previous version, in
+chunks, and ``partial_fit``s the scaler and then the regressor on each one.
+Only rows with a real score train (the page logs rows without one), and the
+scaler only learns from the features those rows actually have.
+
+Every ``HOLDOUT``-th new scored row is held out instead. A run with no new
+scored rows, or whose model's MAE on the held-out rows is worse than the live
+model's (the published version, else the shipped RandomForest), publishes
+nothing; its rows are trained on again by the next run.
+
+A run that passes publishes ``models/vNNNN/`` (written under a temporary name, then
+renamed into place) and points ``models/CURRENT`` at it with an atomic
+replace; ``predict.ModelWatcher`` picks it up in running processes. Run one
+retrainer per models directory.
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from study_pattern import columnar
+from study_pattern.predict import (
+    BASE_DIR, FEATURES, MODELS_DIR, Artifacts, feature_matrix, load_artifacts, read_artifacts,
+)
+from study_pattern.store import COLUMNS
+
+KEEP_VERSIONS = 5
+HOLDOUT = 5  # every 5th new scored row scores the candidate against the live model
+# study_data.csv has no sleep or distraction columns; feature_matrix fills them with the scaler mean.
+IMPUTED = [FEATURES.index("Sleep_Hours"), FEATURES.index("Distractions")]
+
+
+def read_new_rows(path, offset, chunk_bytes=4 << 20):
+    """Yield ``(frame, end_offset)`` for the complete CSV lines after ``offset``.
+
+    For a columnar ``.cols`` log the offsets count rows instead of bytes.
+    """
+    if columnar.is_columnar(path):
+        cols = columnar.open_columns(path)
+        step = max(1, chunk_bytes // sum(t.itemsize for t in cols.dtypes.values()))
+        for start in range(offset, len(cols), step):
+            end = min(start + step, len(cols))
+            yield cols.frame(start, end), end
+        return
+    with open(path, "rb") as f:
+        if offset:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                # The header gained ",user" since (StudyLogStore), shifting the rows: resume at the next line.
+                f.readline()
+                offset = f.tell()
+        while True:
+            f.seek(offset)
+            block = f.read(chunk_bytes)
+            end = block.rfind(b"\n") + 1
+            if end == 0:
+                if len(block) < chunk_bytes:
+                    return  # nothing new, or a partial line still being written
+                chunk_bytes *= 2
+                continue
+            # By position: logs from before the user column have shorter rows (read as NaN).
+            df = pd.read_csv(io.BytesIO(block[:end]), header=None, skiprows=1 if offset == 0 else 0, names=COLUMNS)
+            offset += end
+            yield df, offset
+
+
+def _xy(df, artifacts):
+    # Only rows with a real score: the page logs its rows without one (NaN).
+    df = df.dropna(subset=["hours_studied", "breaks_taken", "score"])
+    df = df[df["score"].between(0, 100)]
+    X = feature_matrix({"hours": df["hours_studied"].to_numpy(), "breaks": df["breaks_taken"].to_numpy(),
+                        "mood": df["mood"].fillna("Neutral").astype(str).to_numpy()}, artifacts)
+    return X, df["score"].to_numpy(np.float64)
+
+
+def _fit_scaler(scaler, X):
+    """``partial_fit`` on the observed features only. The mean-filled ones keep
+    their statistics: fitting on the fill would shrink their variance every chunk."""
+    kept = scaler.mean_[IMPUTED], scaler.var_[IMPUTED], scaler.scale_[IMPUTED]
+    scaler.partial_fit(X)
+    scaler.mean_[IMPUTED], scaler.var_[IMPUTED], scaler.scale_[IMPUTED] = kept
+
+
+def _mae(artifacts, X, y):
+    pred = artifacts.model.predict((X - artifacts.scaler.mean_) / artifacts.scaler.scale_)
+    return float(np.mean(np.abs(np.clip(pred, 0, 100) - y)))
+
+
+class Retrainer:
+    def __init__(self, data_path=BASE_DIR / "study_data.csv", models_dir=MODELS_DIR,
+                 bootstrap_path=BASE_DIR / "study_logs.csv", chunk_bytes=4 << 20, epochs=20):
+        self.data_path = Path(data_path)
+        self.models_dir = Path(models_dir)
+        self.bootstrap_path = Path(bootstrap_path)
+        self.chunk_bytes = chunk_bytes
+        self.epochs = epochs
+        self._stop = threading.Event()
+
+    # ---------- state ----------
+    def current(self):
+        """``(artifacts, meta)`` of the published version, or None."""
+        try:
+            version = (self.models_dir / "CURRENT").read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        path = self.models_dir / version
+        return read_artifacts(path), json.loads((path / "meta.json").read_text(encoding="utf-8"))
+
+    def _bootstrap(self):
+        from sklearn.linear_model import SGDRegressor
+
+        shipped = load_artifacts()
+        scaler = copy.deepcopy(shipped.scaler)
+        # partial_fit is fed plain arrays from here on.
+        del scaler.feature_names_in_
+        model = SGDRegressor(random_state=0)
+        logs = pd.read_csv(self.bootstrap_path)
+        X = feature_matrix({"hours": logs["Study_Hours"], "sleep": logs["Sleep_Hours"],
+                            "distractions": logs["Distractions"], "breaks": logs["Breaks"],
+                            "mood": logs["Mood"].astype(str).to_numpy()}, shipped)
+        Xs = (X - scaler.mean_) / scaler.scale_
+        y = logs["Score"].to_numpy(np.float64)
+        for _ in range(self.epochs):
+            model.partial_fit(Xs, y)
+        return Artifacts(model, scaler, shipped.encoder), {"version": 0, "offset": 0, "rows": 0}
+
+    # ---------- training ----------
+    def run_once(self):
+        """Train on the rows appended since the last version and publish if the
+        result is no worse than the live model on the held-out rows.
+
+        Returns the new meta (``published`` False when it lost), or None
+        without new scored rows.
+        """
+        state = self.current()
+        artifacts, meta = state if state else self._bootstrap()
+        # What running apps serve now; ``artifacts`` is trained in place below.
+        live = copy.deepcopy(artifacts) if state else load_artifacts()
+        offset, rows, held = meta["offset"], 0, []
+        t0 = time.perf_counter()
+        if self.data_path.exists():
+            for df, offset in read_new_rows(self.data_path, meta["offset"], self.chunk_bytes):
+                X, y = _xy(df, artifacts)
+                test = np.arange(len(y)) % HOLDOUT == HOLDOUT - 1
+                held.append((X[test], y[test]))
+                X, y = X[~test], y[~test]
+                if len(y):
+                    _fit_scaler(artifacts.scaler, X)
+                    artifacts.model.partial_fit((X - artifacts.scaler.mean_) / artifacts.scaler.scale_, y)
+                    rows += len(y)
+        seconds = time.perf_counter() - t0
+        X_test = np.concatenate([X for X, _ in held]) if held else np.empty((0, len(FEATURES)))
+        y_test = np.concatenate([y for _, y in held]) if held else np.empty(0)
+        if not rows or not len(y_test):
+            return None
+        mae, live_mae = _mae(artifacts, X_test, y_test), _mae(live, X_test, y_test)
+        meta = {
+            "version": meta["version"] + 1, "offset": offset, "rows": meta["rows"] + rows,
+            "new_rows": rows, "train_seconds": round(seconds, 3),
+            "rows_per_s": round(rows / seconds) if seconds else 0, "trained_at": time.time(),
+            "holdout_rows": len(y_test), "holdout_mae": round(mae, 4), "live_mae": round(live_mae, 4),
+            "published": mae <= live_mae,
+        }
+        if meta["published"]:
+            self.publish(artifacts, meta)
+        return meta
+
+    def publish(self, artifacts, meta):
+        import joblib
+
+        self.models_dir.mkdir(parents=True, exist_ok=True)
+        name = f"v{meta['version']:04d}"
+        tmp = self.models_dir / f".{name}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        joblib.dump(artifacts.model, tmp / "model.pkl")
+        joblib.dump(artifacts.scaler, tmp / "scaler.pkl")
+        joblib.dump(artifacts.encoder, tmp / "label_encoder.pkl")
+        (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(tmp, self.models_dir / name)
+
+        pointer = self.models_dir / ".CURRENT.tmp"
+        with open(pointer, "w", encoding="utf-8") as f:
+            f.write(name + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer, self.models_dir / "CURRENT")
+        self._prune(name)
+
+    def _prune(self, live):
+        versions = sorted(p.name for p in self.models_dir.glob("v[0-9]*") if p.is_dir())
+        for old in versions[:-KEEP_VERSIONS]:
+            if old != live:
+                shutil.rmtree(self.models_dir / old, ignore_errors=True)
+
+    # ---------- background worker ----------
+    def start(self, interval=60.0, report=sys.stderr):
+        """Retrain every ``interval`` seconds on a daemon thread."""
+        thread = threading.Thread(target=self._loop, args=(interval, report), name="retrainer", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, interval, report):
+        while not self._stop.is_set():
+            try:
+                meta = self.run_once()
+                if meta and report:
+                    print(_summary(meta), file=report, flush=True)
+            except Exception:
+                traceback.print_exc()
+            self._stop.wait(interval)
+
+
+def _summary(meta):
+    mae = f"holdout MAE {meta['holdout_mae']:.2f} vs live {meta['live_mae']:.2f} on {meta['holdout_rows']:,} rows"
+    if not meta["published"]:
+        return f"not published ({mae}); {meta['new_rows']:,} rows will be trained on again next run"
+    return (f"v{meta['version']:04d}: {meta['new_rows']:,} new rows in {meta['train_seconds']:.2f}s "
+            f"({meta['rows_per_s']:,} rows/s), {meta['rows']:,} total; {mae}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--data", default=os.environ.get("STUDY_DATA_PATH", BASE_DIR / "study_data.csv"))
+    ap.add_argument("--models-dir", default=MODELS_DIR)
+    ap.add_argument("--chunk-mb", type=float, default=4, help="bytes read per chunk (default: 4 MB)")
+    ap.add_argument("--watch", type=float, default=None, metavar="SECONDS",
+                    help="keep running, retraining every SECONDS")
+    args = ap.parse_args(argv)
+
+    retrainer = Retrainer(args.data, args.models_dir, chunk_bytes=int(args.chunk_mb * (1 << 20)))
+    if args.watch:
+        retrainer.start(args.watch, report=sys.stdout).join()
+        return
+    meta = retrainer.run_once()
+    print(_summary(meta) if meta else "no new scored rows; current version unchanged")
+
+
+if __name__ == "__main__":
+    main()
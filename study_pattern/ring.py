@@ -0,0 +1,93 @@
+"""Fixed-capacity ring buffer for the ``chat`` / ``buddy_chat`` session history.
+
+The page only ever shows the last few messages and the PDF needs the last bot
+message, so a session keeps at most ``capacity`` entries. Evicted entries can
+be handed to ``on_evict`` (e.g. ``JsonlSpill``) to keep them on disk.
+"""
+import json
+import os
+import threading
+import time
+
+DEFAULT_CAPACITY = int(os.environ.get("STUDY_CHAT_CAPACITY", 50))
+
+
+class ChatRing:
+    """O(1) append, O(1) last bot message, list-style indexing and slicing."""
+
+    __slots__ = ("capacity", "bot_role", "on_evict", "_buf", "_start", "_size", "_last_bot")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, items=(), bot_role="bot", on_evict=None):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.bot_role = bot_role
+        self.on_evict = None
+        self._buf = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self._last_bot = ""
+        # Restored items were spilled (or never kept) already; don't evict them again.
+        for item in items:
+            self.append(item)
+        self.on_evict = on_evict
+
+    def append(self, item):
+        cap = self.capacity
+        if self._size == cap:
+            evicted = self._buf[self._start]
+            self._buf[self._start] = item
+            self._start = (self._start + 1) % cap
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+        else:
+            self._buf[(self._start + self._size) % cap] = item
+            self._size += 1
+        if item[0] == self.bot_role:
+            self._last_bot = item[1]
+
+    @property
+    def last_bot(self):
+        """Text of the most recent bot entry ("" if none), even if evicted."""
+        return self._last_bot
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._buf[(self._start + i) % self.capacity] for i in range(self._size)[index]]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ChatRing index out of range")
+        return self._buf[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        return (self._buf[(self._start + i) % self.capacity] for i in range(self._size))
+
+    def __reversed__(self):
+        return (self._buf[(self._start + i) % self.capacity] for i in range(self._size - 1, -1, -1))
+
+    def __repr__(self):
+        return f"ChatRing(capacity={self.capacity}, items={self[:]!r})"
+
+
+class JsonlSpill:
+    """``on_evict`` callback appending evicted entries to a JSON-lines file.
+
+    Sessions may share one file, so each line carries its ``owner`` (the
+    user id or session key the history belongs to).
+    """
+
+    def __init__(self, path, stream, owner):
+        self.path = str(path)
+        self.stream = stream
+        self.owner = owner
+        self._lock = threading.Lock()
+
+    def __call__(self, item):
+        line = json.dumps({"ts": time.time(), "owner": self.owner, "stream": self.stream,
+                           "who": item[0], "text": item[1]}, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
@@ -0,0 +1,150 @@
+"""Per-user session persistence in a local SQLite file.
+
+Sessions ``stage`` their latest state in memory (cheap, on every rerun) and
+``log_day`` their Analyze submissions; a single background flusher writes
+everything staged since the last flush in one transaction every
+``flush_interval`` seconds. With one writer and WAL
+mode, readers never block on it and sessions never wait on each other's
+commits.
+"""
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_state (
+    user_id TEXT PRIMARY KEY,
+    state   TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_log (
+    user_id TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    hours   REAL NOT NULL,
+    goal    REAL NOT NULL
+)
+"""
+
+
+class ConnectionPool:
+    """Fixed set of WAL-mode connections shared across threads."""
+
+    def __init__(self, path, size=4, timeout=30.0):
+        self.path = str(path)
+        self._idle = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._idle.put(conn)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get().close()
+
+
+class SessionStore:
+    """Load user state on first run, write it back in batches."""
+
+    def __init__(self, path, pool_size=4, flush_interval=5.0):
+        self.pool = ConnectionPool(path, pool_size)
+        self.flush_interval = flush_interval
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+        self._pending = {}
+        self._pending_days = []
+        self._written = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name="session-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def load(self, user_id):
+        """The last saved state for ``user_id`` (staged-but-unflushed wins), or None."""
+        with self._lock:
+            if user_id in self._pending:
+                return self._pending[user_id]
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT state FROM user_state WHERE user_id = ?", (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stage(self, user_id, state: dict):
+        """Queue ``state`` for the next flush; unchanged state is not rewritten."""
+        with self._lock:
+            if self._written.get(user_id) == state:
+                self._pending.pop(user_id, None)
+            else:
+                self._pending[user_id] = state
+
+    def log_day(self, user_id, day, hours, goal):
+        """Queue one daily log row (``day`` as an ISO string) for the next flush."""
+        with self._lock:
+            self._pending_days.append((user_id, day, float(hours), float(goal)))
+
+    def daily_logs(self):
+        """Every daily log row as ``(user_id, day, hours, goal)``, oldest first."""
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT user_id, day, hours, goal FROM daily_log ORDER BY rowid").fetchall()
+        with self._lock:
+            return rows + self._pending_days
+
+    def flush(self):
+        """Write every staged state and log row in one transaction; returns the row count."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            days, self._pending_days = self._pending_days, []
+        if not batch and not days:
+            return 0
+        now = time.time()
+        rows = [(uid, json.dumps(state), now) for uid, state in batch.items()]
+        with self.pool.connection() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT INTO user_state (user_id, state, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+                    rows,
+                )
+                conn.executemany("INSERT INTO daily_log (user_id, day, hours, goal) VALUES (?, ?, ?, ?)", days)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                with self._lock:
+                    for uid, state in batch.items():
+                        self._pending.setdefault(uid, state)
+                    self._pending_days[:0] = days
+                raise
+        with self._lock:
+            self._written.update(batch)
+        return len(rows) + len(days)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.OperationalError:
+                pass  # batch was re-staged; retried on the next tick
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        self.pool.close()
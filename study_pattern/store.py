@@ -0,0 +1,228 @@
+"""Append-only study log store backed by ``study_data.csv``.
+
+Rows are appended to the CSV one line at a time (the rows are never rewritten)
+and mirrored into growable NumPy column buffers kept sorted by date, so range
+queries are two binary searches plus zero-copy slices.
+
+``path`` may also be a columnar ``.cols`` directory (``study_pattern.columnar``):
+the columns are then memory-mapped instead of parsed, and only copied into
+growable buffers on the first append.
+
+Each row records the ``user`` who logged it, so range queries can be limited
+to one user. Rows from before that column read as user ``""``; a log with the
+old six-column header gets ``user`` added to it (an atomic copy, done once)
+before its first row with one is appended.
+"""
+import csv
+import datetime as dt
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+from study_pattern import columnar
+
+COLUMNS = ("date", "hours_studied", "breaks_taken", "revision", "mood", "score", "user")
+DTYPES = {
+    "date": np.int32,           # days since 1970-01-01
+    "hours_studied": np.float32,
+    "breaks_taken": np.int16,
+    "revision": np.float32,
+    "mood": np.int16,           # index into StudyLogStore.moods
+    "score": np.float32,        # NaN when the row has no real score
+    "user": np.int32,           # index into StudyLogStore.users ("" = not recorded)
+}
+EPOCH = dt.date(1970, 1, 1)
+
+
+def day_number(day) -> int:
+    """Date (or ISO string) -> int day number used by the date index."""
+    if isinstance(day, str):
+        day = dt.date.fromisoformat(day)
+    return (day - EPOCH).days
+
+
+def day_date(n: int) -> dt.date:
+    return EPOCH + dt.timedelta(days=int(n))
+
+
+class StudyLogStore:
+    """Columnar, date-indexed view over an append-only study log CSV."""
+
+    def __init__(self, path, initial_capacity=1024):
+        self.path = str(path)
+        self.columnar = columnar.is_columnar(self.path)
+        self.moods = []
+        self._mood_codes = {}
+        self.users = [""]
+        self._user_codes = {"": 0}
+        self._lock = threading.Lock()
+        self._legacy_header = False
+        self._size = 0
+        self._cols = {c: np.empty(initial_capacity, dtype=t) for c, t in DTYPES.items()}
+        self._load()
+
+    # ---------- loading ----------
+    def _load(self):
+        if self.columnar:
+            self._load_columns()
+            return
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(COLUMNS)
+            return
+        with open(self.path, encoding="utf-8") as f:
+            self._legacy_header = "user" not in f.readline().strip().split(",")
+        # By position: an older log's header has no user column.
+        df = pd.read_csv(
+            self.path, header=None, skiprows=1, names=COLUMNS,
+            dtype={"hours_studied": np.float32, "breaks_taken": np.int16,
+                   "revision": np.float32, "mood": "category", "score": np.float32, "user": str},
+        )
+        if df.empty:
+            return
+        days = (pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]")
+                .astype(np.int64).astype(np.int32))
+        order = np.argsort(days, kind="stable")
+        self.moods = [str(m) for m in df["mood"].cat.categories]
+        self._mood_codes = {m: i for i, m in enumerate(self.moods)}
+        users = pd.Categorical(df["user"].fillna(""))
+        user_codes = np.array([self._user_code(u) for u in users.categories], dtype=np.int32)[users.codes]
+        loaded = {
+            "date": days,
+            "hours_studied": df["hours_studied"].to_numpy(),
+            "breaks_taken": df["breaks_taken"].to_numpy(),
+            "revision": df["revision"].to_numpy(),
+            "mood": df["mood"].cat.codes.to_numpy(),
+            "score": df["score"].to_numpy(),
+            "user": user_codes,
+        }
+        n = len(df)
+        self._reserve(n)
+        for c, values in loaded.items():
+            self._cols[c][:n] = values[order]
+        self._size = n
+
+    def _load_columns(self):
+        if not os.path.exists(os.path.join(self.path, "meta.json")):
+            columnar.create(self.path, "data")
+        cols = columnar.open_columns(self.path)
+        self.moods = list(cols.moods)
+        self._mood_codes = {m: i for i, m in enumerate(self.moods)}
+        self.users = list(cols.labels["user"])
+        self._user_codes = {u: i for i, u in enumerate(self.users)}
+        n = len(cols)
+        if n == 0:
+            return
+        dates = cols["date"]
+        if np.all(dates[1:] >= dates[:-1]):
+            # Already in date order: serve the mapped columns as they are.
+            self._cols = {c: cols[c] for c in COLUMNS}
+        else:
+            order = np.argsort(dates, kind="stable")
+            self._cols = {c: cols[c][order] for c in COLUMNS}
+        self._size = n
+
+    def _reserve(self, n):
+        cap = len(self._cols["date"])
+        if n <= cap:
+            return
+        while cap < n:
+            cap *= 2
+        for c, arr in self._cols.items():
+            grown = np.empty(cap, dtype=arr.dtype)
+            grown[:self._size] = arr[:self._size]
+            self._cols[c] = grown
+
+    def _mood_code(self, mood):
+        code = self._mood_codes.get(mood)
+        if code is None:
+            code = self._mood_codes[mood] = len(self.moods)
+            self.moods.append(mood)
+        return code
+
+    def _user_code(self, user):
+        code = self._user_codes.get(user)
+        if code is None:
+            code = self._user_codes[user] = len(self.users)
+            self.users.append(user)
+        return code
+
+    # ---------- writes ----------
+    def _upgrade_header(self):
+        # Copy with the new header, then swap it in, so readers see either file whole.
+        tmp = self.path + ".tmp"
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            header = src.readline()
+            body = header.rstrip(b"\r\n")
+            dst.write(body + b",user" + header[len(body):])
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, self.path)
+        self._legacy_header = False
+
+    def append(self, day, hours, breaks, revision, mood, score=None, user=""):
+        """Append one log row to the CSV and the in-memory index.
+
+        ``score`` is a real (test or self-reported) score or None; it is the
+        retrainer's label, so never a stand-in such as goal completion.
+        """
+        if isinstance(day, str):
+            day = dt.date.fromisoformat(day)
+        score = np.nan if score is None else float(score)
+        with self._lock:
+            if self.columnar:
+                columnar.append(self.path, {"date": [day], "hours_studied": [hours], "breaks_taken": [breaks],
+                                            "revision": [revision], "mood": [mood], "score": [score],
+                                            "user": [user]})
+            else:
+                if self._legacy_header:
+                    self._upgrade_header()
+                with open(self.path, "a", newline="", encoding="utf-8") as f:
+                    csv.writer(f).writerow([day.isoformat(), hours, breaks, revision, mood,
+                                            "" if np.isnan(score) else score, user])
+            row = {
+                "date": day_number(day), "hours_studied": hours, "breaks_taken": breaks,
+                "revision": revision, "mood": self._mood_code(mood), "score": score,
+                "user": self._user_code(user),
+            }
+            n = self._size
+            self._reserve(n + 1)
+            if n == 0 or row["date"] >= self._cols["date"][n - 1]:
+                pos = n  # the common case: today's row goes at the end
+            else:
+                pos = int(np.searchsorted(self._cols["date"][:n], np.int32(row["date"]), side="right"))
+            for c, arr in self._cols.items():
+                if pos < n:
+                    arr[pos + 1:n + 1] = arr[pos:n]
+                arr[pos] = row[c]
+            self._size = n + 1
+
+    # ---------- reads ----------
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        return self._cols[name][:self._size]
+
+    def range(self, start, end, user=None):
+        """Rows with ``start <= date <= end`` as a dict of column views; with
+        ``user``, only that user's rows (copies)."""
+        with self._lock:
+            dates = self._cols["date"][:self._size]
+            # np.int32 keys keep searchsorted from upcasting (copying) the column.
+            lo = int(np.searchsorted(dates, np.int32(day_number(start)), side="left"))
+            hi = int(np.searchsorted(dates, np.int32(day_number(end)), side="right"))
+            if user is None:
+                return {c: arr[lo:hi] for c, arr in self._cols.items()}
+            mine = self._cols["user"][lo:hi] == self._user_codes.get(user, -1)
+            return {c: arr[lo:hi][mine] for c, arr in self._cols.items()}
+
+    def last_days(self, days, today=None, user=None):
+        """Rows from the last ``days`` days, today included."""
+        today = today or dt.date.today()
+        return self.range(today - dt.timedelta(days=days - 1), today, user)
+
+    def mood_labels(self, codes):
+        return [self.moods[c] for c in codes]
@@ -0,0 +1,90 @@
+"""Theme stylesheet and HTML card templates for the Streamlit page.
+
+The stylesheet is rendered and minified once per theme per process
+(``stylesheet``). Card snippets are compact module-level templates filled with
+``str.format``, so each rerun only does the substitution.
+"""
+import functools
+import re
+
+LIGHT = {
+    "--bg1": "#F7F9FC", "--bg2": "#ECF2FF", "--card": "#FFFFFF", "--text": "#0F172A",
+    "--muted": "#475569", "--accent": "#4F46E5", "--success": "#10B981",
+    "--warn": "#F59E0B", "--danger": "#EF4444"
+}
+DARK = {
+    "--bg1": "#0f1220", "--bg2": "#171a2e", "--card": "#1f2442", "--text": "#e6e9f5",
+    "--muted": "#b8c1ec", "--accent": "#7c9cff", "--success": "#61d095",
+    "--warn": "#ffb84d", "--danger": "#ff6b6b"
+}
+THEMES = {"Light": LIGHT, "Dark": DARK}
+
+_CSS = """
+  :root { %(vars)s }
+  .stApp {
+    background: linear-gradient(135deg, var(--bg1) 0%%, var(--bg2) 100%%);
+    color: var(--text);
+  }
+  .glass {
+    background: linear-gradient(180deg, rgba(255,255,255,0.04), rgba(255,255,255,0.02));
+    border: 1px solid rgba(0,0,0,0.06);
+    border-radius: 18px;
+    padding: 18px 20px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.08);
+  }
+  .metric {
+    display:flex; align-items:center; gap:12px; padding:10px 12px; border-radius:14px;
+    background: rgba(255,255,255,0.30); border:1px solid rgba(0,0,0,0.06);
+  }
+  .chip {
+    display:inline-block; padding:6px 10px; border-radius:20px; font-size:0.9rem;
+    background: rgba(255,255,255,0.40); border:1px solid rgba(0,0,0,0.06);
+  }
+  .bubble { padding:12px 14px; margin:8px 0; border-radius: 14px; max-width: 90%%; border:1px solid rgba(0,0,0,0.06); }
+  .user { margin-left:auto; background:rgba(79,70,229,0.18); }
+  .bot  { margin-right:auto; background:rgba(0,0,0,0.06); }
+  .ring {
+    width: 160px; height:160px; border-radius:50%%; position: relative; display:inline-block;
+    background: conic-gradient(var(--accent) calc(var(--p)*1%%), rgba(0,0,0,0.08) 0);
+  }
+  .ring::after { content:""; position:absolute; inset:10px; border-radius:50%%; background: var(--card); border: 1px solid rgba(0,0,0,0.06); }
+  .ring-label { position:absolute; inset:0; display:flex; align-items:center; justify-content:center; font-size:1.2rem; font-weight:700; color:var(--text); }
+  .muted { color:var(--muted); }
+  .mt6 { margin-top:6px; }
+  .mt10 { margin-top:10px; }
+  .center { text-align:center; }
+"""
+
+
+def _minify(css: str) -> str:
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def stylesheet(theme: str) -> str:
+    """The page ``<style>`` block for ``theme`` ("Light" or "Dark")."""
+    colors = THEMES.get(theme, DARK)
+    variables = "; ".join(f"{k}:{v}" for k, v in colors.items())
+    return f"<style>{_minify(_CSS % {'vars': variables})}</style>"
+
+
+# ---------- card templates ----------
+GROWTH_TREE = (
+    '<div class="glass"><div style="font-size:2rem">{icon}</div>'
+    '<div class="mt6">{stage}</div><div class="chip mt10">Progress: {pct}%</div></div>'
+)
+RING = (
+    '<div class="glass center"><div class="ring" style="--p:{pct}">'
+    '<div class="ring-label">{pct}%</div></div>'
+    '<div class="mt10 muted">Goal Completion</div>'
+    '<div class="chip mt10">⏳ {hours}h / 🎯 {goal}h</div></div>'
+)
+METRIC = '<div class="metric"><div>{icon}</div><div><b>{title}</b><br><span class="muted">{value}</span></div></div>'
+CLOCK = (
+    '<div class="glass center"><div class="chip">{status} • {mode} Mode</div>'
+    '<h2 style="margin:6px 0">{clock}</h2>'
+    '<div class="muted">Focus during Work • Stretch during Breaks</div></div>'
+)
+CHIP = '<span class="chip">{text}</span>'
+BUBBLE = "<div class='bubble {cls}'>{body}</div>"